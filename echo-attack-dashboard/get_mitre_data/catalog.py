@@ -0,0 +1,128 @@
+import util
+
+# kill_chain_name used in attack-pattern kill_chain_phases => ATT&CK domain of its tactics
+KILL_CHAIN_DOMAINS = {
+    "mitre-attack": "enterprise-attack",
+    "mitre-mobile-attack": "mobile-attack",
+    "mitre-ics-attack": "ics-attack",
+}
+
+
+def get_tactics(all_objects):
+    """Return (domain, shortname) => {id, name, shortname, domain} for every current tactic.
+
+    Tactics are ordered as the domain matrices list them (kill chain order); tactics
+    missing from every matrix follow in STIX order.
+    """
+    tactics_by_stix_id = {}
+    for tactic in util.buildhelpers.filter_deprecated_revoked(
+        [obj for obj in all_objects if obj.get("type") == "x-mitre-tactic"]
+    ):
+        attack_id = util.buildhelpers.get_attack_id(tactic)
+        if attack_id and tactic.get("x_mitre_shortname"):
+            tactics_by_stix_id[tactic["id"]] = tactic
+
+    ordered_ids = []
+    for matrix in util.buildhelpers.filter_deprecated_revoked(
+        [obj for obj in all_objects if obj.get("type") == "x-mitre-matrix"]
+    ):
+        for stix_id in matrix.get("tactic_refs", []):
+            if stix_id in tactics_by_stix_id and stix_id not in ordered_ids:
+                ordered_ids.append(stix_id)
+    ordered_ids.extend(stix_id for stix_id in tactics_by_stix_id if stix_id not in ordered_ids)
+
+    tactics = {}
+    for stix_id in ordered_ids:
+        tactic = tactics_by_stix_id[stix_id]
+        for domain in tactic.get("x_mitre_domains", []):
+            tactics[(domain, tactic["x_mitre_shortname"])] = {
+                "id": util.buildhelpers.get_attack_id(tactic),
+                "name": tactic["name"],
+                "shortname": tactic["x_mitre_shortname"],
+                "domain": domain,
+            }
+    return tactics
+
+
+def get_technique_tactics(technique, tactics):
+    """Given an attack-pattern, return the IDs of the tactics in its kill_chain_phases."""
+    tactic_ids = []
+    for phase in technique.get("kill_chain_phases", []):
+        domain = KILL_CHAIN_DOMAINS.get(phase.get("kill_chain_name"))
+        tactic = tactics.get((domain, phase.get("phase_name")))
+        if tactic and tactic["id"] not in tactic_ids:
+            tactic_ids.append(tactic["id"])
+    return tactic_ids
+
+
+def get_technique_mitigations(technique, technique_mitigated_by_mitigation, mitigations):
+    """Given an attack-pattern, return the IDs of the mitigations of it, adding each to mitigations."""
+    mitigation_ids = []
+    for mitigation in technique_mitigated_by_mitigation.get(technique["id"], []):
+        if mitigation["object"].get("x_mitre_deprecated"):
+            continue
+        attack_id = util.buildhelpers.get_attack_id(mitigation["object"])
+        if attack_id and attack_id not in mitigation_ids:
+            mitigation_ids.append(attack_id)
+            mitigations.setdefault(attack_id, {"name": mitigation["object"]["name"]})
+    return sorted(mitigation_ids)
+
+
+def get_technique_detections(technique, datacomponents_detecting_technique, datasource_names):
+    """Given an attack-pattern, return the "Data Source: Data Component" names detecting it."""
+    detections = []
+    for datacomponent in datacomponents_detecting_technique.get(technique["id"], []):
+        component = datacomponent["object"]
+        if component.get("x_mitre_deprecated") or component.get("revoked"):
+            continue
+        datasource_name = datasource_names.get(component.get("x_mitre_data_source_ref"))
+        name = f"{datasource_name}: {component['name']}" if datasource_name else component["name"]
+        if name not in detections:
+            detections.append(name)
+    return sorted(detections)
+
+
+def build_technique_catalog(all_objects, srcs):
+    """Build the technique catalog written next to the group files.
+
+    {"tactics": {tactic_id: {name, shortname, domain}},
+     "mitigations": {mitigation_id: {name}},
+     "techniques": {technique_id: {name, domains, tactics, mitigations, detections}}}
+
+    Technique IDs are full IDs (subtechniques as T1234.001). Tactics are the tactic
+    IDs from the technique's kill_chain_phases, mitigations the IDs of the
+    mitigations of it, and detections the "Data Source: Data Component" names of
+    the data components detecting it.
+    """
+    tactics = get_tactics(all_objects)
+    # Each relationship map is built once from srcs and shared by every technique
+    technique_mitigated_by_mitigation = util.relationshipgetters.get_technique_mitigated_by_mitigation(srcs)
+    datacomponents_detecting_technique = util.relationshipgetters.get_datacomponents_detecting_technique(srcs)
+    mitigations = {}
+    datasource_names = {
+        obj["id"]: obj["name"] for obj in all_objects if obj.get("type") == "x-mitre-data-source" and obj.get("name")
+    }
+
+    techniques = {}
+    for technique in util.buildhelpers.filter_deprecated_revoked(
+        [obj for obj in all_objects if obj.get("type") == "attack-pattern"]
+    ):
+        attack_id = util.buildhelpers.get_attack_id(technique)
+        if not attack_id or attack_id in techniques:
+            continue
+        techniques[attack_id] = {
+            "name": technique["name"],
+            "domains": technique.get("x_mitre_domains", []),
+            "tactics": get_technique_tactics(technique, tactics),
+            "mitigations": get_technique_mitigations(technique, technique_mitigated_by_mitigation, mitigations),
+            "detections": get_technique_detections(technique, datacomponents_detecting_technique, datasource_names),
+        }
+
+    return {
+        "tactics": {
+            tactic["id"]: {"name": tactic["name"], "shortname": tactic["shortname"], "domain": tactic["domain"]}
+            for tactic in tactics.values()
+        },
+        "mitigations": dict(sorted(mitigations.items())),
+        "techniques": dict(sorted(techniques.items())),
+    }
@@ -16,6 +16,7 @@ import requests
 from stix2 import MemoryStore
 from util import relationshipgetters
 import groups
+import catalog
 import glob
 
 # URLs for MITRE ATT&CK data
@@ -26,6 +27,9 @@ SOURCES = [
 ]
 
 OUTPUT_DIR = "../data"
+# Technique catalog (tactics, mitigations, technique -> tactics/mitigations/detections); kept in a subdirectory so
+# readers of the per-group *.json files do not pick it up
+CATALOG_PATH = os.path.join(OUTPUT_DIR, "catalog", "techniques.json")
 
 def clean_output_dir():
     files = glob.glob(os.path.join(OUTPUT_DIR, "*.json"))
@@ -69,6 +73,15 @@ def main():
     relationshipgetters.set_technique_to_domain(technique_to_domain)
     print(f"[INFO] Set technique-to-domain map.")
 
+    # Write the technique catalog: each technique's tactics (from its kill_chain_phases),
+    # mitigations and detecting data components
+    technique_catalog = catalog.build_technique_catalog(all_objects, srcs)
+    os.makedirs(os.path.dirname(CATALOG_PATH), exist_ok=True)
+    with open(CATALOG_PATH, "w", encoding="utf-8") as f:
+        json.dump(technique_catalog, f, indent=2, ensure_ascii=False)
+    print(f"[INFO] Wrote {CATALOG_PATH} with {len(technique_catalog['techniques'])} techniques, "
+          f"{len(technique_catalog['tactics'])} tactics and {len(technique_catalog['mitigations'])} mitigations.")
+
     # Write output: one JSON file per group, batch-wise
     os.makedirs(OUTPUT_DIR, exist_ok=True)
     batch_size = 10  # You can adjust this for your memory constraints
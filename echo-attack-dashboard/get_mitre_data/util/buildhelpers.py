@@ -94,11 +94,14 @@ def get_alias_data(alias_list, ext_refs):
     """Generate the Alias Description section for the pages."""
     if not alias_list:
         return []
+    # First reference per source name, matching the previous first-match scan
+    refs_by_source = {}
+    for ext in ext_refs:
+        refs_by_source.setdefault(ext["source_name"], ext)
     alias_data = []
     for alias in alias_list:
-        found_ext_refs = [x for x in ext_refs if x["source_name"] == alias]
-        if found_ext_refs:
-            ext = found_ext_refs[0]
+        ext = refs_by_source.get(alias)
+        if ext:
             if ext.get("description"):
                 row = {"name": alias, "descr": ext["description"]}
                 alias_data.append(row)
@@ -1,5 +1,4 @@
 from . import relationshiphelpers as rsh
-from . import stixhelpers
 
 malware_used_by_groups = {}
 tools_used_by_groups = {}
@@ -102,21 +101,13 @@ def get_assets_targeted_by_techniques(srcs):
 
 
 def get_techniques_detected_by_datacomponent(srcs):
-    global techniques_detected_by_datacomponent
-
-    if not techniques_detected_by_datacomponent:
-        techniques_detected_by_datacomponent = rsh.techniques_detected_by_datacomponent(get_srcs())
-
-    return techniques_detected_by_datacomponent
+    """techniques detected by data component getter"""
+    return rsh.techniques_detected_by_datacomponent(srcs)
 
 
 def get_datacomponents_detecting_technique(srcs):
-    global datacomponents_detecting_technique
-
-    if not datacomponents_detecting_technique:
-        datacomponents_detecting_technique = rsh.datacomponents_detecting_technique(get_srcs())
-
-    return datacomponents_detecting_technique
+    """data components detecting technique getter"""
+    return rsh.datacomponents_detecting_technique(srcs)
 
 
 def get_groups_using_tool(srcs):
@@ -0,0 +1,417 @@
+#!/usr/bin/env python3
+"""
+MITRE Cache Benchmarks
+Times cold-start loading of APT group files, measures the memory held by loaded groups,
+times attribution scoring of synthetic incidents and runs the full benchmark suite (cold,
+warm and in-memory loads, search and lookups), on the checked-in data and on synthetic
+scaled copies. Suite results can be saved as JSON and compared against a baseline; a
+regression exits non-zero.
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List, Tuple
+
+import mitre_cache
+from mitre_cache import MITRECache, APTGroup, LazyGroupMapping, TechniqueCatalog, read_group_file
+
+DEFAULT_DATA_DIR = Path(__file__).resolve().parent.parent / "echo-attack-dashboard" / "data"
+
+# Free-text queries for the search benchmark: names, aliases, IDs, themes, short fragments
+SEARCH_QUERY_CORPUS = [
+    "apt28", "apt29", "lazarus", "turla", "fin7", "carbanak", "sandworm", "kimsuky",
+    "fancy bear", "cozy bear", "panda", "kitten", "G0007", "G0032",
+    "china", "russia", "iran", "north korea", "financial", "espionage",
+    "ransomware", "spearphishing", "government", "energy", "x", "ta",
+]
+TECHNIQUE_NAME_QUERIES = ["Phishing", "PowerShell", "Credential", "Registry", "Scheduled Task"]
+
+# A suite metric regresses when it is slower than baseline by more than the tolerance
+# and by more than an absolute floor, which keeps run-to-run noise from failing runs.
+# The floor is min-delta-ms scaled by the metric's kind: load times (metrics in
+# seconds) jitter by tens of milliseconds and p95 latencies by a few, medians and
+# means by well under one
+DEFAULT_TOLERANCE = 0.25
+DEFAULT_MIN_DELTA_MS = 1.0
+MIN_DELTA_SCALES = (("_s", 50.0), ("_p95_ms", 2.5))
+# Baseline comparisons need medians of at least this many load runs
+MIN_BASELINE_REPEAT = 3
+
+
+def make_synthetic_dataset(source_dir: Path, target_dir: Path, factor: int) -> int:
+    """Write `factor` copies of every group file with unique attack IDs and names.
+
+    Copy 0 keeps the original IDs; copy k turns G0007 into G{k}0007.
+    Returns the number of files written.
+    """
+    target_dir.mkdir(parents=True, exist_ok=True)
+    written = 0
+    for json_file in sorted(source_dir.glob("*.json")):
+        with open(json_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        attack_id = data.get('attack_id') or json_file.stem
+        name = data.get('name', attack_id)
+        for copy in range(factor):
+            if copy:
+                data['attack_id'] = f"G{copy}{attack_id[1:]}"
+                data['name'] = f"{name} #{copy}"
+            out_path = target_dir / f"{data['attack_id']}.json"
+            with open(out_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            written += 1
+    return written
+
+
+async def bench_cold_start(data_dir: Path, load_workers: int = None) -> Dict[str, Any]:
+    """Time a cold `load_mitre_data` (empty cache DB) and, from the cache's metrics, its file-parsing phase."""
+    cache_dir = Path(tempfile.mkdtemp(prefix="mitre_bench_"))
+    try:
+        cache = MITRECache(cache_dir=str(cache_dir), load_workers=load_workers, mitre_data_dir=str(data_dir))
+
+        start = time.perf_counter()
+        groups = await cache.load_mitre_data()
+        cold_seconds = time.perf_counter() - start
+        parse_seconds = cache.metrics.snapshot()["operations"]["files.parse"]["total_ms"] / 1000
+        
+        return {
+            "groups": len(groups),
+            "load_workers": load_workers,
+            "parse_seconds": round(parse_seconds, 4),
+            "cold_start_seconds": round(cold_seconds, 4),
+        }
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+
+def bench_memory(data_dir: Path) -> Dict[str, Any]:
+    """Compare traced memory of every group held as raw JSON dicts vs compact APTGroups."""
+    paths = [str(p) for p in sorted(data_dir.glob("*.json"))]
+
+    # Compact records against a fresh catalog, so the catalog itself is counted; the
+    # library's catalog is put back afterwards
+    original_catalog = mitre_cache.technique_catalog
+    mitre_cache.technique_catalog = TechniqueCatalog()
+    try:
+        tracemalloc.start()
+        groups = []
+        for path in paths:
+            try:
+                groups.append(APTGroup(**read_group_file(path)))
+            except ValueError:
+                continue
+        compact_bytes, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del groups
+        catalog_techniques = len(mitre_cache.technique_catalog)
+    finally:
+        mitre_cache.technique_catalog = original_catalog
+
+    # Raw dicts: what APTGroup held before the compact representation
+    tracemalloc.start()
+    payloads = []
+    for path in paths:
+        try:
+            payloads.append(read_group_file(path))
+        except ValueError:
+            continue
+    dict_bytes, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del payloads
+
+    return {
+        "groups": len(paths),
+        "dict_mb": round(dict_bytes / 2**20, 2),
+        "compact_mb": round(compact_bytes / 2**20, 2),
+        "saved_pct": round(100 * (1 - compact_bytes / dict_bytes), 1) if dict_bytes else 0.0,
+        "catalog_techniques": catalog_techniques,
+    }
+
+
+def make_incidents(groups: LazyGroupMapping, count: int, size: int, noise: float = 0.2,
+                   seed: int = 0) -> List[Tuple[str, List[str]]]:
+    """Sample synthetic incidents as (source attack ID, observed technique IDs).
+
+    Each incident takes up to `size` techniques from one group's used techniques and
+    replaces a `noise` fraction of them with techniques drawn from the whole matrix.
+    """
+    rng = random.Random(seed)
+    technique_ids = groups.usage_matrix.technique_ids
+    sources = [summary for summary in groups.summaries.values() if summary.used_technique_ids]
+    incidents = []
+    for _ in range(count):
+        summary = rng.choice(sources)
+        observed = rng.sample(summary.used_technique_ids, min(size, len(summary.used_technique_ids)))
+        noisy = int(len(observed) * noise)
+        observed[:noisy] = rng.sample(technique_ids, noisy)
+        observed += rng.sample(technique_ids, max(0, size - len(observed)))
+        incidents.append((summary.attack_id, observed))
+    return incidents
+
+
+async def bench_scoring(data_dir: Path, sizes, count: int = 200, k: int = 10) -> List[Dict[str, Any]]:
+    """Time `score_groups` on synthetic incidents and how often the source group ranks first / in top k."""
+    cache_dir = Path(tempfile.mkdtemp(prefix="mitre_bench_"))
+    try:
+        cache = MITRECache(cache_dir=str(cache_dir), mitre_data_dir=str(data_dir))
+        groups = await cache.load_mitre_data()
+        await cache.score_groups(["T1059"])  # build IDF weights outside the timed loop
+
+        results = []
+        for size in sizes:
+            incidents = make_incidents(groups, count, size)
+            top1 = topk = 0
+            start = time.perf_counter()
+            for attack_id, observed in incidents:
+                ranked = [result["attack_id"] for result in await cache.score_groups(observed, k)]
+                top1 += bool(ranked) and ranked[0] == attack_id
+                topk += attack_id in ranked
+            elapsed = time.perf_counter() - start
+            results.append({
+                "groups": len(groups),
+                "observed": size,
+                "incidents": count,
+                "ms_per_query": round(1000 * elapsed / count, 3),
+                "top1_pct": round(100 * top1 / count, 1),
+                f"top{k}_pct": round(100 * topk / count, 1),
+            })
+        return results
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+
+def _latency_stats(samples: List[float]) -> Dict[str, float]:
+    ordered = sorted(samples)
+    return {
+        "mean_ms": round(1000 * statistics.fmean(ordered), 4),
+        "p50_ms": round(1000 * ordered[len(ordered) // 2], 4),
+        "p95_ms": round(1000 * ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))], 4),
+    }
+
+
+async def _time_calls(calls) -> Dict[str, float]:
+    samples = []
+    for call in calls:
+        start = time.perf_counter()
+        await call()
+        samples.append(time.perf_counter() - start)
+    return _latency_stats(samples)
+
+
+async def bench_suite(data_dir: Path, repeat: int = 3) -> Dict[str, Any]:
+    """Time loads (cold, warm, in-memory), lookups, and search, fuzzy search and
+    autocomplete over SEARCH_QUERY_CORPUS.
+
+    Load times are the median of `repeat` runs. Query timings run with the query
+    result cache disabled, so they measure the lookups themselves; one cached search
+    pass is reported separately.
+    """
+    cold, warm, in_memory = [], [], []
+    for _ in range(repeat):
+        cache_dir = Path(tempfile.mkdtemp(prefix="mitre_bench_"))
+        try:
+            cache = MITRECache(cache_dir=str(cache_dir), mitre_data_dir=str(data_dir))
+            start = time.perf_counter()
+            await cache.load_mitre_data()
+            cold.append(time.perf_counter() - start)
+
+            cache = MITRECache(cache_dir=str(cache_dir), mitre_data_dir=str(data_dir), query_cache_size=0)
+            start = time.perf_counter()
+            await cache.load_mitre_data()
+            warm.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            await cache.load_mitre_data()
+            in_memory.append(time.perf_counter() - start)
+        finally:
+            shutil.rmtree(cache_dir, ignore_errors=True)
+
+    cache_dir = Path(tempfile.mkdtemp(prefix="mitre_bench_"))
+    try:
+        cache = MITRECache(cache_dir=str(cache_dir), mitre_data_dir=str(data_dir), query_cache_size=0)
+        groups = await cache.load_mitre_data()
+        technique_ids = groups.usage_matrix.technique_ids
+        technique_queries = technique_ids[::max(1, len(technique_ids) // 50)] + TECHNIQUE_NAME_QUERIES
+        software_names = sorted({name for summary in groups.summaries.values() for _, name in summary.software})
+        software_queries = software_names[::max(1, len(software_names) // 30)] + ["mimikatz", "cobalt", "S0002"]
+
+        # Hydrate once so lookups measure index work rather than first-touch parsing
+        for attack_id in list(groups)[:cache.hydrated_cache_size]:
+            await cache.get_apt_group(attack_id)
+        
+        result = {
+            "groups": len(groups),
+            "cold_start_s": round(statistics.median(cold), 4),
+            "warm_start_s": round(statistics.median(warm), 4),
+            "in_memory_load_ms": round(1000 * statistics.median(in_memory), 4),
+        }
+        for name, stats in (
+            ("search", await _time_calls([lambda q=q: cache.search_apt_groups(q) for q in SEARCH_QUERY_CORPUS])),
+            ("lookup_technique", await _time_calls(
+                [lambda t=t: cache.get_apt_groups_by_technique(t) for t in technique_queries])),
+            ("lookup_software", await _time_calls(
+                [lambda n=n: cache.get_apt_groups_by_software(n) for n in software_queries])),
+            ("all_techniques", await _time_calls([cache.get_all_techniques] * 20)),
+            ("fuzzy_search", await _time_calls([lambda q=q: cache.fuzzy_search(q) for q in SEARCH_QUERY_CORPUS])),
+            ("autocomplete", await _time_calls([lambda q=q: cache.autocomplete(q[:3]) for q in SEARCH_QUERY_CORPUS])),
+        ):
+            for stat, value in stats.items():
+                result[f"{name}_{stat}"] = value
+
+        cached = MITRECache(cache_dir=str(cache_dir), mitre_data_dir=str(data_dir))
+        await cached.load_mitre_data()
+        for query in SEARCH_QUERY_CORPUS:
+            await cached.search_apt_groups(query)
+        stats = await _time_calls([lambda q=q: cached.search_apt_groups(q) for q in SEARCH_QUERY_CORPUS])
+        result["search_cached_mean_ms"] = stats["mean_ms"]
+        return result
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+
+def compare_to_baseline(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]],
+                        tolerance: float = DEFAULT_TOLERANCE,
+                        min_delta_ms: float = DEFAULT_MIN_DELTA_MS) -> List[str]:
+    """List every timing that is slower than baseline beyond tolerance and its absolute floor.
+    
+    The floor is min_delta_ms times the metric's MIN_DELTA_SCALES entry (1 if none matches).
+    """
+    regressions = []
+    for dataset, metrics in results.items():
+        for metric, value in metrics.items():
+            base = baseline.get(dataset, {}).get(metric)
+            if base is None or metric == "groups":
+                continue
+            delta_ms = (value - base) * (1000 if metric.endswith("_s") else 1)
+            scale = next((scale for suffix, scale in MIN_DELTA_SCALES if metric.endswith(suffix)), 1.0)
+            if value > base * (1 + tolerance) and delta_ms > min_delta_ms * scale:
+                regressions.append(f"{dataset} {metric}: {value} vs baseline {base} "
+                                   f"(+{100 * (value / base - 1):.0f}%)")
+    return regressions
+
+
+async def run_suite(data_dir: Path, factors, repeat: int = 3) -> Dict[str, Dict[str, Any]]:
+    results = {}
+    for factor in factors:
+        if factor == 1:
+            bench_dir, tmp_dir = data_dir, None
+        else:
+            tmp_dir = Path(tempfile.mkdtemp(prefix=f"mitre_synth_{factor}x_"))
+            bench_dir = tmp_dir / "data"
+            make_synthetic_dataset(data_dir, bench_dir, factor)
+        try:
+            result = await bench_suite(bench_dir, repeat)
+        finally:
+            if tmp_dir:
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+        results[f"{factor}x"] = result
+        print(f"{factor:>4}x {result['groups']:>6} groups  cold={result['cold_start_s']:.3f}s  "
+              f"warm={result['warm_start_s']:.3f}s  in-memory={result['in_memory_load_ms']:.3f}ms  "
+              f"search p50={result['search_p50_ms']:.3f}ms  technique p50={result['lookup_technique_p50_ms']:.3f}ms  "
+              f"software p50={result['lookup_software_p50_ms']:.3f}ms  "
+              f"all_techniques={result['all_techniques_mean_ms']:.3f}ms")
+    return results
+
+
+async def run(data_dir: Path, factors, workers, memory: bool = False, incident_sizes=None):
+    results = []
+    for factor in factors:
+        if factor == 1:
+            bench_dir, tmp_dir = data_dir, None
+        else:
+            tmp_dir = Path(tempfile.mkdtemp(prefix=f"mitre_synth_{factor}x_"))
+            bench_dir = tmp_dir / "data"
+            make_synthetic_dataset(data_dir, bench_dir, factor)
+        try:
+            if incident_sizes:
+                for result in await bench_scoring(bench_dir, incident_sizes):
+                    result["dataset"] = f"{factor}x"
+                    results.append(result)
+                    print(f"{result['dataset']:>5} {result['groups']:>6} groups  observed={result['observed']:>4}  "
+                          f"{result['ms_per_query']:.3f}ms/query  top1={result['top1_pct']}%  "
+                          f"top10={result['top10_pct']}%")
+                continue
+            if memory:
+                result = bench_memory(bench_dir)
+                result["dataset"] = f"{factor}x"
+                results.append(result)
+                print(f"{result['dataset']:>5} {result['groups']:>6} groups  dicts={result['dict_mb']:.1f}MB  "
+                      f"compact={result['compact_mb']:.1f}MB  saved={result['saved_pct']}%")
+                continue
+            for load_workers in workers:
+                result = await bench_cold_start(bench_dir, load_workers)
+                result["dataset"] = f"{factor}x"
+                results.append(result)
+                print(f"{result['dataset']:>5} {result['groups']:>6} groups  workers={str(load_workers):>4}  "
+                      f"parse={result['parse_seconds']:.3f}s  cold_start={result['cold_start_seconds']:.3f}s")
+        finally:
+            if tmp_dir:
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark MITRECache cold start, memory footprint and scoring")
+    parser.add_argument("--data-dir", type=Path, default=DEFAULT_DATA_DIR, help="Directory of group JSON files")
+    parser.add_argument("--factors", type=int, nargs="+", default=[1, 10], help="Synthetic dataset scale factors")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 0],
+                        help="load_workers values to compare (0 = one per CPU)")
+    parser.add_argument("--memory", action="store_true",
+                        help="Measure traced memory of loaded groups instead of load times")
+    parser.add_argument("--incidents", type=int, nargs="+", metavar="SIZE",
+                        help="Time score_groups on synthetic incidents with these observed-technique counts")
+    parser.add_argument("--suite", action="store_true",
+                        help="Run the full suite: cold/warm/in-memory loads, search corpus and lookups")
+    parser.add_argument("--repeat", type=int, default=3, help="Suite load runs per dataset (median is kept)")
+    parser.add_argument("--output", type=Path, help="Write suite results as JSON")
+    parser.add_argument("--baseline", type=Path, help="Fail if suite results regress against this JSON file")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="Allowed slowdown vs baseline as a fraction (default 0.25)")
+    parser.add_argument("--min-delta-ms", type=float, default=DEFAULT_MIN_DELTA_MS,
+                        help="Ignore slowdowns smaller than this many milliseconds "
+                             "(scaled up for load times and p95 latencies)")
+    args = parser.parse_args()
+    if args.baseline and args.repeat < MIN_BASELINE_REPEAT:
+        parser.error(f"--baseline needs --repeat {MIN_BASELINE_REPEAT} or more; single load runs are too noisy")
+
+    if not args.suite:
+        workers = [w or None for w in args.workers]
+        asyncio.run(run(args.data_dir, args.factors, workers, memory=args.memory, incident_sizes=args.incidents))
+        return
+
+    results = asyncio.run(run_suite(args.data_dir, args.factors, args.repeat))
+    if args.output:
+        args.output.write_text(json.dumps({
+            "meta": {
+                "created": datetime.now().isoformat(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "repeat": args.repeat,
+            },
+            "results": results,
+        }, indent=2))
+        print(f"Wrote {args.output}")
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())["results"]
+        regressions = compare_to_baseline(results, baseline, args.tolerance, args.min_delta_ms)
+        if regressions:
+            print(f"PERFORMANCE REGRESSION against {args.baseline}:", file=sys.stderr)
+            for regression in regressions:
+                print(f"  {regression}", file=sys.stderr)
+            sys.exit(1)
+        print(f"No regressions against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+MITRE Query Service
+Read-only ASGI application serving paginated JSON views of a MITRECache. Run it with
+`python mitre_api.py [port]` (needs uvicorn) or point any ASGI server at MITREQueryApp().
+"""
+
+import argparse
+import asyncio
+import gzip
+import hashlib
+import json
+from typing import Awaitable, Callable, Dict, List, Any, Optional, Tuple
+from urllib.parse import parse_qs
+
+import structlog
+
+from mitre_cache import MITRECache, SIMILARITY_METRICS, get_mitre_cache
+
+try:
+    import orjson  # Optional faster JSON backend
+except ImportError:
+    orjson = None
+
+try:
+    import uvicorn  # Optional ASGI server for running the service directly
+except ImportError:
+    uvicorn = None
+
+logger = structlog.get_logger()
+
+# Page sizes, the largest offset a list route takes and the smallest response body
+# worth gzipping
+API_DEFAULT_PAGE_SIZE = 50
+API_MAX_PAGE_SIZE = 500
+API_MAX_OFFSET = 100_000
+API_GZIP_MIN_BYTES = 1024
+API_SUMMARY_FIELDS = ("attack_id", "name", "description_preview", "aliases_list",
+                      "techniques_count", "software_count", "campaign_count")
+API_GROUP_FIELDS = ("attack_id", "name", "description", "created", "modified", "version", "technique_table_data",
+                    "software_data", "campaign_data", "alias_descriptions", "citations", "aliases_list")
+API_SIMILAR_FIELDS = ("attack_id", "name", "similarity", "shared_techniques", "techniques_used")
+API_SEARCH_FIELDS = ("attack_id", "name", "description", "aliases", "relevance_score", "context",
+                     "techniques_count", "software_count")
+# Metrics routes => MITRECache.export_metrics format and response content type
+API_METRICS_PATHS = {
+    "/metrics": ("prometheus", b"text/plain; version=0.0.4"),
+    "/metrics.json": ("json", b"application/json"),
+}
+
+
+def _json_dumps(value: Any) -> bytes:
+    """Serialize to compact JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, separators=(",", ":")).encode('utf-8')
+
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    """Whether an Accept-Encoding header allows gzip; a q-value of 0 refuses it."""
+    qualities = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding] = quality
+    return qualities.get("gzip", qualities.get("*", 0.0)) > 0
+
+
+class _APIError(Exception):
+    """An HTTP error response raised while handling a query service request."""
+    
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class MITREQueryApp:
+    """Read-only ASGI application serving paginated JSON views of a MITRECache.
+    
+    Routes (GET and HEAD):
+        /                               dataset version and group count
+        /groups                         group summaries
+        /groups/{id}                    one full group; ID, name or alias
+        /groups/{id}/similar            most similar groups (k, metric)
+        /search?q=...                   ranked search results
+        /techniques/{id}/groups         summaries of groups using a technique
+        /software/{id or name}/groups   summaries of groups using software
+        /metrics, /metrics.json         cache metrics as Prometheus text or JSON
+    
+    List routes take offset and limit, and every route takes fields=a,b,c to trim
+    items. Each request reads one dataset snapshot (MITRECache.snapshot) for its
+    ETag, dataset_version and body. Parameters are validated first; a valid request
+    whose weak ETag (dataset version and request URL) matches If-None-Match is then
+    answered with 304 before any query runs. Bodies are gzipped for clients that
+    accept it.
+    """
+    
+    def __init__(self, cache: Optional[MITRECache] = None):
+        self._cache = cache
+    
+    @property
+    def cache(self) -> MITRECache:
+        return self._cache if self._cache is not None else get_mitre_cache()
+    
+    async def __call__(self, scope: Dict[str, Any], receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+        elif scope["type"] == "http":
+            await self._http(scope, send)
+    
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                try:
+                    await self.cache.load_mitre_data()
+                except Exception as e:
+                    await send({"type": "lifespan.startup.failed", "message": str(e)})
+                    return
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+    
+    async def _http(self, scope: Dict[str, Any], send):
+        cache = self.cache
+        headers = {name.decode("latin-1").lower(): value.decode("latin-1") for name, value in scope["headers"]}
+        query_string = scope.get("query_string", b"").decode("latin-1")
+        status, body, etag, content_type = 200, b"", None, b"application/json"
+        
+        with cache.metrics.timer("api.request"):
+            try:
+                if scope["method"] not in ("GET", "HEAD"):
+                    raise _APIError(405, "Only GET and HEAD are supported")
+                await cache.load_mitre_data()
+                
+                if scope["path"] in API_METRICS_PATHS:
+                    # Metrics change with every request, so they are never cached
+                    metrics_format, content_type = API_METRICS_PATHS[scope["path"]]
+                    body = cache.export_metrics(metrics_format).encode('utf-8')
+                else:
+                    summaries, version = cache.snapshot()
+                    handler = self._route(scope["path"], parse_qs(query_string), summaries, version)
+                    etag = 'W/"%s"' % hashlib.sha256(
+                        f"{version}\0{scope['path']}?{query_string}".encode()).hexdigest()[:32]
+                    if_none_match = headers.get("if-none-match", "")
+                    if if_none_match.strip() == "*" or etag in (tag.strip() for tag in if_none_match.split(",")):
+                        status = 304
+                    else:
+                        body = _json_dumps(await handler())
+            except _APIError as e:
+                status, body, etag = e.status, _json_dumps({"error": e.message}), None
+                content_type = b"application/json"
+            except Exception as e:
+                logger.error(f"Query service request failed: {e}")
+                status, body, etag = 500, _json_dumps({"error": "Internal error"}), None
+                content_type = b"application/json"
+        cache.metrics.increment(f"api.responses.{status}")
+        
+        response_headers = [(b"content-type", content_type), (b"vary", b"Accept-Encoding")]
+        if etag is not None:
+            response_headers += [(b"etag", etag.encode()), (b"cache-control", b"no-cache")]
+        if len(body) >= API_GZIP_MIN_BYTES and _accepts_gzip(headers.get("accept-encoding", "")):
+            body = gzip.compress(body, compresslevel=6)
+            response_headers.append((b"content-encoding", b"gzip"))
+        response_headers.append((b"content-length", str(len(body)).encode()))
+        
+        await send({"type": "http.response.start", "status": status, "headers": response_headers})
+        await send({"type": "http.response.body", "body": b"" if scope["method"] == "HEAD" else body})
+    
+    @staticmethod
+    def _int_param(params: Dict[str, List[str]], name: str, default: int, maximum: int) -> int:
+        try:
+            value = int(params.get(name, [default])[0])
+        except ValueError:
+            raise _APIError(400, f"{name} must be an integer")
+        if not 0 <= value <= maximum:
+            raise _APIError(400, f"{name} must be between 0 and {maximum}")
+        return value
+    
+    @staticmethod
+    def _fields(params: Dict[str, List[str]], allowed) -> Optional[List[str]]:
+        if "fields" not in params:
+            return None
+        fields = [name for name in params["fields"][0].split(",") if name]
+        unknown = [name for name in fields if name not in allowed]
+        if unknown:
+            raise _APIError(400, f"Unknown fields: {', '.join(unknown)}")
+        return fields
+    
+    def _page_params(self, params: Dict[str, List[str]], allowed) -> Tuple[int, int, Optional[List[str]]]:
+        """Validated offset, limit and fields of a list route."""
+        return (self._int_param(params, "offset", 0, API_MAX_OFFSET),
+                self._int_param(params, "limit", API_DEFAULT_PAGE_SIZE, API_MAX_PAGE_SIZE),
+                self._fields(params, allowed))
+    
+    @staticmethod
+    def _page(version: str, items: List[Any], page_params: Tuple[int, int, Optional[List[str]]], render,
+              complete: bool = True) -> Dict[str, Any]:
+        """Envelope for one page of items; render(item) gives the item's full dict.
+        
+        With complete=False, items end just past this page, so the total is unknown.
+        """
+        offset, limit, fields = page_params
+        page = []
+        for item in items[offset:offset + limit]:
+            data = render(item)
+            page.append(data if fields is None else {name: data[name] for name in fields})
+        return {
+            "dataset_version": version,
+            "offset": offset,
+            "limit": limit,
+            "total": len(items) if complete else None,
+            "next_offset": offset + limit if offset + limit < len(items) else None,
+            "items": page,
+        }
+    
+    def _summary_page(self, summaries: Dict[str, Any], version: str, attack_ids: List[str],
+                      page_params: Tuple[int, int, Optional[List[str]]]) -> Dict[str, Any]:
+        # IDs from a query that already read a newer dataset may be missing from this snapshot
+        attack_ids = [attack_id for attack_id in attack_ids if attack_id in summaries]
+        return self._page(version, attack_ids, page_params,
+                          lambda attack_id: {name: getattr(summaries[attack_id], name) for name in API_SUMMARY_FIELDS})
+    
+    def _route(self, path: str, params: Dict[str, List[str]], summaries: Dict[str, Any],
+               version: str) -> Callable[[], Awaitable[Dict[str, Any]]]:
+        """Validate a request against one dataset snapshot and return the handler producing its body.
+        
+        Unknown routes and invalid parameters raise _APIError here, so a bad request
+        fails before any ETag comparison.
+        """
+        cache = self.cache
+        parts = [part for part in path.split("/") if part]
+        
+        if not parts:
+            async def handler():
+                return {"dataset_version": version, "total_groups": len(summaries)}
+            return handler
+        
+        if parts == ["groups"]:
+            page_params = self._page_params(params, API_SUMMARY_FIELDS)
+            
+            async def handler():
+                return self._summary_page(summaries, version, sorted(summaries), page_params)
+            return handler
+        
+        if parts[0] == "groups" and len(parts) in (2, 3):
+            attack_id = parts[1] if parts[1] in summaries else cache.resolve_alias(parts[1])
+            if attack_id not in summaries:
+                raise _APIError(404, f"Unknown group: {parts[1]}")
+            if len(parts) == 2:
+                fields = self._fields(params, API_GROUP_FIELDS)
+                
+                async def handler():
+                    apt_group = await cache.get_apt_group(attack_id)
+                    if apt_group is None:
+                        # Summarized but its stored payload could not be loaded
+                        raise _APIError(404, f"Unknown group: {parts[1]}")
+                    data = apt_group.to_dict()
+                    return data if fields is None else {name: data[name] for name in fields}
+                return handler
+            if parts[2] == "similar":
+                k = self._int_param(params, "k", 10, API_MAX_PAGE_SIZE)
+                metric = params.get("metric", ["jaccard"])[0]
+                if metric not in SIMILARITY_METRICS:
+                    raise _APIError(400, f"metric must be one of {', '.join(SIMILARITY_METRICS)}")
+                page_params = self._page_params(params, API_SIMILAR_FIELDS)
+                
+                async def handler():
+                    return self._page(version, await cache.get_similar_groups(attack_id, k, metric), page_params, dict)
+                return handler
+        
+        if parts == ["search"]:
+            query = params.get("q", [""])[0].strip()
+            if not query:
+                raise _APIError(400, "q is required")
+            page_params = self._page_params(params, API_SEARCH_FIELDS)
+            offset, limit, _ = page_params
+            
+            async def handler():
+                # Results are ranked, so only the pages up to this one are fetched; one
+                # extra result tells whether another page exists
+                results = await cache.search_apt_groups(query, max_results=offset + limit + 1)
+                return self._page(version, results, page_params, dict, complete=len(results) <= offset + limit)
+            return handler
+        
+        if len(parts) == 3 and parts[2] == "groups" and parts[0] in ("techniques", "software"):
+            page_params = self._page_params(params, API_SUMMARY_FIELDS)
+            lookup = cache.get_group_ids_by_technique if parts[0] == "techniques" else cache.get_group_ids_by_software
+            
+            async def handler():
+                return self._summary_page(summaries, version, await lookup(parts[1]), page_params)
+            return handler
+        
+        raise _APIError(404, f"Unknown route: {path}")
+
+
+async def main():
+    """Serve MITREQueryApp over the shared cache: `python mitre_api.py [port] [--host HOST]`."""
+    parser = argparse.ArgumentParser(description="Serve the MITRE cache query service")
+    parser.add_argument("port", nargs="?", type=int, default=8000)
+    parser.add_argument("--host", default="127.0.0.1")
+    args = parser.parse_args()
+    
+    if uvicorn is None:
+        print("Serving needs uvicorn installed; MITREQueryApp() also runs under any other ASGI server")
+        return
+    await uvicorn.Server(uvicorn.Config(MITREQueryApp(get_mitre_cache()), host=args.host, port=args.port)).serve()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,60 +1,1520 @@
 """
 MITRE Data Cache Service
-Handles caching, loading, and querying of MITRE APT group data from the get_mitre_data/output folder.
+Handles caching, loading, and querying of MITRE APT group data from one or more source
+directories of group JSON files (mitre_data_dir, else MITRE_DATA_DIRS, else the ETL's
+data folder). Earlier directories take precedence when several provide the same group.
 """
 
 import asyncio
+import bisect
+import copy
+import functools
 import json
 import os
+import re
+import shutil
 import sqlite3
-from typing import Dict, List, Any, Optional, Set
+import sys
+import threading
+import time
+from collections import Counter, OrderedDict
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Dict, List, Any, Iterator, Optional, Sequence, Set, Tuple, Union
 from datetime import datetime, timedelta
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, field
+import numpy as np
 import structlog
 from pathlib import Path
 import hashlib
 
+from mitre_metrics import CacheMetrics
+
+if TYPE_CHECKING:
+    from mitre_shared import SharedDataset
+
+try:
+    import orjson  # Optional faster JSON backend
+except ImportError:
+    orjson = None
+
+try:
+    import resource  # Unix only; used for the process peak RSS gauge
+except ImportError:
+    resource = None
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:  # Optional; source files are polled without it
+    FileSystemEventHandler = Observer = None
+
 logger = structlog.get_logger()
 
+# Below this many files the process pool start-up costs more than it saves
+PARALLEL_LOAD_MIN_FILES = 64
+
+# Bump when the search index terms or scoring change so stamped indexes get rebuilt
+SEARCH_INDEX_FORMAT = 1
+
+# Default number of fully hydrated APTGroup objects kept in memory
+DEFAULT_HYDRATED_CACHE_SIZE = 256
+
+# Query result cache bounds: entries kept and seconds an entry stays fresh (None = no TTL)
+DEFAULT_QUERY_CACHE_SIZE = 1024
+DEFAULT_QUERY_CACHE_TTL = 300.0
+
+# Rows of the all-pairs overlap matrix computed per block (bounds peak memory)
+SIMILARITY_BLOCK_ROWS = 1024
+SIMILARITY_METRICS = ("jaccard", "cosine")
+
+# Fuzzy search: kinds of names indexed, minimum trigram similarity for a match, and
+# how many word-start suffixes an autocomplete scans per requested result
+FUZZY_KINDS = ("group", "software", "technique")
+FUZZY_MIN_SCORE = 0.3
+FUZZY_COMPLETION_SCAN = 20
+# Relevance of a fuzzy name match (scaled by similarity) in search_apt_groups, which
+# only falls back to them when no search term matches
+FUZZY_RELEVANCE = 20.0
+
+# Default cache and source locations, relative to this file rather than the working
+# directory; MITRE_CACHE_DIR and MITRE_DATA_DIRS (os.pathsep-separated, highest
+# precedence first) override them
+DEFAULT_CACHE_DIR = str(Path(__file__).resolve().parent / "data" / "mitre_cache")
+DEFAULT_MITRE_DATA_DIR = str(Path(__file__).resolve().parent.parent / "echo-attack-dashboard" / "data")
+DEFAULT_CACHE_DURATION = timedelta(hours=24)
+
+# Stale-while-revalidate: entries older than the cache duration are still served for
+# this long while a background revalidation re-hashes source files (None = no limit)
+DEFAULT_STALE_GRACE = timedelta(days=7)
+DEFAULT_REVALIDATION_WORKERS = 4
+
+# Source file watching: seconds between polls, and quiet time after an event before refreshing
+DEFAULT_WATCH_INTERVAL = 5.0
+DEFAULT_WATCH_DEBOUNCE = 1.0
+
+# MITRE ATT&CK Enterprise tactics by ID, in kill chain order
+ATTACK_TACTICS = {
+    "TA0043": "Reconnaissance",
+    "TA0042": "Resource Development",
+    "TA0001": "Initial Access",
+    "TA0002": "Execution",
+    "TA0003": "Persistence",
+    "TA0004": "Privilege Escalation",
+    "TA0005": "Defense Evasion",
+    "TA0006": "Credential Access",
+    "TA0007": "Discovery",
+    "TA0008": "Lateral Movement",
+    "TA0009": "Collection",
+    "TA0011": "Command and Control",
+    "TA0010": "Exfiltration",
+    "TA0040": "Impact",
+}
+
+# Technique catalog written by the ETL, relative to each source directory, and the
+# relations it lists for each technique: tactics (from kill_chain_phases), mitigations
+# and detections (data components). Tactics and mitigations are named under
+# top-level keys of the same name
+TECHNIQUE_CATALOG_FILE = Path("catalog") / "techniques.json"
+CATALOG_RELATIONS = ("tactics", "mitigations", "detections")
+
+# Bump when cache tables change shape; a mismatched cache database is emptied and rebuilt
+CACHE_SCHEMA_VERSION = 7
+
+TECHNIQUE_ID_PATTERN = re.compile(r"^T\d{4}(\.\d{3})?$")
+
+
+def discover_data_dirs(configured: Union[str, Path, Sequence[Union[str, Path]], None] = None) -> List[Path]:
+    """Resolve source directories, highest precedence first.
+    
+    Explicit configuration wins, then the MITRE_DATA_DIRS environment variable,
+    then DEFAULT_MITRE_DATA_DIR. Paths are made absolute so the cache does not
+    depend on the working directory.
+    """
+    if configured is None:
+        configured = os.environ.get("MITRE_DATA_DIRS") or DEFAULT_MITRE_DATA_DIR
+        if isinstance(configured, str):
+            configured = [part for part in configured.split(os.pathsep) if part]
+    elif isinstance(configured, (str, Path)):
+        configured = [configured]
+    
+    dirs = []
+    for directory in configured:
+        path = Path(directory).expanduser().resolve()
+        if path not in dirs:
+            dirs.append(path)
+    return dirs
+
+
+def normalize_name(name: str) -> str:
+    """Case-fold and trim a name for exact-match lookups."""
+    return name.casefold().strip()
+
+
+def normalize_technique_query(query: str) -> str:
+    """Trim a technique query and upper-case it if it is a technique ID (" t1059.001" -> "T1059.001").
+    
+    Anything else is a name fragment and keeps its case.
+    """
+    query = query.strip()
+    return query.upper() if TECHNIQUE_ID_PATTERN.match(query.upper()) else query
+
+
+def _json_loads(raw: bytes) -> Any:
+    """Parse JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def filter_used_techniques(technique_data: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], int, int]:
+    """Filter techniques to only include those actually used by the APT group.
+
+    Returns:
+        Tuple of (filtered techniques, used main techniques, used subtechniques)
+    """
+    filtered_techniques = []
+    used_main_techniques = 0
+    used_subtechniques = 0
+
+    for technique in technique_data:
+        # Check if main technique is used
+        if technique.get('technique_used', False):
+            # If main technique is used, include it with all its subtechniques
+            filtered_techniques.append(technique)
+            used_main_techniques += 1
+            # Count used subtechniques
+            for subtechnique in technique.get('subtechniques', []):
+                if subtechnique.get('technique_used', False):
+                    used_subtechniques += 1
+        else:
+            # If main technique is not used, check subtechniques
+            used_subtechniques_for_this_technique = []
+            for subtechnique in technique.get('subtechniques', []):
+                if subtechnique.get('technique_used', False):
+                    used_subtechniques_for_this_technique.append(subtechnique)
+                    used_subtechniques += 1
+
+            # If any subtechniques are used, include the main technique with only used subtechniques
+            if used_subtechniques_for_this_technique:
+                filtered_technique = technique.copy()
+                filtered_technique['subtechniques'] = used_subtechniques_for_this_technique
+                filtered_technique['technique_used'] = False  # Keep original state for clarity
+                filtered_techniques.append(filtered_technique)
+
+    return filtered_techniques, used_main_techniques, used_subtechniques
+
+
+def _content_hash(raw: bytes) -> str:
+    """Hash raw content to detect changes."""
+    return hashlib.sha256(raw).hexdigest()
+
+
+def _parse_group_file(file_path: str) -> Tuple[str, Optional[Dict[str, Any]], Optional[str], Optional[str]]:
+    """Parse one group file into APTGroup keyword arguments.
+
+    Runs inside worker processes, so it must stay at module level and must not
+    raise: failures are returned as an error string instead.
+
+    Returns:
+        Tuple of (file path, APTGroup kwargs or None, file content hash or None, error message or None)
+    """
+    try:
+        with open(file_path, 'rb') as f:
+            raw = f.read()
+        data = _json_loads(raw)
+
+        # Filter technique data to only include used techniques
+        filtered_technique_data, _, _ = filter_used_techniques(data.get('technique_table_data', []))
+
+        return file_path, {
+            "attack_id": data.get('attack_id', ''),
+            "name": data.get('name', ''),
+            "description": data.get('descr', ''),
+            "created": data.get('created', ''),
+            "modified": data.get('modified', ''),
+            "version": data.get('version', ''),
+            "technique_table_data": filtered_technique_data,
+            "software_data": data.get('software_data', []),
+            "campaign_data": data.get('campaign_data', []),
+            "alias_descriptions": data.get('alias_descriptions', []),
+            "citations": data.get('citations', {}),
+            "aliases_list": data.get('aliases_list', [])
+        }, _content_hash(raw), None
+    except Exception as e:
+        return file_path, None, None, str(e)
+
+
+def read_group_file(file_path: str) -> Dict[str, Any]:
+    """Parse one group file into APTGroup keyword arguments; raises ValueError if it cannot be parsed."""
+    _, group_kwargs, _, error = _parse_group_file(file_path)
+    if error:
+        raise ValueError(f"Failed to parse {file_path}: {error}")
+    return group_kwargs
+
+
+def _intern(value: Any) -> Any:
+    """Intern strings that repeat across groups (IDs, names, citation text)."""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class _Record:
+    """Dict-style read access for slotted records.
+    
+    Lets code written against the raw JSON dicts (`record.get('name')`,
+    `record['id']`) keep working on the compact representation.
+    """
+    __slots__ = ()
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key, default)
+    
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+    
+    def __contains__(self, key: str) -> bool:
+        return hasattr(self, key)
+
+
+@dataclass(frozen=True, slots=True)
+class TechniqueRef:
+    """Technique catalog entry shared by every group that lists the technique."""
+    attack_id: str  # Full ID, e.g. T1134 or T1134.001
+    id: str  # ID as written in group files: T1134, or 001 for a subtechnique
+    name: str
+    domain: str
+
+
+class TechniqueCatalog:
+    """Process-wide catalog that hands out one TechniqueRef per distinct technique."""
+    
+    def __init__(self):
+        self._refs: Dict[Tuple[str, str, str], TechniqueRef] = {}
+        self._by_id: Dict[str, TechniqueRef] = {}
+        self._lock = threading.Lock()
+    
+    def ref(self, attack_id: str, technique_id: str, name: str, domain: str) -> TechniqueRef:
+        """Return the shared reference for a technique, creating it on first sight."""
+        key = (attack_id, name, domain)
+        ref = self._refs.get(key)
+        if ref is None:
+            with self._lock:
+                ref = self._refs.get(key)
+                if ref is None:
+                    ref = TechniqueRef(_intern(attack_id), _intern(technique_id), _intern(name), _intern(domain))
+                    self._refs[key] = ref
+                    self._by_id[ref.attack_id] = ref
+        return ref
+    
+    def get(self, attack_id: str) -> Optional[TechniqueRef]:
+        """Look up a technique by full ID."""
+        return self._by_id.get(attack_id)
+    
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+
+# Global technique catalog shared by all APTGroup records
+technique_catalog = TechniqueCatalog()
+
+
+@dataclass(slots=True)
+class SubTechniqueRecord(_Record):
+    """A subtechnique as listed under a group's technique."""
+    ref: TechniqueRef
+    technique_used: bool
+    descr: str = ""
+    
+    @property
+    def id(self) -> str:
+        return self.ref.id
+    
+    @property
+    def name(self) -> str:
+        return self.ref.name
+    
+    @property
+    def domain(self) -> str:
+        return self.ref.domain
+    
+    @property
+    def subtechniques(self) -> List["SubTechniqueRecord"]:
+        return []
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], parent_id: str) -> "SubTechniqueRecord":
+        sub_id = data.get('id', '')
+        ref = technique_catalog.ref(f"{parent_id}.{sub_id}", sub_id, data.get('name', ''), data.get('domain', ''))
+        return cls(ref=ref, technique_used=data.get('technique_used', False), descr=data.get('descr', ''))
+    
+    def to_dict(self) -> Dict[str, Any]:
+        data = {"technique_used": self.technique_used, "domain": self.domain, "id": self.id, "name": self.name}
+        if self.descr:
+            data["descr"] = self.descr
+        data["subtechniques"] = []
+        return data
+
+
+@dataclass(slots=True)
+class TechniqueRecord(_Record):
+    """A technique in a group's technique table, with its listed subtechniques."""
+    ref: TechniqueRef
+    technique_used: bool
+    descr: str = ""
+    subtechniques: List[SubTechniqueRecord] = field(default_factory=list)
+    
+    @property
+    def id(self) -> str:
+        return self.ref.id
+    
+    @property
+    def name(self) -> str:
+        return self.ref.name
+    
+    @property
+    def domain(self) -> str:
+        return self.ref.domain
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TechniqueRecord":
+        technique_id = data.get('id', '')
+        ref = technique_catalog.ref(technique_id, technique_id, data.get('name', ''), data.get('domain', ''))
+        return cls(
+            ref=ref,
+            technique_used=data.get('technique_used', False),
+            descr=data.get('descr', ''),
+            subtechniques=[SubTechniqueRecord.from_dict(sub, technique_id) for sub in data.get('subtechniques', [])],
+        )
+    
+    def to_dict(self) -> Dict[str, Any]:
+        data = {"domain": self.domain, "id": self.id, "name": self.name, "technique_used": self.technique_used}
+        if self.descr:
+            data["descr"] = self.descr
+        data["subtechniques"] = [sub.to_dict() for sub in self.subtechniques]
+        return data
+
+
+@dataclass(slots=True)
+class TechniqueLink(_Record):
+    """A technique referenced from a software or campaign entry."""
+    id: str
+    name: str
+    parent_id: str = ""
+    sub_name: str = ""
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TechniqueLink":
+        return cls(
+            id=_intern(data.get('id', '')),
+            name=_intern(data.get('name', '')),
+            parent_id=_intern(data.get('parent_id', '')),
+            sub_name=_intern(data.get('sub_name', '')),
+        )
+    
+    def to_dict(self) -> Dict[str, Any]:
+        data = {"id": self.id, "name": self.name}
+        if self.parent_id:
+            data = {"parent_id": self.parent_id, **data, "sub_name": self.sub_name}
+        return data
+
+
+@dataclass(slots=True)
+class SoftwareRecord(_Record):
+    """A tool or malware used by a group."""
+    id: str
+    name: str
+    descr: str = ""
+    techniques: List[TechniqueLink] = field(default_factory=list)
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SoftwareRecord":
+        return cls(
+            id=_intern(data.get('id', '')),
+            name=_intern(data.get('name', '')),
+            descr=data.get('descr', ''),
+            techniques=[TechniqueLink.from_dict(technique) for technique in data.get('techniques', [])],
+        )
+    
+    def to_dict(self) -> Dict[str, Any]:
+        data = {"id": self.id, "name": self.name}
+        if self.descr:
+            data["descr"] = self.descr
+        if self.techniques:
+            data["techniques"] = [technique.to_dict() for technique in self.techniques]
+        return data
+
+
+@dataclass(slots=True)
+class CampaignRecord(_Record):
+    """A campaign attributed to a group."""
+    id: str
+    name: str
+    first_seen: str = ""
+    last_seen: str = ""
+    first_seen_citation: str = ""
+    last_seen_citation: str = ""
+    desc: str = ""
+    techniques: List[TechniqueLink] = field(default_factory=list)
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CampaignRecord":
+        return cls(
+            id=_intern(data.get('id', '')),
+            name=_intern(data.get('name', '')),
+            first_seen=_intern(data.get('first_seen', '')),
+            last_seen=_intern(data.get('last_seen', '')),
+            first_seen_citation=_intern(data.get('first_seen_citation', '')),
+            last_seen_citation=_intern(data.get('last_seen_citation', '')),
+            desc=data.get('desc', ''),
+            techniques=[TechniqueLink.from_dict(technique) for technique in data.get('techniques', [])],
+        )
+    
+    def to_dict(self) -> Dict[str, Any]:
+        data = {
+            "id": self.id,
+            "name": self.name,
+            "first_seen": self.first_seen,
+            "last_seen": self.last_seen,
+            "first_seen_citation": self.first_seen_citation,
+            "last_seen_citation": self.last_seen_citation,
+        }
+        if self.desc:
+            data["desc"] = self.desc
+        if self.techniques:
+            data["techniques"] = [technique.to_dict() for technique in self.techniques]
+        return data
+
+
+@dataclass(slots=True)
+class AliasDescription(_Record):
+    """An alias of a group with the text explaining it."""
+    name: str
+    descr: str = ""
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {"name": self.name, "descr": self.descr}
+
+
+@dataclass(slots=True)
+class CitationRecord(_Record):
+    """A reference in a group's citation list."""
+    description: str
+    number: Optional[int] = None
+    url: str = ""
+    
+    def to_dict(self) -> Dict[str, Any]:
+        data = {"description": self.description, "number": self.number}
+        if self.url:
+            data["url"] = self.url
+        return data
+
+
+def _coerce_records(items: List[Any], record_type: type) -> List[Any]:
+    """Convert raw JSON dicts to records, leaving existing records untouched."""
+    return [item if isinstance(item, record_type) else record_type.from_dict(item) for item in items]
+
+
+def _coerce_citations(citations: Dict[str, Any]) -> Dict[str, Any]:
+    """Intern citation source names and convert their entries to CitationRecords."""
+    coerced = {}
+    for source_name, entry in citations.items():
+        if isinstance(entry, dict):
+            entry = CitationRecord(
+                description=_intern(entry.get('description', '')),
+                number=entry.get('number'),
+                url=_intern(entry.get('url', '')),
+            )
+        coerced[_intern(source_name)] = entry
+    return coerced
+
+
+@dataclass(slots=True)
+class APTGroup:
+    """Structured representation of an APT group.
+    
+    Nested technique, software, campaign, alias and citation entries may be passed
+    as raw JSON dicts; they are converted to compact slotted records that share
+    technique catalog entries and interned identifiers across groups.
+    """
+    attack_id: str
+    name: str
+    description: str
+    created: str
+    modified: str
+    version: str
+    technique_table_data: List[TechniqueRecord]
+    software_data: List[SoftwareRecord]
+    campaign_data: List[CampaignRecord]
+    alias_descriptions: List[AliasDescription]
+    citations: Dict[str, Any]
+    aliases_list: List[str]
+    
+    def __post_init__(self):
+        self.attack_id = _intern(self.attack_id)
+        self.name = _intern(self.name)
+        self.technique_table_data = _coerce_records(self.technique_table_data, TechniqueRecord)
+        self.software_data = _coerce_records(self.software_data, SoftwareRecord)
+        self.campaign_data = _coerce_records(self.campaign_data, CampaignRecord)
+        self.alias_descriptions = [
+            alias if isinstance(alias, AliasDescription)
+            else AliasDescription(_intern(alias.get('name', '')), alias.get('descr', ''))
+            for alias in self.alias_descriptions
+        ]
+        self.citations = _coerce_citations(self.citations)
+        self.aliases_list = [_intern(alias) for alias in self.aliases_list]
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for JSON serialization."""
+        return {
+            "attack_id": self.attack_id,
+            "name": self.name,
+            "description": self.description,
+            "created": self.created,
+            "modified": self.modified,
+            "version": self.version,
+            "technique_table_data": [technique.to_dict() for technique in self.technique_table_data],
+            "software_data": [software.to_dict() for software in self.software_data],
+            "campaign_data": [campaign.to_dict() for campaign in self.campaign_data],
+            "alias_descriptions": [alias.to_dict() for alias in self.alias_descriptions],
+            "citations": {
+                source_name: entry.to_dict() if isinstance(entry, CitationRecord) else entry
+                for source_name, entry in self.citations.items()
+            },
+            "aliases_list": list(self.aliases_list),
+        }
+
+
+@dataclass
+class APTGroupSummary:
+    """Lightweight APT group view kept in memory for listings, counts and lookups."""
+    attack_id: str
+    name: str
+    description_preview: str
+    aliases_list: List[str]
+    techniques_count: int
+    software_count: int
+    campaign_count: int
+    used_technique_ids: List[str]
+    software: List[Tuple[str, str]]
+    
+    @classmethod
+    def from_group(cls, apt_group: APTGroup) -> "APTGroupSummary":
+        """Summarize a fully loaded APT group."""
+        used_technique_ids = []
+        for technique in apt_group.technique_table_data:
+            technique_id = technique.get('id')
+            if technique_id and technique.get('technique_used', False):
+                used_technique_ids.append(technique_id)
+            for subtechnique in technique.get('subtechniques', []):
+                if subtechnique.get('id') and subtechnique.get('technique_used', False):
+                    # Format subtechnique ID as parent.subtechnique (e.g., T1583.002)
+                    used_technique_ids.append(f"{technique_id}.{subtechnique['id']}")
+        
+        description = apt_group.description
+        return cls(
+            attack_id=apt_group.attack_id,
+            name=apt_group.name,
+            description_preview=description[:200] + "..." if len(description) > 200 else description,
+            aliases_list=list(apt_group.aliases_list),
+            techniques_count=len(apt_group.technique_table_data),
+            software_count=len(apt_group.software_data),
+            campaign_count=len(apt_group.campaign_data),
+            used_technique_ids=used_technique_ids,
+            software=[(software.get('id', ''), software.get('name', '')) for software in apt_group.software_data],
+        )
+
+
+class UsageMatrix:
+    """Dense groups x techniques boolean usage matrix with stable index maps.
+    
+    Rows are groups and columns are used technique and subtechnique full IDs, both
+    sorted. Instances are immutable snapshots; the cache builds a new one whenever
+    the dataset changes.
+    """
+    
+    def __init__(self, group_ids: List[str], technique_ids: List[str], matrix: np.ndarray):
+        self.group_ids = group_ids
+        self.technique_ids = technique_ids
+        self.group_index = {attack_id: row for row, attack_id in enumerate(group_ids)}
+        self.technique_index = {technique_id: col for col, technique_id in enumerate(technique_ids)}
+        self.matrix = matrix
+        self.matrix.setflags(write=False)
+        # Columns that are main techniques rather than subtechniques
+        self.main_columns = np.array(['.' not in technique_id for technique_id in technique_ids], dtype=bool)
+        self._packed: Optional[np.ndarray] = None
+        self._columns: Optional[np.ndarray] = None
+        self._parent_ids: Optional[np.ndarray] = None
+        self._idf: Optional[np.ndarray] = None
+        self._group_norms: Optional[np.ndarray] = None
+    
+    @classmethod
+    def from_summaries(cls, summaries: Dict[str, APTGroupSummary]) -> "UsageMatrix":
+        """Build the matrix from group summaries' used technique IDs."""
+        group_ids = sorted(summaries)
+        technique_ids = sorted({technique_id for summary in summaries.values()
+                                for technique_id in summary.used_technique_ids})
+        technique_index = {technique_id: col for col, technique_id in enumerate(technique_ids)}
+        
+        rows, cols = [], []
+        for row, attack_id in enumerate(group_ids):
+            for technique_id in summaries[attack_id].used_technique_ids:
+                rows.append(row)
+                cols.append(technique_index[technique_id])
+        
+        matrix = np.zeros((len(group_ids), len(technique_ids)), dtype=bool)
+        matrix[rows, cols] = True
+        return cls(group_ids, technique_ids, matrix)
+    
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.matrix.shape
+    
+    @property
+    def packed(self) -> np.ndarray:
+        """Rows packed 8 techniques per byte (np.packbits along columns)."""
+        if self._packed is None:
+            self._packed = np.packbits(self.matrix, axis=1)
+        return self._packed
+    
+    @property
+    def columns(self) -> np.ndarray:
+        """Column-major copy of the matrix, for gathering a few technique columns."""
+        if self._columns is None:
+            self._columns = np.asfortranarray(self.matrix)
+        return self._columns
+    
+    @property
+    def idf(self) -> np.ndarray:
+        """Smoothed inverse document frequency of each technique column across groups."""
+        if self._idf is None:
+            groups = self.matrix.shape[0]
+            self._idf = (np.log((1 + groups) / (1 + self.technique_counts())) + 1).astype(np.float32)
+        return self._idf
+    
+    @property
+    def group_norms(self) -> np.ndarray:
+        """L2 norm of each group's IDF-weighted technique vector."""
+        if self._group_norms is None:
+            self._group_norms = np.sqrt(self.matrix.astype(np.float32) @ (self.idf ** 2))
+        return self._group_norms
+    
+    def technique_mask(self, technique_ids: List[str]) -> np.ndarray:
+        """Boolean column mask for the given IDs; unknown IDs are ignored."""
+        mask = np.zeros(len(self.technique_ids), dtype=bool)
+        cols = [self.technique_index[technique_id] for technique_id in technique_ids
+                if technique_id in self.technique_index]
+        mask[cols] = True
+        return mask
+    
+    def detection_mask(self, technique_ids: Sequence[str]) -> np.ndarray:
+        """Boolean column mask of the techniques a detection inventory covers.
+        
+        A main technique ID covers the technique and all of its subtechniques; a
+        subtechnique ID covers only itself. Unknown IDs are ignored.
+        """
+        if self._parent_ids is None:
+            self._parent_ids = np.array([technique_id.split('.')[0] for technique_id in self.technique_ids],
+                                        dtype=object)
+        mask = self.technique_mask(technique_ids)
+        main_ids = [technique_id for technique_id in technique_ids if '.' not in technique_id]
+        if main_ids and len(self._parent_ids):
+            mask |= np.isin(self._parent_ids, main_ids)
+        return mask
+    
+    def uncovered(self, covered: np.ndarray) -> np.ndarray:
+        """Each group's used techniques outside a covered column mask, as a boolean matrix.
+        
+        The difference is taken over the packed rows (packed & ~covered), clearing 8
+        techniques per byte for every group at once.
+        """
+        bits = self.packed & ~np.packbits(covered)
+        return np.unpackbits(bits, axis=1, count=self.matrix.shape[1]).view(bool)
+    
+    def technique_counts(self) -> np.ndarray:
+        """Number of groups using each technique column."""
+        return self.matrix.sum(axis=0)
+    
+    def group_coverage(self, columns: Optional[np.ndarray] = None) -> np.ndarray:
+        """Number of used techniques per group, optionally restricted to a column mask."""
+        matrix = self.matrix if columns is None else self.matrix[:, columns]
+        return matrix.sum(axis=1)
+    
+    def techniques_of(self, attack_id: str) -> List[str]:
+        """Technique IDs used by a group."""
+        row = self.group_index.get(attack_id)
+        if row is None:
+            return []
+        return [self.technique_ids[col] for col in np.flatnonzero(self.matrix[row])]
+    
+    def groups_using(self, technique_id: str) -> List[str]:
+        """Group IDs using a technique."""
+        col = self.technique_index.get(technique_id)
+        if col is None:
+            return []
+        return [self.group_ids[row] for row in np.flatnonzero(self.matrix[:, col])]
+    
+    def groups_using_all(self, technique_ids: List[str]) -> List[str]:
+        """Group IDs using every one of the given techniques (intersection)."""
+        if any(technique_id not in self.technique_index for technique_id in technique_ids):
+            return []
+        mask = self.technique_mask(technique_ids)
+        rows = np.flatnonzero(self.matrix[:, mask].all(axis=1))
+        return [self.group_ids[row] for row in rows]
+    
+    def groups_using_any(self, technique_ids: List[str]) -> List[str]:
+        """Group IDs using at least one of the given techniques (union)."""
+        mask = self.technique_mask(technique_ids)
+        rows = np.flatnonzero(self.matrix[:, mask].any(axis=1))
+        return [self.group_ids[row] for row in rows]
+    
+    def shared_techniques(self, attack_id: str, other_attack_id: str) -> List[str]:
+        """Technique IDs used by both groups."""
+        row, other_row = self.group_index.get(attack_id), self.group_index.get(other_attack_id)
+        if row is None or other_row is None:
+            return []
+        cols = np.flatnonzero(self.matrix[row] & self.matrix[other_row])
+        return [self.technique_ids[col] for col in cols]
+    
+    def overlap_counts(self, attack_ids: Optional[List[str]] = None) -> np.ndarray:
+        """Pairwise shared-technique counts between groups (all groups by default)."""
+        matrix = self.matrix
+        if attack_ids is not None:
+            matrix = matrix[[self.group_index[attack_id] for attack_id in attack_ids if attack_id in self.group_index]]
+        dense = matrix.astype(np.int32)
+        return dense @ dense.T
+
+
+@dataclass
+class DatasetStats:
+    """Aggregate counts over one dataset version, computed once when it is loaded.
+    
+    Count mappings are ordered by descending count, ties by key, so the top N of
+    any of them is its first N items. The cache stores them in the dataset_stats
+    table and reuses them for as long as the dataset version and the version of
+    the technique catalog (which tactic coverage comes from) are unchanged. Without
+    a catalog, totals["tactics_covered"] is None rather than 0.
+    """
+    dataset_version: str
+    totals: Dict[str, Optional[int]]
+    technique_group_counts: Dict[str, int]  # technique full ID -> groups using it
+    group_used_counts: Dict[str, int]  # attack ID -> main techniques used
+    software_popularity: Dict[str, int]  # software name -> groups using it
+    tactic_coverage: Dict[str, List[str]]  # tactic ID -> used technique full IDs
+    catalog_version: str = ""
+    
+    @staticmethod
+    def _ranked(counts) -> Dict[str, int]:
+        return {key: int(count) for key, count in sorted(counts, key=lambda item: (-item[1], item[0]))}
+    
+    @classmethod
+    def build(cls, summaries: Dict[str, APTGroupSummary], usage: UsageMatrix, dataset_version: str,
+              technique_tactics: Optional[Dict[str, Sequence[str]]] = None,
+              catalog_version: str = "") -> "DatasetStats":
+        """Aggregate group summaries and their usage matrix.
+        
+        technique_tactics maps technique full IDs to the tactic IDs they belong to;
+        without it tactic coverage is empty. catalog_version identifies its source.
+        """
+        column_counts = usage.technique_counts()
+        main_columns = usage.main_columns
+        
+        software = Counter()
+        for summary in summaries.values():
+            software.update({software_name for _, software_name in summary.software if software_name})
+        
+        tactic_coverage: Dict[str, List[str]] = {}
+        for technique_id in usage.technique_ids:
+            for tactic_id in (technique_tactics or {}).get(technique_id, ()):
+                tactic_coverage.setdefault(tactic_id, []).append(technique_id)
+        tactic_order = {tactic_id: rank for rank, tactic_id in enumerate(ATTACK_TACTICS)}
+        tactic_coverage = {tactic_id: tactic_coverage[tactic_id] for tactic_id in sorted(
+            tactic_coverage, key=lambda tactic_id: (tactic_order.get(tactic_id, len(tactic_order)), tactic_id))}
+        
+        totals = {
+            "total_groups": len(summaries),
+            "total_techniques": sum(summary.techniques_count for summary in summaries.values()),
+            "total_software": sum(summary.software_count for summary in summaries.values()),
+            "total_campaigns": sum(summary.campaign_count for summary in summaries.values()),
+            "used_main_techniques": int(column_counts[main_columns].sum()),
+            "used_subtechniques": int(column_counts[~main_columns].sum()),
+            # Main techniques listed by any group: used ones plus parents of used subtechniques
+            "unique_techniques": len({technique_id.split('.')[0] for technique_id in usage.technique_ids}),
+            "tactics_covered": len(tactic_coverage) if catalog_version else None,
+        }
+        return cls(
+            dataset_version=dataset_version,
+            totals=totals,
+            technique_group_counts=cls._ranked(zip(usage.technique_ids, column_counts.tolist())),
+            group_used_counts=cls._ranked(zip(usage.group_ids, usage.group_coverage(main_columns).tolist())),
+            software_popularity=cls._ranked(software.items()),
+            tactic_coverage=tactic_coverage,
+            catalog_version=catalog_version,
+        )
+    
+    def aggregates(self) -> Dict[str, Any]:
+        """The aggregates by name, as stored one row each in the dataset_stats table."""
+        return {
+            "totals": self.totals,
+            "technique_group_counts": self.technique_group_counts,
+            "group_used_counts": self.group_used_counts,
+            "software_popularity": self.software_popularity,
+            "tactic_coverage": self.tactic_coverage,
+        }
+
+
+class CatalogIndex:
+    """Technique catalog contents with both directions of every relation indexed.
+    
+    For each of CATALOG_RELATIONS, relations[relation] maps technique full IDs to
+    related IDs in catalog order and techniques_with[relation] maps a related ID to
+    the techniques listing it. names[relation] holds display names by related ID in
+    catalog order (tactics in kill chain order); detections are their own names.
+    version is a hash of the catalog files' content, empty when there are none.
+    """
+    
+    def __init__(self, techniques: Optional[Dict[str, str]] = None,
+                 names: Optional[Dict[str, Dict[str, str]]] = None,
+                 relations: Optional[Dict[str, Dict[str, Sequence[str]]]] = None,
+                 version: str = ""):
+        names, relations = names or {}, relations or {}
+        self.version = version
+        self.techniques: Dict[str, str] = dict(techniques or {})  # technique full ID -> name
+        self.names = {relation: dict(names.get(relation, {})) for relation in CATALOG_RELATIONS}
+        self.relations = {relation: {technique_id: tuple(related_ids)
+                                     for technique_id, related_ids in relations.get(relation, {}).items()}
+                          for relation in CATALOG_RELATIONS}
+        self.techniques_with: Dict[str, Dict[str, frozenset]] = {}
+        for relation, by_technique in self.relations.items():
+            reverse: Dict[str, Set[str]] = {}
+            for technique_id, related_ids in by_technique.items():
+                for related_id in related_ids:
+                    reverse.setdefault(related_id, set()).add(technique_id)
+            self.techniques_with[relation] = {related_id: frozenset(technique_ids)
+                                              for related_id, technique_ids in reverse.items()}
+    
+    @classmethod
+    def merge(cls, catalogs: List[Dict[str, Any]], version: str = "") -> "CatalogIndex":
+        """Index parsed catalog files; an entry listed by several is taken from the first."""
+        techniques: Dict[str, str] = {}
+        names: Dict[str, Dict[str, str]] = {relation: {} for relation in CATALOG_RELATIONS}
+        relations: Dict[str, Dict[str, Sequence[str]]] = {relation: {} for relation in CATALOG_RELATIONS}
+        for catalog in catalogs:
+            for relation in CATALOG_RELATIONS:
+                for related_id, entry in catalog.get(relation, {}).items():
+                    names[relation].setdefault(related_id, entry.get("name") or related_id)
+            for technique_id, technique in catalog.get("techniques", {}).items():
+                if technique_id in techniques:
+                    continue
+                techniques[technique_id] = technique.get("name") or technique_id
+                for relation in CATALOG_RELATIONS:
+                    relations[relation][technique_id] = technique.get(relation, ())
+        return cls(techniques, names, relations, version)
+    
+    def __len__(self) -> int:
+        return len(self.techniques)
+    
+    def related(self, relation: str, technique_id: str) -> Tuple[str, ...]:
+        """Related IDs of a technique; subtechniques missing from the catalog take their parent's."""
+        if technique_id not in self.techniques and '.' in technique_id:
+            technique_id = technique_id.split('.')[0]
+        return self.relations[relation].get(technique_id, ())
+    
+    def rank(self, relation: str, technique_ids: Sequence[str]) -> List[Tuple[str, frozenset]]:
+        """Related IDs of any of the techniques, each with the subset of them it covers, most covering first."""
+        techniques = frozenset(technique_ids)
+        by_technique, techniques_with = self.relations[relation], self.techniques_with[relation]
+        candidates = set()
+        for technique_id in techniques:
+            candidates.update(by_technique.get(technique_id, ()))
+        ranked = [(related_id, techniques & techniques_with[related_id]) for related_id in candidates]
+        ranked.sort(key=lambda item: (-len(item[1]), item[0]))
+        return ranked
+    
+    def to_json(self) -> Dict[str, Any]:
+        return {"techniques": self.techniques, "names": self.names, "relations": self.relations,
+                "version": self.version}
+
+
+class GroupSimilarity:
+    """Jaccard/cosine similarity between groups' used-technique vectors.
+    
+    Pairwise shared-technique counts are computed once per dataset version with
+    blocked matrix products and stored as a .npy file, which later loads are
+    memory-mapped from, so a group's neighbours cost one row read. Ad-hoc technique
+    lists are scored against a column-major copy of the usage matrix.
+    """
+    
+    def __init__(self, usage: UsageMatrix, dataset_version: str, cache_dir: Optional[Path] = None):
+        self.usage = usage
+        self.dataset_version = dataset_version
+        self.cache_path = (cache_dir / f"similarity_{dataset_version[:16]}.npy"
+                           if cache_dir is not None and dataset_version else None)
+        self.sizes = usage.group_coverage().astype(np.float32)
+        self._pair_counts: Optional[np.ndarray] = None
+        self._lock = threading.Lock()
+    
+    def _compute_pair_counts(self, out: np.ndarray):
+        matrix = self.usage.matrix.astype(np.float32)
+        for start in range(0, matrix.shape[0], SIMILARITY_BLOCK_ROWS):
+            block = matrix[start:start + SIMILARITY_BLOCK_ROWS]
+            out[start:start + block.shape[0]] = block @ matrix.T
+    
+    @property
+    def pair_counts(self) -> np.ndarray:
+        """All-pairs shared-technique counts (groups x groups, uint16)."""
+        if self._pair_counts is not None:
+            return self._pair_counts
+        with self._lock:
+            if self._pair_counts is None:
+                self._pair_counts = self._load_pair_counts()
+        return self._pair_counts
+    
+    def _load_pair_counts(self) -> np.ndarray:
+        groups = self.usage.shape[0]
+        if self.cache_path is None:
+            counts = np.zeros((groups, groups), dtype=np.uint16)
+            self._compute_pair_counts(counts)
+            return counts
+        
+        if self.cache_path.exists():
+            try:
+                counts = np.load(self.cache_path, mmap_mode='r')
+                if counts.shape == (groups, groups):
+                    return counts
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable similarity matrix {self.cache_path}: {e}")
+        
+        # Write to a temporary file first so readers never see a partial matrix
+        tmp_path = self.cache_path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        counts = np.lib.format.open_memmap(tmp_path, mode='w+', dtype=np.uint16, shape=(groups, groups))
+        self._compute_pair_counts(counts)
+        counts.flush()
+        del counts
+        # Map before the rename; the mapping stays valid even if the file is later removed
+        counts = np.load(tmp_path, mmap_mode='r')
+        os.replace(tmp_path, self.cache_path)
+        
+        # Matrices of older dataset versions are no longer reachable
+        for stale_path in self.cache_path.parent.glob("similarity_*.npy"):
+            if stale_path != self.cache_path:
+                stale_path.unlink(missing_ok=True)
+        
+        logger.info(f"Saved {groups}x{groups} group similarity matrix to {self.cache_path}")
+        return counts
+    
+    def _scores(self, shared: np.ndarray, size: float, sizes: np.ndarray, metric: str) -> np.ndarray:
+        shared = shared.astype(np.float32)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            if metric == "jaccard":
+                scores = shared / (size + sizes - shared)
+            elif metric == "cosine":
+                scores = shared / np.sqrt(size * sizes)
+            else:
+                raise ValueError(f"Unknown similarity metric {metric!r}, expected one of {SIMILARITY_METRICS}")
+        return np.nan_to_num(scores, nan=0.0, posinf=0.0)
+    
+    def _top_k(self, scores: np.ndarray, shared: np.ndarray, k: int,
+               exclude_row: Optional[int] = None) -> List[Tuple[str, float, int]]:
+        if exclude_row is not None:
+            scores[exclude_row] = -1.0
+        k = min(k, len(scores))
+        if k <= 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.lexsort((top, -scores[top]))]
+        return [(self.usage.group_ids[row], float(scores[row]), int(shared[row]))
+                for row in top if scores[row] > 0]
+    
+    def similar_to_group(self, attack_id: str, k: int = 10,
+                         metric: str = "jaccard") -> List[Tuple[str, float, int]]:
+        """Top-k (attack_id, similarity, shared techniques) neighbours of a group."""
+        row = self.usage.group_index.get(attack_id)
+        if row is None:
+            return []
+        shared = np.asarray(self.pair_counts[row])
+        scores = self._scores(shared, self.sizes[row], self.sizes, metric)
+        return self._top_k(scores, shared, k, exclude_row=row)
+    
+    def similar_to_techniques(self, technique_ids: List[str], k: int = 10,
+                              metric: str = "jaccard") -> List[Tuple[str, float, int]]:
+        """Top-k (attack_id, similarity, shared techniques) groups for an ad-hoc technique list.
+        
+        Techniques no group uses still count towards the list's size.
+        """
+        unique_ids = set(technique_ids)
+        cols = [self.usage.technique_index[technique_id] for technique_id in unique_ids
+                if technique_id in self.usage.technique_index]
+        if not cols:
+            return []
+        shared = self.usage.columns[:, cols].sum(axis=1)
+        scores = self._scores(shared, float(len(unique_ids)), self.sizes, metric)
+        return self._top_k(scores, shared, k)
+    
+    def similarity_matrix(self, metric: str = "jaccard") -> np.ndarray:
+        """Dense all-pairs similarity matrix (groups x groups, float32)."""
+        counts = np.asarray(self.pair_counts)
+        return self._scores(counts, self.sizes[:, None], self.sizes[None, :], metric)
+
+
+class QueryCache:
+    """Bounded LRU cache of query results with an optional TTL and hit/miss counters.
+    
+    Keys include the dataset version, so results computed against an older dataset
+    are never returned; the owning cache also clears it whenever the dataset changes.
+    Cached values should be immutable (tuples, frozensets) since they are shared.
+    """
+    
+    _MISSING = object()
+    
+    def __init__(self, max_entries: int = DEFAULT_QUERY_CACHE_SIZE, ttl: Optional[float] = DEFAULT_QUERY_CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[Tuple, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def get(self, key: Tuple, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                stored_at, value = entry
+                if self.ttl is None or time.monotonic() - stored_at < self.ttl:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            self.misses += 1
+            return default
+    
+    def put(self, key: Tuple, value: Any):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+    
+    def get_or_compute(self, key: Tuple, compute) -> Any:
+        """Return the cached value for key, computing and storing it on a miss."""
+        value = self.get(key, self._MISSING)
+        if value is self._MISSING:
+            value = compute()
+            self.put(key, value)
+        return value
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0
+        }
+
+
+def fuzzy_key(text: str) -> str:
+    """Case-fold and reduce to alphanumeric words: "APT-28 Grp." -> "apt 28 grp"."""
+    return " ".join(re.findall(r"[^\W_]+", text.casefold()))
+
+
+def normalize_alias(alias: str) -> str:
+    """Alias table key: case-folded, punctuation and spaces stripped ("APT 28" -> "apt28")."""
+    return "".join(re.findall(r"[^\W_]+", alias.casefold()))
+
+
+class FuzzyIndex:
+    """Trigram index over group names and aliases, software and technique names and IDs.
+    
+    Each entry's text is reduced by fuzzy_key, spaces are dropped ("APT 28" and "APT28"
+    index alike) and it is split into the trigrams of the text padded with two
+    leading spaces and one trailing one, so every gram is three characters long. A query is scored against every
+    entry sharing at least one trigram by the Dice coefficient of the two trigram sets,
+    counted with a single bincount over the query trigrams' postings. Completion bisects
+    a sorted list of each entry's word-start suffixes, so neither scans every entry.
+    """
+    
+    def __init__(self, entries: List[Tuple[str, str, str, str, Tuple[str, ...]]]):
+        """entries: (kind, id, name, matched text, attack IDs of the groups involved)."""
+        self.entries = entries
+        self._kinds = np.array([FUZZY_KINDS.index(entry[0]) for entry in entries], dtype=np.int8)
+        
+        postings: Dict[str, List[int]] = {}
+        gram_counts = np.zeros(len(entries), dtype=np.int32)
+        suffixes = []
+        for index, entry in enumerate(entries):
+            key = fuzzy_key(entry[3])
+            grams = self._trigrams(normalize_alias(entry[3]))
+            gram_counts[index] = len(grams)
+            for gram in grams:
+                postings.setdefault(gram, []).append(index)
+            # Whole text first (rank 0), then later word starts, so "bear" completes "Fancy Bear"
+            words = key.split(" ")
+            for position in range(len(words)):
+                suffixes.append((" ".join(words[position:]), min(position, 1), index))
+        
+        self._postings = {gram: np.array(ids, dtype=np.int32) for gram, ids in postings.items()}
+        self._gram_counts = gram_counts
+        suffixes.sort()
+        self._suffix_keys = [suffix[0] for suffix in suffixes]
+        self._suffixes = suffixes
+    
+    @staticmethod
+    def _trigrams(compact: str) -> Set[str]:
+        """Trigrams of compact padded with two leading spaces and one trailing one."""
+        if not compact:
+            return set()
+        padded = f"  {compact} "
+        return {padded[i:i + 3] for i in range(len(padded) - 2)}
+    
+    def __len__(self) -> int:
+        return len(self.entries)
+    
+    def _match(self, index: int, score: float) -> Dict[str, Any]:
+        kind, entry_id, name, matched, attack_ids = self.entries[index]
+        return {"kind": kind, "id": entry_id, "name": name, "matched": matched,
+                "score": round(score, 4), "attack_ids": list(attack_ids)}
+    
+    def _kind_mask(self, kinds: Optional[Tuple[str, ...]]) -> Optional[np.ndarray]:
+        if kinds is None:
+            return None
+        return np.isin(self._kinds, [FUZZY_KINDS.index(kind) for kind in kinds])
+    
+    def search(self, query: str, limit: int = 10, kinds: Optional[Tuple[str, ...]] = None,
+               min_score: float = FUZZY_MIN_SCORE) -> List[Dict[str, Any]]:
+        """Ranked typo-tolerant matches, best first, one per (kind, id)."""
+        grams = self._trigrams(normalize_alias(query))
+        postings = [self._postings[gram] for gram in grams if gram in self._postings]
+        if not postings:
+            return []
+        
+        shared = np.bincount(np.concatenate(postings), minlength=len(self.entries))
+        candidates = np.flatnonzero(shared)
+        scores = 2.0 * shared[candidates] / (len(grams) + self._gram_counts[candidates])
+        keep = scores >= min_score
+        mask = self._kind_mask(kinds)
+        if mask is not None:
+            keep &= mask[candidates]
+        candidates, scores = candidates[keep], scores[keep]
+        
+        results, seen = [], set()
+        for position in np.argsort(-scores, kind="stable"):
+            index = int(candidates[position])
+            target = self.entries[index][:2]
+            if target not in seen:
+                seen.add(target)
+                results.append(self._match(index, float(scores[position])))
+                if len(results) >= limit:
+                    break
+        return results
+    
+    def complete(self, prefix: str, limit: int = 10, kinds: Optional[Tuple[str, ...]] = None) -> List[Dict[str, Any]]:
+        """Entries with a word starting with prefix; whole-name prefixes first, then alphabetical."""
+        key = fuzzy_key(prefix)
+        if not key:
+            return []
+        mask = self._kind_mask(kinds)
+        start = bisect.bisect_left(self._suffix_keys, key)
+        stop = min(len(self._suffixes), start + limit * FUZZY_COMPLETION_SCAN)
+        
+        candidates = []
+        for position in range(start, stop):
+            suffix, rank, index = self._suffixes[position]
+            if not suffix.startswith(key):
+                break
+            if mask is None or mask[index]:
+                candidates.append((rank, suffix, index))
+        
+        results, seen = [], set()
+        for rank, suffix, index in sorted(candidates):
+            target = self.entries[index][:2]
+            if target not in seen:
+                seen.add(target)
+                results.append(self._match(index, len(key) / len(suffix)))
+                if len(results) >= limit:
+                    break
+        return results
+
+
+class LazyGroupMapping(Mapping):
+    """Read-only attack_id -> APTGroup view over a MITRECache.
+    
+    Keys come from the eagerly loaded summaries; full groups are hydrated from the
+    cache database on access and kept in the cache's bounded LRU.
+    """
+    
+    def __init__(self, cache: "MITRECache"):
+        self._cache = cache
+    
+    def __getitem__(self, attack_id: str) -> APTGroup:
+        apt_group = self._cache._hydrate_group(attack_id)
+        if apt_group is None:
+            raise KeyError(attack_id)
+        return apt_group
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._cache._summaries))
+    
+    def __len__(self) -> int:
+        return len(self._cache._summaries)
+    
+    def __contains__(self, attack_id: object) -> bool:
+        return attack_id in self._cache._summaries
+    
+    @property
+    def summaries(self) -> Dict[str, APTGroupSummary]:
+        """Summaries of every group, without hydrating anything."""
+        return self._cache._summaries
+    
+    @property
+    def dataset_version(self) -> str:
+        """Version of the dataset this view reads from (stable hash key for callers)."""
+        return self._cache.dataset_version
+    
+    @property
+    def catalog_version(self) -> str:
+        """Version of the technique catalog this view reads from."""
+        return self._cache.catalog_version
+    
+    @property
+    def cache(self) -> "MITRECache":
+        """The cache backing this view."""
+        return self._cache
+    
+    @property
+    def usage_matrix(self) -> "UsageMatrix":
+        """Precomputed groups x techniques usage matrix for the loaded dataset."""
+        return self._cache._usage_matrix
+    
+    @property
+    def fuzzy_index(self) -> FuzzyIndex:
+        """Typo-tolerant index over group, software and technique names."""
+        return self._cache._get_fuzzy_index(self._cache._state)
+    
+    @property
+    def stats(self) -> DatasetStats:
+        """Precomputed aggregate counts for the loaded dataset."""
+        return self._cache._get_dataset_stats(self._cache._state)
+
+
+def _timed(operation: str):
+    """Record a MITRECache method's latency in its `metrics` under `operation`."""
+    def decorator(func):
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(self, *args, **kwargs):
+                with self.metrics.timer(operation):
+                    return await func(self, *args, **kwargs)
+            return async_wrapper
+        
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            with self.metrics.timer(operation):
+                return func(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
 
-@dataclass
-class APTGroup:
-    """Structured representation of an APT group."""
-    attack_id: str
-    name: str
-    description: str
-    created: str
-    modified: str
-    version: str
-    technique_table_data: List[Dict[str, Any]]
-    software_data: List[Dict[str, Any]]
-    campaign_data: List[Dict[str, Any]]
-    alias_descriptions: List[Dict[str, Any]]
-    citations: Dict[str, Any]
-    aliases_list: List[str]
+class _DatasetState:
+    """Everything derived from one version of the dataset.
     
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary for JSON serialization."""
-        return asdict(self)
+    MITRECache reads it through a single reference, so a refresh can build a new
+    state off to the side and swap it in atomically.
+    """
+    
+    __slots__ = ("summaries", "hydrated", "groups_by_technique", "groups_by_software", "software_names",
+                 "groups_by_alias", "technique_names", "catalog", "usage_matrix", "similarity", "fuzzy", "stats",
+                 "shared", "dataset_version", "validated_at")
+    
+    def __init__(self):
+        # Summaries are loaded eagerly, full groups on demand into the hydrated LRU
+        self.summaries: Dict[str, APTGroupSummary] = {}
+        self.hydrated: "OrderedDict[str, APTGroup]" = OrderedDict()
+        
+        # Inverted indexes built from summaries: technique full ID / software ID or
+        # normalized name -> attack IDs of groups using it
+        self.groups_by_technique: Dict[str, Set[str]] = {}
+        self.groups_by_software: Dict[str, Set[str]] = {}
+        self.software_names: Dict[str, str] = {}  # normalized name -> display name
+        self.groups_by_alias: Dict[str, Set[str]] = {}  # normalize_alias(name or alias) -> attack IDs
+        self.technique_names: Dict[str, str] = {}  # technique full ID -> name
+        
+        self.catalog = CatalogIndex()  # tactics, mitigations and detections of each technique
+        self.usage_matrix = UsageMatrix.from_summaries({})
+        self.similarity: Optional[GroupSimilarity] = None
+        self.fuzzy: Optional[Tuple[UsageMatrix, FuzzyIndex]] = None  # built for one usage matrix
+        self.stats: Optional[DatasetStats] = None  # built for one dataset version
+        self.shared: Optional["SharedDataset"] = None
+        
+        # Hash of every cached group's content; identifies the loaded dataset
+        self.dataset_version = ""
+        
+        # When the oldest loaded entry was last checked against its source file
+        self.validated_at: Optional[datetime] = None
+
+
+def _state_field(name: str) -> property:
+    """Property reading and writing one field of the cache's current _DatasetState."""
+    return property(lambda self: getattr(self._state, name),
+                    lambda self, value: setattr(self._state, name, value))
+
+
+class SourceFileWatcher:
+    """Refreshes a MITRECache in the background when its source files change.
+    
+    Uses watchdog events when it is installed, debounced so a sync that rewrites
+    many files triggers one refresh; otherwise polls file stats every `interval`.
+    """
+    
+    def __init__(self, cache: "MITRECache", interval: float = DEFAULT_WATCH_INTERVAL,
+                 debounce: float = DEFAULT_WATCH_DEBOUNCE):
+        self.cache = cache
+        self.interval = interval
+        self.debounce = debounce
+        self._changed = threading.Event()
+        self._stopped = threading.Event()
+        self._observer = None
+        self._thread: Optional[threading.Thread] = None
+    
+    def start(self) -> "SourceFileWatcher":
+        watched = [directory for directory in self.cache.source_dirs if directory.is_dir()]
+        if Observer is not None and watched:
+            handler = FileSystemEventHandler()
+            handler.on_any_event = lambda event: self._changed.set()
+            self._observer = Observer()
+            for directory in watched:
+                self._observer.schedule(handler, str(directory), recursive=True)
+            self._observer.start()
+        self._thread = threading.Thread(target=self._run, daemon=True, name="mitre-cache-watcher")
+        self._thread.start()
+        logger.info(f"Watching {', '.join(map(str, watched))} for changes "
+                    f"({'watchdog' if self._observer else f'polling every {self.interval}s'})")
+        return self
+    
+    def stop(self):
+        self._stopped.set()
+        self._changed.set()
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
+        if self._thread is not None:
+            self._thread.join()
+    
+    def _run(self):
+        while not self._stopped.is_set():
+            triggered = self._changed.wait(self.interval)
+            if self._stopped.is_set():
+                break
+            if triggered:
+                self._changed.clear()
+                # Let a burst of writes settle before comparing file stats
+                if self._stopped.wait(self.debounce):
+                    break
+            elif self._observer is not None:
+                continue
+            try:
+                # Same path as callers of refresh_changed_files, revalidation check included
+                asyncio.run(self.cache.refresh_changed_files())
+            except Exception as e:
+                logger.warning(f"Background refresh from file watcher failed: {e}")
 
 
 class MITRECache:
     """Cache service for MITRE APT group data."""
     
-    def __init__(self, cache_dir: str = "data/mitre_cache"):
-        self.cache_dir = Path(cache_dir)
+    # Dataset-derived attributes live on the swappable _DatasetState
+    _summaries = _state_field("summaries")
+    _hydrated = _state_field("hydrated")
+    _groups_by_technique = _state_field("groups_by_technique")
+    _groups_by_software = _state_field("groups_by_software")
+    _software_names = _state_field("software_names")
+    _groups_by_alias = _state_field("groups_by_alias")
+    _technique_names = _state_field("technique_names")
+    _catalog = _state_field("catalog")
+    _usage_matrix = _state_field("usage_matrix")
+    _similarity = _state_field("similarity")
+    _shared = _state_field("shared")
+    dataset_version = _state_field("dataset_version")
+    validated_at = _state_field("validated_at")
+    
+    @property
+    def catalog_version(self) -> str:
+        """Hash of the loaded technique catalog files; empty without a catalog."""
+        return self._state.catalog.version
+    
+    def snapshot(self) -> Tuple[Dict[str, APTGroupSummary], str]:
+        """Group summaries and the dataset version they belong to, read from one state
+        so a concurrent refresh cannot pair one dataset's summaries with another's version."""
+        state = self._state
+        return state.summaries, state.dataset_version
+    
+    def __init__(self, cache_dir: Optional[str] = None, load_workers: Optional[int] = None,
+                 hydrated_cache_size: int = DEFAULT_HYDRATED_CACHE_SIZE,
+                 query_cache_size: int = DEFAULT_QUERY_CACHE_SIZE,
+                 query_cache_ttl: Optional[float] = DEFAULT_QUERY_CACHE_TTL,
+                 mitre_data_dir: Union[str, Sequence[str], None] = None,
+                 cache_duration: timedelta = DEFAULT_CACHE_DURATION,
+                 shared_dataset: Optional[str] = None,
+                 stale_grace: Optional[timedelta] = DEFAULT_STALE_GRACE,
+                 revalidation_workers: int = DEFAULT_REVALIDATION_WORKERS):
+        self.cache_dir = Path(cache_dir or os.environ.get("MITRE_CACHE_DIR") or DEFAULT_CACHE_DIR)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
         
         # Cache database
         self.db_path = self.cache_dir / "mitre_cache.db"
-        self.cache_duration = timedelta(hours=24)  # Cache for 24 hours
+        self.cache_duration = cache_duration  # How long cached groups stay fresh
+        self.stale_grace = stale_grace  # How much longer stale groups are served while revalidating
+        self.revalidation_workers = revalidation_workers  # Threads hashing source files when revalidating
         
-        # In-memory cache
-        self._memory_cache: Dict[str, APTGroup] = {}
+        # In-memory dataset; replaced as a whole by background refreshes
+        self._state = _DatasetState()
+        self._hydrated_lock = threading.Lock()
+        self.hydrated_cache_size = hydrated_cache_size
+        self._memory_cache = LazyGroupMapping(self)
         self._cache_loaded = False
         
-        # MITRE data source directory
-        self.mitre_data_dir = Path("get_mitre_data/output")
+        # Results of repeated lookups, keyed by (method, normalized args, dataset version)
+        self._query_cache = QueryCache(query_cache_size, query_cache_ttl)
+        
+        # Operation timings and event counters, see get_cache_stats() / export_metrics()
+        self.metrics = CacheMetrics()
+        
+        # Only one replacement dataset is built at a time
+        self._refresh_lock = threading.Lock()
+        # Set on staging caches that re-hash every source file regardless of stat
+        self._verify_hashes_on_sync = False
+        # Set on the caches _refresh_and_swap builds in cache_dir/staging; they never
+        # start background work, since their directory is replaced and removed after
+        self._is_staging = False
+        self._revalidation_thread: Optional[threading.Thread] = None
+        
+        # Source directories, highest precedence first: when several provide a group
+        # with the same attack ID, the first one listed wins. mitre_data_dir is the first.
+        self.source_dirs = discover_data_dirs(mitre_data_dir)
+        self.mitre_data_dir = self.source_dirs[0]
+        self._source_ranks = {str(directory): rank for rank, directory in enumerate(self.source_dirs)}
+
+        # Worker processes for parsing group files (None = one per CPU, 1 = sequential)
+        self.load_workers = load_workers
+        
+        # Attach to a dataset published by another process instead of loading one
+        self.shared_dataset_path = Path(shared_dataset) if shared_dataset else None
         
         # Initialize database
         self._init_database()
@@ -85,6 +1545,100 @@ class MITRECache:
                 )
             """)
             
+            # Key/value stamps such as the dataset version the search index was built for
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS cache_meta (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL
+                )
+            """)
+            
+            # Eagerly loaded per-group summaries; JSON columns hold lists
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS group_summaries (
+                    attack_id TEXT PRIMARY KEY,
+                    name TEXT NOT NULL,
+                    description_preview TEXT,
+                    aliases_json TEXT NOT NULL,
+                    techniques_count INTEGER NOT NULL,
+                    software_count INTEGER NOT NULL,
+                    campaign_count INTEGER NOT NULL,
+                    used_technique_ids_json TEXT NOT NULL,
+                    software_json TEXT NOT NULL
+                )
+            """)
+            
+            # Every group name, alias and ID under its normalize_alias key; several
+            # groups can share an alias (e.g. "APT34")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS group_aliases (
+                    alias_key TEXT NOT NULL,
+                    attack_id TEXT NOT NULL,
+                    alias TEXT NOT NULL,
+                    is_name INTEGER NOT NULL,
+                    PRIMARY KEY (alias_key, attack_id)
+                )
+            """)
+            
+            # Names of every technique and subtechnique seen, by full ID
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS techniques (
+                    technique_id TEXT PRIMARY KEY,
+                    name TEXT NOT NULL,
+                    domain TEXT
+                )
+            """)
+            
+            # Merged technique catalog: its techniques, the names of related tactics and
+            # mitigations, and each technique's related IDs per CATALOG_RELATIONS entry;
+            # position keeps kill chain and listing order
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS catalog_techniques (
+                    technique_id TEXT PRIMARY KEY,
+                    name TEXT NOT NULL
+                )
+            """)
+            
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS catalog_names (
+                    relation TEXT NOT NULL,
+                    related_id TEXT NOT NULL,
+                    name TEXT NOT NULL,
+                    position INTEGER NOT NULL,
+                    PRIMARY KEY (relation, related_id)
+                )
+            """)
+            
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS catalog_relations (
+                    technique_id TEXT NOT NULL,
+                    relation TEXT NOT NULL,
+                    related_id TEXT NOT NULL,
+                    position INTEGER NOT NULL,
+                    PRIMARY KEY (technique_id, relation, related_id)
+                )
+            """)
+            
+            # Aggregates of the dataset version stamped as dataset_stats_version in
+            # cache_meta, one JSON value per DatasetStats aggregate
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS dataset_stats (
+                    name TEXT PRIMARY KEY,
+                    value_json TEXT NOT NULL
+                )
+            """)
+            
+            # Per-file state used for incremental refresh
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS source_files (
+                    path TEXT PRIMARY KEY,
+                    attack_id TEXT NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    size INTEGER NOT NULL,
+                    content_hash TEXT NOT NULL
+                )
+            """)
+            
             conn.execute("""
                 CREATE INDEX IF NOT EXISTS idx_search_term ON search_index(term);
             """)
@@ -93,11 +1647,62 @@ class MITRECache:
                 CREATE INDEX IF NOT EXISTS idx_attack_id ON search_index(attack_id);
             """)
             
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_alias_group ON group_aliases(attack_id);
+            """)
+            
+            # Empty caches written by an older layout so the next load rebuilds them
+            row = conn.execute("SELECT value FROM cache_meta WHERE key = 'schema_version'").fetchone()
+            if row is None or row[0] != str(CACHE_SCHEMA_VERSION):
+                for table in ("apt_groups", "group_summaries", "group_aliases", "techniques", "catalog_techniques",
+                              "catalog_names", "catalog_relations", "search_index", "dataset_stats", "source_files",
+                              "cache_meta"):
+                    conn.execute(f"DELETE FROM {table}")
+                conn.execute("INSERT INTO cache_meta (key, value) VALUES ('schema_version', ?)",
+                             (str(CACHE_SCHEMA_VERSION),))
+            
             conn.commit()
     
+    def _get_cache_meta(self, key: str) -> Optional[str]:
+        """Read a stamp from the cache_meta table."""
+        with sqlite3.connect(str(self.db_path)) as conn:
+            row = conn.execute("SELECT value FROM cache_meta WHERE key = ?", (key,)).fetchone()
+            return row[0] if row else None
+    
+    def _set_cache_meta(self, key: str, value: str, conn: Optional[sqlite3.Connection] = None):
+        """Write a stamp to the cache_meta table, optionally inside an open transaction."""
+        if conn is None:
+            with sqlite3.connect(str(self.db_path)) as conn:
+                self._set_cache_meta(key, value, conn)
+                conn.commit()
+            return
+        conn.execute("INSERT OR REPLACE INTO cache_meta (key, value) VALUES (?, ?)", (key, value))
+    
+    def _compute_dataset_version(self) -> str:
+        """Hash the (attack_id, content_hash) pairs of every cached group.
+        
+        The technique catalog is versioned on its own (CatalogIndex.version), so a
+        catalog edit does not invalidate groups, indexes or the search index.
+        """
+        try:
+            digest = hashlib.sha256()
+            with sqlite3.connect(str(self.db_path)) as conn:
+                for attack_id, content_hash in conn.execute(
+                    "SELECT attack_id, content_hash FROM apt_groups ORDER BY attack_id"
+                ):
+                    digest.update(f"{attack_id}:{content_hash}\n".encode())
+            return digest.hexdigest()
+        except Exception as e:
+            logger.warning(f"Failed to compute dataset version: {e}")
+            return ""
+    
+    def _search_index_stamp(self) -> str:
+        """Value stamped on the search index for the current dataset."""
+        return f"{SEARCH_INDEX_FORMAT}:{self.dataset_version}"
+    
     def _generate_content_hash(self, content: str) -> str:
         """Generate hash for content to detect changes."""
-        return hashlib.sha256(content.encode()).hexdigest()
+        return _content_hash(content.encode())
     
     def _filter_used_techniques(self, technique_data: List[Dict[str, Any]], apt_name: str = "") -> List[Dict[str, Any]]:
         """Filter techniques to only include those actually used by the APT group.
@@ -109,218 +1714,908 @@ class MITRECache:
         Returns:
             Filtered list containing only techniques where technique_used is True
         """
-        filtered_techniques = []
-        original_count = len(technique_data)
-        used_main_techniques = 0
-        used_subtechniques = 0
-        
-        for technique in technique_data:
-            # Check if main technique is used
-            if technique.get('technique_used', False):
-                # If main technique is used, include it with all its subtechniques
-                filtered_techniques.append(technique)
-                used_main_techniques += 1
-                # Count used subtechniques
-                for subtechnique in technique.get('subtechniques', []):
-                    if subtechnique.get('technique_used', False):
-                        used_subtechniques += 1
-            else:
-                # If main technique is not used, check subtechniques
-                used_subtechniques_for_this_technique = []
-                for subtechnique in technique.get('subtechniques', []):
-                    if subtechnique.get('technique_used', False):
-                        used_subtechniques_for_this_technique.append(subtechnique)
-                        used_subtechniques += 1
-                
-                # If any subtechniques are used, include the main technique with only used subtechniques
-                if used_subtechniques_for_this_technique:
-                    filtered_technique = technique.copy()
-                    filtered_technique['subtechniques'] = used_subtechniques_for_this_technique
-                    filtered_technique['technique_used'] = False  # Keep original state for clarity
-                    filtered_techniques.append(filtered_technique)
-        
-        filtered_count = len(filtered_techniques)
+        filtered_techniques, used_main_techniques, used_subtechniques = filter_used_techniques(technique_data)
+        
         if apt_name:
-            logger.debug(f"Filtered techniques for {apt_name}: {original_count} -> {filtered_count} "
+            logger.debug(f"Filtered techniques for {apt_name}: {len(technique_data)} -> {len(filtered_techniques)} "
                         f"({used_main_techniques} main techniques, {used_subtechniques} subtechniques used)")
         
         return filtered_techniques
 
     def _load_apt_group_from_file(self, file_path: Path) -> Optional[APTGroup]:
         """Load APT group data from JSON file."""
+        _, group_kwargs, _, error = _parse_group_file(str(file_path))
+        if error:
+            logger.error(f"Failed to load APT group from {file_path}: {error}")
+            return None
+        return APTGroup(**group_kwargs)
+    
+    @_timed("files.parse")
+    async def _parse_group_files(self, json_files: List[Path]) -> List[Tuple[str, Optional[Dict[str, Any]], Optional[str], Optional[str]]]:
+        """Parse group files, fanning out to a process pool for large sets."""
+        paths = [str(json_file) for json_file in json_files]
+        workers = self.load_workers or os.cpu_count() or 1
+        
+        if workers <= 1 or len(paths) < PARALLEL_LOAD_MIN_FILES:
+            return [_parse_group_file(path) for path in paths]
+        
+        workers = min(workers, len(paths))
+        chunksize = max(1, len(paths) // (workers * 4))
+        loop = asyncio.get_running_loop()
+        
+        def _run_pool():
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                return list(executor.map(_parse_group_file, paths, chunksize=chunksize))
+        
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            # Filter technique data to only include used techniques
-            raw_technique_data = data.get('technique_table_data', [])
-            apt_name = data.get('name', '')
-            filtered_technique_data = self._filter_used_techniques(raw_technique_data, apt_name)
-            
-            # Convert to APTGroup object
-            apt_group = APTGroup(
-                attack_id=data.get('attack_id', ''),
-                name=data.get('name', ''),
-                description=data.get('descr', ''),
-                created=data.get('created', ''),
-                modified=data.get('modified', ''),
-                version=data.get('version', ''),
-                technique_table_data=filtered_technique_data,
-                software_data=data.get('software_data', []),
-                campaign_data=data.get('campaign_data', []),
-                alias_descriptions=data.get('alias_descriptions', []),
-                citations=data.get('citations', {}),
-                aliases_list=data.get('aliases_list', [])
-            )
-            
-            return apt_group
-            
+            return await loop.run_in_executor(None, _run_pool)
         except Exception as e:
-            logger.error(f"Failed to load APT group from {file_path}: {e}")
-            return None
+            # e.g. no fork/spawn support in a restricted runtime
+            logger.warning(f"Parallel load failed, falling back to sequential parsing: {e}")
+            return [_parse_group_file(path) for path in paths]
     
-    def _is_cache_valid(self, cache_timestamp: str) -> bool:
-        """Check if cache entry is still valid."""
+    def _cache_time(self, cache_timestamp: str) -> Optional[datetime]:
         try:
-            cached_time = datetime.fromisoformat(cache_timestamp.replace('Z', '+00:00'))
-            return datetime.now() - cached_time < self.cache_duration
+            return datetime.fromisoformat(cache_timestamp.replace('Z', '+00:00'))
         except:
+            return None
+    
+    def _is_cache_valid(self, cache_timestamp: str) -> bool:
+        """Check if cache entry is still fresh."""
+        cached_time = self._cache_time(cache_timestamp)
+        return cached_time is not None and datetime.now() - cached_time < self.cache_duration
+    
+    def _is_cache_servable(self, cache_timestamp: str) -> bool:
+        """Check if cache entry may still be served, fresh or stale within the grace period."""
+        cached_time = self._cache_time(cache_timestamp)
+        if cached_time is None:
             return False
+        if self.stale_grace is None:
+            return True
+        return datetime.now() - cached_time < self.cache_duration + self.stale_grace
+    
+    def _needs_revalidation(self) -> bool:
+        validated_at = self.validated_at
+        return validated_at is not None and datetime.now() - validated_at >= self.cache_duration
+    
+    def _start_revalidation(self) -> Optional[threading.Thread]:
+        """Re-hash every source file in the background, rewriting only what changed.
+        
+        Stale data keeps being served meanwhile; the result is swapped in like any
+        other refresh. Returns the thread, or None if a refresh is already running or
+        this is a staging cache.
+        """
+        if self._is_staging or self._refresh_lock.locked():
+            return None
+        self.metrics.increment("revalidations")
+        logger.info(f"Cached data older than {self.cache_duration}, revalidating in the background")
+        thread = threading.Thread(target=self._refresh_and_swap, kwargs={"full": False, "verify_hashes": True},
+                                  daemon=True, name="mitre-cache-revalidate")
+        thread.start()
+        self._revalidation_thread = thread
+        return thread
     
-    async def load_mitre_data(self) -> Dict[str, APTGroup]:
-        """Load MITRE APT data from files or cache."""
-        if self._cache_loaded and self._memory_cache:
+    async def load_mitre_data(self) -> Mapping[str, APTGroup]:
+        """Load MITRE APT data from files or cache.
+        
+        Returns a read-only attack_id -> APTGroup mapping; group summaries are loaded
+        eagerly and full groups are materialized on first access.
+        """
+        if self._cache_loaded and self._summaries:
+            return self._memory_cache
+        
+        if self.shared_dataset_path is not None:
+            self._attach_shared_dataset()
             return self._memory_cache
         
         logger.info("Loading MITRE APT data...")
+        load_start = time.perf_counter()
         
-        # First try to load from database cache
-        cached_data = self._load_from_database()
+        # First try to load summaries from database cache; full groups stay on disk
+        cached_summaries, oldest_timestamp = self._load_from_database()
+        self._sync_technique_catalog()
+        if not self.catalog_version:
+            logger.warning(f"No technique catalog ({TECHNIQUE_CATALOG_FILE}) in the source directories; tactics, "
+                           f"mitigations and detections are unavailable until get_mitre_data/main.py generates it")
         
-        # Check if we need to update from files
-        if not cached_data or self._should_update_from_files():
+        if not cached_summaries:
             logger.info("Updating MITRE data from source files...")
-            file_data = await self._load_from_files()
+            file_data, sources = await self._load_from_files()
             
             if file_data:
                 # Update database cache
-                self._save_to_database(file_data)
-                self._memory_cache = file_data
-            else:
-                # Fall back to cached data if file loading fails
-                self._memory_cache = cached_data or {}
+                self._save_to_database(file_data, sources)
+            self._summaries = {}
+            self._technique_names = {}
+            self._rebuild_lookup_indexes()
+            self._apply_group_updates(file_data)
+            self.dataset_version = self._compute_dataset_version()
+            self.validated_at = datetime.now()
+            await self._build_search_index(file_data)
         else:
-            self._memory_cache = cached_data
+            self._summaries = cached_summaries
+            self._clear_hydrated()
+            self._technique_names = self._load_technique_names()
+            self._rebuild_lookup_indexes()
+            self.dataset_version = self._compute_dataset_version()
+            self.validated_at = self._cache_time(oldest_timestamp)
+            await self._sync_with_source_files()
+            
+            # Serve what is cached now; stale entries are re-checked off the request path
+            if self._needs_revalidation() and not self._is_staging:
+                self._start_revalidation()
         
+        self._get_dataset_stats(self._state)
         self._cache_loaded = True
+        self.metrics.observe("load.warm" if cached_summaries else "load.cold", time.perf_counter() - load_start)
         logger.info(f"Loaded {len(self._memory_cache)} APT groups")
         
-        # Build search index
-        await self._build_search_index()
-        
         return self._memory_cache
     
-    def _load_from_database(self) -> Dict[str, APTGroup]:
-        """Load APT data from database cache."""
+    async def _sync_with_source_files(self) -> bool:
+        """Apply source file changes to the loaded dataset; returns whether anything changed."""
+        index_current = self._get_cache_meta("search_index_version") == self._search_index_stamp()
+        
+        # Only re-read files whose size, mtime or content changed; a current
+        # index is patched for those groups instead of being rebuilt
+        changed = await self._refresh_changed_files(update_search_index=index_current,
+                                                    verify_hashes=self._verify_hashes_on_sync)
+        if changed:
+            self.dataset_version = self._compute_dataset_version()
+            if index_current:
+                self._set_cache_meta("search_index_version", self._search_index_stamp())
+        
+        if index_current:
+            logger.info("Search index matches dataset version, reusing it")
+        else:
+            await self._build_search_index()
+        return changed
+    
+    async def refresh_changed_files(self) -> bool:
+        """Pick up added, edited or deleted source files without a full reload.
+        
+        Changed files are applied to a copy of the cache database off to the side and
+        the result is swapped in atomically (see _refresh_and_swap), so readers keep
+        the current dataset meanwhile. When only the technique catalog changed, just
+        the catalog and its stats are reloaded. Returns whether the dataset or the
+        catalog changed. Loads the data first if needed. An attached shared dataset is re-attached when its
+        publisher replaced the file.
+        """
+        if not self._cache_loaded:
+            await self.load_mitre_data()
+            return False
+        
+        if self.shared_dataset_path is not None:
+            if self._shared is not None and self._shared.is_current():
+                return False
+            self._attach_shared_dataset()
+            return True
+        
+        if self._needs_revalidation():
+            self._start_revalidation()
+            return False
+        loop = asyncio.get_running_loop()
+        if not self._source_files_changed():
+            if not self._catalog_changed():
+                return False
+            return await loop.run_in_executor(None, self._reload_catalog)
+        return await loop.run_in_executor(None, self._refresh_and_swap, False)
+    
+    def _catalog_changed(self) -> bool:
+        """Cheap stat-only check whether any technique catalog file was added, removed or touched."""
+        return self._catalog_stamp() != self._get_cache_meta("technique_catalog_stamp")
+    
+    def _source_files_changed(self) -> bool:
+        """Cheap stat-only check whether any group source file was added, removed or touched."""
+        if not any(directory.is_dir() for directory in self.source_dirs):
+            return False
+        file_stats = self._scan_source_files()
+        known_states = self._load_source_states()
+        held = self._held_source_paths(known_states)
+        if file_stats.keys() != known_states.keys() - held:
+            return True
+        return any((known_states[path][1], known_states[path][2]) != stat for path, stat in file_stats.items())
+    
+    @_timed("refresh.swap")
+    def _refresh_and_swap(self, full: bool = True, verify_hashes: bool = False) -> bool:
+        """Build a replacement dataset off to the side and swap it in atomically.
+        
+        A staging MITRECache builds its own database, summaries, indexes and search
+        index in cache_dir/staging: from scratch when `full`, otherwise starting from
+        a copy of the current database so only changed files are re-read. The staging
+        database then replaces the live one (connections are per call, so in-flight
+        queries finish on the old file) and the staging state replaces ours in a single
+        reference assignment. Readers never wait and never see a half-built dataset.
+        
+        With `verify_hashes` every source file is re-hashed rather than trusting
+        unchanged stats, and every cache entry counts as revalidated afterwards.
+        
+        Returns whether the dataset or the technique catalog changed; False also when
+        another refresh is running.
+        """
+        if not self._refresh_lock.acquire(blocking=False):
+            logger.info("Cache refresh already in progress, skipping")
+            return False
+        
+        try:
+            staging_dir = self.cache_dir / "staging"
+            shutil.rmtree(staging_dir, ignore_errors=True)
+            staging_dir.mkdir(parents=True)
+            staging_db = staging_dir / self.db_path.name
+            
+            if not full and self.db_path.exists():
+                source, target = sqlite3.connect(str(self.db_path)), sqlite3.connect(str(staging_db))
+                try:
+                    source.backup(target)
+                finally:
+                    source.close()
+                    target.close()
+            
+            builder = MITRECache(cache_dir=str(staging_dir), load_workers=self.load_workers,
+                                 hydrated_cache_size=self.hydrated_cache_size, query_cache_size=0,
+                                 mitre_data_dir=[str(directory) for directory in self.source_dirs],
+                                 cache_duration=self.cache_duration,
+                                 stale_grace=self.stale_grace, revalidation_workers=self.revalidation_workers)
+            builder._is_staging = True
+            builder._verify_hashes_on_sync = verify_hashes
+            asyncio.run(builder.load_mitre_data())
+            # Nothing may still be using the staging directory when it is moved and removed
+            if builder._revalidation_thread is not None:
+                builder._revalidation_thread.join()
+            
+            changed = (builder.dataset_version != self.dataset_version
+                       or builder.catalog_version != self.catalog_version)
+            # Only a full rebuild or a re-hash of every file counts as revalidation
+            validated_at = builder.validated_at if full or verify_hashes else self.validated_at
+            os.replace(staging_db, self.db_path)
+            if changed or full:
+                builder._state.validated_at = validated_at
+                self._state = builder._state
+                self._query_cache.clear()
+            else:
+                self.validated_at = validated_at
+            self._cache_loaded = True
+            shutil.rmtree(staging_dir, ignore_errors=True)
+            
+            logger.info(f"Swapped in refreshed dataset with {len(builder._summaries)} APT groups"
+                        if changed else "Refresh found no dataset changes")
+            return changed
+            
+        except Exception as e:
+            logger.error(f"Failed to build refreshed dataset, keeping the current one: {e}")
+            return False
+        finally:
+            self._refresh_lock.release()
+    
+    def watch_source_files(self, interval: float = DEFAULT_WATCH_INTERVAL,
+                           debounce: float = DEFAULT_WATCH_DEBOUNCE) -> SourceFileWatcher:
+        """Start refreshing in the background whenever source files change; call stop() on the result to end it."""
+        return SourceFileWatcher(self, interval, debounce).start()
+    
+    @_timed("load.shared")
+    def _attach_shared_dataset(self):
+        """Take summaries, names, usage matrix and group payloads from the shared file."""
+        # mitre_shared builds this module's record types, so it is imported on use
+        from mitre_shared import SharedDataset
+        
+        shared = SharedDataset(self.shared_dataset_path)
+        state = _DatasetState()
+        state.shared = shared
+        state.summaries = shared.summaries()
+        state.technique_names = shared.technique_names()
+        state.catalog = shared.catalog()
+        state.dataset_version = shared.dataset_version
+        self._rebuild_lookup_indexes(usage_matrix=shared.usage_matrix, state=state)
+        self._get_dataset_stats(state)
+        
+        # Readers holding the previous state finish against it
+        self._state = state
+        self._query_cache.clear()
+        self._cache_loaded = True
+        logger.info(f"Attached shared dataset {self.shared_dataset_path} with {len(self._summaries)} APT groups")
+    
+    @_timed("shared.publish")
+    async def publish_shared_dataset(self, path: Optional[str] = None) -> Path:
+        """Write the loaded dataset as a memory-mappable file for worker processes.
+        
+        Workers attach with MITRECache(shared_dataset=path). Defaults to
+        SHARED_DATASET_FILENAME in the cache directory.
+        """
+        from mitre_shared import SHARED_DATASET_FILENAME, SharedDataset
+        
+        if not self._cache_loaded:
+            await self.load_mitre_data()
+        
+        path = Path(path) if path else self.cache_dir / SHARED_DATASET_FILENAME
+        if self._shared is not None:
+            payloads = {attack_id: self._shared.group_payload(attack_id) for attack_id in self._summaries}
+        else:
+            with sqlite3.connect(str(self.db_path)) as conn:
+                payloads = {attack_id: data_json.encode('utf-8') if isinstance(data_json, str) else data_json
+                            for attack_id, data_json in conn.execute("SELECT attack_id, data_json FROM apt_groups")
+                            if attack_id in self._summaries}
+        
+        SharedDataset.write(path, self.dataset_version, self._summaries, self._technique_names,
+                            self._usage_matrix, payloads, self._catalog)
+        logger.info(f"Published shared dataset with {len(payloads)} APT groups to {path}")
+        return path
+    
+    @_timed("db.read_summaries")
+    def _load_from_database(self) -> Tuple[Dict[str, APTGroupSummary], Optional[str]]:
+        """Load APT group summaries from database cache (full payloads are hydrated lazily).
+        
+        Stale entries within the grace period are included; returns the summaries and
+        the oldest included cache timestamp.
+        """
         try:
             with sqlite3.connect(str(self.db_path)) as conn:
                 cursor = conn.cursor()
                 cursor.execute("""
-                    SELECT attack_id, data_json, cache_timestamp
-                    FROM apt_groups
+                    SELECT s.attack_id, s.name, s.description_preview, s.aliases_json,
+                           s.techniques_count, s.software_count, s.campaign_count,
+                           s.used_technique_ids_json, s.software_json, g.cache_timestamp
+                    FROM group_summaries s
+                    JOIN apt_groups g ON g.attack_id = s.attack_id
                 """)
                 
-                cached_groups = {}
+                cached_summaries = {}
+                oldest_timestamp = None
                 for row in cursor.fetchall():
-                    attack_id, data_json, cache_timestamp = row
+                    attack_id, cache_timestamp = row[0], row[-1]
                     
-                    # Check if cache is still valid
-                    if self._is_cache_valid(cache_timestamp):
+                    # Check if cache may still be served (stale entries get revalidated)
+                    if self._is_cache_servable(cache_timestamp):
+                        if oldest_timestamp is None or self._cache_time(cache_timestamp) < self._cache_time(oldest_timestamp):
+                            oldest_timestamp = cache_timestamp
                         try:
-                            data = json.loads(data_json)
-                            apt_group = APTGroup(**data)
-                            cached_groups[attack_id] = apt_group
+                            cached_summaries[attack_id] = APTGroupSummary(
+                                attack_id=attack_id,
+                                name=row[1],
+                                description_preview=row[2] or "",
+                                aliases_list=json.loads(row[3]),
+                                techniques_count=row[4],
+                                software_count=row[5],
+                                campaign_count=row[6],
+                                used_technique_ids=json.loads(row[7]),
+                                software=[tuple(software) for software in json.loads(row[8])],
+                            )
                         except Exception as e:
-                            logger.warning(f"Failed to deserialize cached APT group {attack_id}: {e}")
+                            logger.warning(f"Failed to deserialize cached APT group summary {attack_id}: {e}")
                 
-                logger.info(f"Loaded {len(cached_groups)} APT groups from cache")
-                return cached_groups
+                logger.info(f"Loaded {len(cached_summaries)} APT group summaries from cache")
+                return cached_summaries, oldest_timestamp
                 
         except Exception as e:
             logger.error(f"Failed to load from database cache: {e}")
+            return {}, None
+    
+    def _hydrate_group(self, attack_id: str) -> Optional[APTGroup]:
+        """Return the full APT group, reading it from the cache database on an LRU miss."""
+        with self._hydrated_lock:
+            apt_group = self._hydrated.get(attack_id)
+            if apt_group is not None:
+                self._hydrated.move_to_end(attack_id)
+                self.metrics.increment("hydrate.hits")
+                return apt_group
+        
+        if attack_id not in self._summaries:
+            return None
+        
+        self.metrics.increment("hydrate.misses")
+        try:
+            with self.metrics.timer("db.read_group"):
+                if self._shared is not None:
+                    row = (self._shared.group_payload(attack_id),)
+                else:
+                    with sqlite3.connect(str(self.db_path)) as conn:
+                        row = conn.execute("SELECT data_json FROM apt_groups WHERE attack_id = ?",
+                                           (attack_id,)).fetchone()
+            if row is None or row[0] is None:
+                return None
+            apt_group = APTGroup(**_json_loads(row[0]))
+        except Exception as e:
+            logger.warning(f"Failed to deserialize cached APT group {attack_id}: {e}")
+            return None
+        
+        self._remember_hydrated(attack_id, apt_group)
+        return apt_group
+    
+    def _remember_hydrated(self, attack_id: str, apt_group: APTGroup):
+        """Insert into the hydrated LRU, evicting the least recently used groups."""
+        with self._hydrated_lock:
+            self._hydrated[attack_id] = apt_group
+            self._hydrated.move_to_end(attack_id)
+            while len(self._hydrated) > max(self.hydrated_cache_size, 0):
+                self._hydrated.popitem(last=False)
+    
+    def _clear_hydrated(self):
+        """Drop every hydrated group."""
+        with self._hydrated_lock:
+            self._hydrated.clear()
+    
+    def _load_technique_names(self) -> Dict[str, str]:
+        """Load technique names by full ID from the cache database."""
+        try:
+            with sqlite3.connect(str(self.db_path)) as conn:
+                return dict(conn.execute("SELECT technique_id, name FROM techniques").fetchall())
+        except Exception as e:
+            logger.warning(f"Failed to load technique names: {e}")
             return {}
     
-    def _should_update_from_files(self) -> bool:
-        """Check if we should update from files based on file modification times."""
+    def _catalog_files(self) -> List[Path]:
+        """Technique catalogs present in the source directories, highest precedence first."""
+        return [directory / TECHNIQUE_CATALOG_FILE for directory in self.source_dirs
+                if (directory / TECHNIQUE_CATALOG_FILE).is_file()]
+    
+    def _catalog_stamp(self) -> str:
+        """Paths and stats of the catalog files; changes whenever one is added, removed or touched."""
+        stamps = []
+        for path in self._catalog_files():
+            stat = path.stat()
+            stamps.append([str(path), stat.st_mtime_ns, stat.st_size])
+        return json.dumps(stamps)
+    
+    def _read_technique_catalog(self) -> Tuple[CatalogIndex, str]:
+        """Merge the catalog files into a CatalogIndex, with a hash of their content.
+        
+        An entry listed by several source directories is taken from the highest-
+        precedence one. The hash is empty when there are no catalogs.
+        """
+        paths = self._catalog_files()
+        catalogs = []
+        digest = hashlib.sha256()
+        for path in paths:
+            try:
+                raw = path.read_bytes()
+                catalogs.append(_json_loads(raw))
+            except (OSError, ValueError) as e:
+                logger.warning(f"Skipping unreadable technique catalog {path}: {e}")
+                continue
+            digest.update(raw)
+        content_hash = digest.hexdigest() if paths else ""
+        return CatalogIndex.merge(catalogs, content_hash), content_hash
+    
+    def _load_catalog(self) -> CatalogIndex:
+        """Load the stored technique catalog from the cache database."""
+        try:
+            with sqlite3.connect(str(self.db_path)) as conn:
+                techniques = dict(conn.execute("SELECT technique_id, name FROM catalog_techniques"))
+                names: Dict[str, Dict[str, str]] = {}
+                for relation, related_id, name in conn.execute(
+                        "SELECT relation, related_id, name FROM catalog_names ORDER BY relation, position"):
+                    names.setdefault(relation, {})[related_id] = name
+                relations: Dict[str, Dict[str, List[str]]] = {}
+                for technique_id, relation, related_id in conn.execute(
+                        "SELECT technique_id, relation, related_id FROM catalog_relations "
+                        "ORDER BY technique_id, relation, position"):
+                    relations.setdefault(relation, {}).setdefault(technique_id, []).append(related_id)
+            return CatalogIndex(techniques, names, relations, self._get_cache_meta("technique_catalog_hash") or "")
+        except Exception as e:
+            logger.warning(f"Failed to load technique catalog: {e}")
+            return CatalogIndex()
+    
+    def _save_catalog(self, catalog: CatalogIndex, stamp: str, content_hash: str):
+        """Replace the stored technique catalog and stamp it with the catalog files' state."""
+        with sqlite3.connect(str(self.db_path)) as conn:
+            for table in ("catalog_techniques", "catalog_names", "catalog_relations"):
+                conn.execute(f"DELETE FROM {table}")
+            conn.executemany("INSERT INTO catalog_techniques (technique_id, name) VALUES (?, ?)",
+                             catalog.techniques.items())
+            conn.executemany("INSERT INTO catalog_names (relation, related_id, name, position) VALUES (?, ?, ?, ?)",
+                             [(relation, related_id, name, position)
+                              for relation, names in catalog.names.items()
+                              for position, (related_id, name) in enumerate(names.items())])
+            conn.executemany("INSERT OR IGNORE INTO catalog_relations (technique_id, relation, related_id, position) "
+                             "VALUES (?, ?, ?, ?)",
+                             [(technique_id, relation, related_id, position)
+                              for relation, by_technique in catalog.relations.items()
+                              for technique_id, related_ids in by_technique.items()
+                              for position, related_id in enumerate(related_ids)])
+            self._set_cache_meta("technique_catalog_stamp", stamp, conn)
+            self._set_cache_meta("technique_catalog_hash", content_hash, conn)
+            conn.commit()
+    
+    def _sync_technique_catalog(self, state: Optional[_DatasetState] = None) -> bool:
+        """Bring the catalog tables and the catalog index of state (default: the
+        current one) in line with the catalog files.
+        
+        The catalogs are only re-read when one was added, removed or touched since
+        they were stored. Returns whether their content changed.
+        """
+        state = state or self._state
+        stamp = self._catalog_stamp()
+        if stamp == self._get_cache_meta("technique_catalog_stamp"):
+            state.catalog = self._load_catalog()
+            return False
+        
+        catalog, content_hash = self._read_technique_catalog()
+        changed = content_hash != (self._get_cache_meta("technique_catalog_hash") or "")
+        self._save_catalog(catalog, stamp, content_hash)
+        state.catalog = catalog
+        logger.info(f"Loaded technique catalog with {len(catalog)} techniques, {len(catalog.names['tactics'])} "
+                    f"tactics and {len(catalog.names['mitigations'])} mitigations")
+        return changed
+    
+    def _reload_catalog(self) -> bool:
+        """Swap in a state with the re-read technique catalog and the stats built on it.
+        
+        Groups, lookup indexes and the search index do not depend on the catalog and
+        are carried over as they are. Returns whether the catalog content changed;
+        False also when a refresh is running.
+        """
+        if not self._refresh_lock.acquire(blocking=False):
+            logger.info("Cache refresh already in progress, skipping")
+            return False
+        
+        try:
+            state = copy.copy(self._state)
+            changed = self._sync_technique_catalog(state)
+            if changed:
+                state.stats = None
+                self._get_dataset_stats(state)
+                self._state = state
+            return changed
+        finally:
+            self._refresh_lock.release()
+    
+    @staticmethod
+    def _alias_keys(summary: APTGroupSummary) -> Set[str]:
+        keys = {normalize_alias(alias) for alias in (summary.attack_id, summary.name, *summary.aliases_list)}
+        keys.discard("")
+        return keys
+    
+    def _index_summary(self, summary: APTGroupSummary, state: Optional[_DatasetState] = None):
+        """Add a group to the technique, software and alias inverted indexes."""
+        state = state or self._state
+        for key in self._alias_keys(summary):
+            state.groups_by_alias.setdefault(key, set()).add(summary.attack_id)
+        for technique_id in summary.used_technique_ids:
+            state.groups_by_technique.setdefault(technique_id, set()).add(summary.attack_id)
+        for software_id, software_name in summary.software:
+            if software_id:
+                state.groups_by_software.setdefault(software_id.upper(), set()).add(summary.attack_id)
+            if software_name:
+                normalized = normalize_name(software_name)
+                state.groups_by_software.setdefault(normalized, set()).add(summary.attack_id)
+                state.software_names.setdefault(normalized, software_name)
+    
+    def _unindex_summary(self, summary: APTGroupSummary):
+        """Remove a group from the technique, software and alias inverted indexes."""
+        for key in self._alias_keys(summary):
+            group_ids = self._groups_by_alias.get(key)
+            if group_ids is not None:
+                group_ids.discard(summary.attack_id)
+                if not group_ids:
+                    del self._groups_by_alias[key]
+        for technique_id in summary.used_technique_ids:
+            group_ids = self._groups_by_technique.get(technique_id)
+            if group_ids is not None:
+                group_ids.discard(summary.attack_id)
+                if not group_ids:
+                    del self._groups_by_technique[technique_id]
+        for software_id, software_name in summary.software:
+            for key in (software_id.upper(), normalize_name(software_name)):
+                group_ids = self._groups_by_software.get(key)
+                if group_ids is not None:
+                    group_ids.discard(summary.attack_id)
+                    if not group_ids:
+                        del self._groups_by_software[key]
+                        self._software_names.pop(key, None)
+    
+    def _rebuild_lookup_indexes(self, usage_matrix: Optional[UsageMatrix] = None,
+                                state: Optional[_DatasetState] = None):
+        """Rebuild the inverted indexes and usage matrix from the loaded summaries."""
+        state = state or self._state
+        state.groups_by_technique = {}
+        state.groups_by_software = {}
+        state.software_names = {}
+        state.groups_by_alias = {}
+        for summary in state.summaries.values():
+            self._index_summary(summary, state)
+        state.usage_matrix = usage_matrix if usage_matrix is not None else UsageMatrix.from_summaries(state.summaries)
+    
+    def _apply_group_updates(self, updated_groups: Dict[str, APTGroup], removed_ids: Set[str] = frozenset()):
+        """Bring summaries, inverted indexes and hydrated groups in line with upserted/removed groups."""
+        for attack_id in set(updated_groups) | set(removed_ids):
+            old_summary = self._summaries.pop(attack_id, None)
+            if old_summary is not None:
+                self._unindex_summary(old_summary)
+        
+        for attack_id, apt_group in updated_groups.items():
+            summary = APTGroupSummary.from_group(apt_group)
+            self._summaries[attack_id] = summary
+            self._index_summary(summary)
+            for technique in apt_group.technique_table_data:
+                self._technique_names[technique.ref.attack_id] = technique.name
+                for subtechnique in technique.subtechniques:
+                    self._technique_names[subtechnique.ref.attack_id] = subtechnique.name
+        
+        # Columns can appear or disappear with any change, so the matrix is rebuilt
+        self._usage_matrix = UsageMatrix.from_summaries(self._summaries)
+        self._query_cache.clear()
+        
+        with self._hydrated_lock:
+            for attack_id in removed_ids:
+                self._hydrated.pop(attack_id, None)
+            for attack_id in updated_groups:
+                self._hydrated.pop(attack_id, None)
+        # Freshly parsed groups are already materialized; keep up to the LRU bound
+        keep = max(self.hydrated_cache_size, 0)
+        if keep:
+            for attack_id, apt_group in list(updated_groups.items())[-keep:]:
+                self._remember_hydrated(attack_id, apt_group)
+    
+    def _scan_source_files(self) -> Dict[str, Tuple[int, int]]:
+        """Stat every group file in every source directory without reading it: path -> (mtime_ns, size).
+        
+        Directories are scanned concurrently; missing ones contribute nothing.
+        """
+        def _scan(directory: Path) -> Dict[str, Tuple[int, int]]:
+            if not directory.is_dir():
+                return {}
+            file_stats = {}
+            for json_file in sorted(directory.glob("*.json")):
+                stat = json_file.stat()
+                file_stats[str(json_file)] = (stat.st_mtime_ns, stat.st_size)
+            return file_stats
+        
+        if len(self.source_dirs) == 1:
+            return _scan(self.source_dirs[0])
+        file_stats = {}
+        with ThreadPoolExecutor(max_workers=len(self.source_dirs)) as pool:
+            for source_stats in pool.map(_scan, self.source_dirs):
+                file_stats.update(source_stats)
+        return file_stats
+    
+    def _source_rank(self, path: str) -> Tuple[int, str]:
+        """Precedence of a source file: its directory's position, then the path; lower wins."""
+        return self._source_ranks.get(str(Path(path).parent), len(self.source_dirs)), path
+    
+    def _source_winners(self, provided: Dict[str, str], attack_ids: Optional[Set[str]] = None) -> Dict[str, str]:
+        """For each attack ID (optionally only those given), the highest-precedence path providing it.
+        
+        Args:
+            provided: path -> attack ID of the group in that file
+        """
+        winners = {}
+        for path, attack_id in provided.items():
+            if attack_ids is not None and attack_id not in attack_ids:
+                continue
+            current = winners.get(attack_id)
+            if current is None or self._source_rank(path) < self._source_rank(current):
+                winners[attack_id] = path
+        return winners
+    
+    def _held_source_paths(self, known_states: Dict[str, Tuple[str, int, int, str]]) -> Set[str]:
+        """Recorded files in configured source directories that are currently missing.
+        
+        An unmounted or not yet synced source keeps serving its cached groups rather
+        than having every one of them treated as deleted.
+        """
+        missing = {str(directory) for directory in self.source_dirs if not directory.is_dir()}
+        if not missing:
+            return set()
+        return {path for path in known_states if str(Path(path).parent) in missing}
+
+    def _load_source_states(self) -> Dict[str, Tuple[str, int, int, str]]:
+        """Load recorded file state: path -> (attack_id, mtime_ns, size, content_hash)."""
+        with sqlite3.connect(str(self.db_path)) as conn:
+            cursor = conn.execute("SELECT path, attack_id, mtime_ns, size, content_hash FROM source_files")
+            return {row[0]: tuple(row[1:]) for row in cursor.fetchall()}
+    
+    @_timed("refresh.incremental")
+    async def _refresh_changed_files(self, update_search_index: bool = True, verify_hashes: bool = False) -> bool:
+        """Apply per-file changes on top of the cached groups.
+        
+        Files are first compared by (mtime, size); only those that differ are hashed,
+        and only those whose content hash changed are parsed and rewritten, together
+        with their search index entries when `update_search_index` is set. With
+        `verify_hashes` every file is hashed (on `revalidation_workers` threads) and
+        all cached groups are re-stamped as fresh afterwards.
+        
+        Returns:
+            True if any group was added, updated or removed
+        """
         try:
-            if not self.mitre_data_dir.exists():
+            if not any(directory.is_dir() for directory in self.source_dirs):
+                return False
+            
+            file_stats = self._scan_source_files()
+            known_states = self._load_source_states()
+            held = self._held_source_paths(known_states)
+
+            changed_paths = []
+            restat_states = {}
+            to_hash = []
+            for path, (mtime_ns, size) in file_stats.items():
+                state = known_states.get(path)
+                if (state and (state[1], state[2]) == (mtime_ns, size) and state[0] in self._summaries
+                        and not verify_hashes):
+                    continue
+                
+                if state and state[0] in self._summaries:
+                    # Touched but possibly not edited: hash before paying for a parse
+                    to_hash.append(path)
+                else:
+                    changed_paths.append(path)
+            
+            def _hash_file(path: str) -> str:
+                with open(path, 'rb') as f:
+                    return _content_hash(f.read())
+            
+            with ThreadPoolExecutor(max_workers=max(self.revalidation_workers, 1)) as pool:
+                for path, content_hash in zip(to_hash, pool.map(_hash_file, to_hash)):
+                    state = known_states[path]
+                    if content_hash == state[3]:
+                        if (state[1], state[2]) != file_stats[path]:
+                            restat_states[path] = (state[0], *file_stats[path], content_hash)
+                    else:
+                        changed_paths.append(path)
+            
+            if verify_hashes:
+                self._mark_revalidated()
+            
+            removed_paths = [path for path in known_states if path not in file_stats and path not in held]
+            if not changed_paths and not removed_paths:
+                if restat_states:
+                    self._save_source_states(restat_states)
                 return False
             
-            # Get the most recent modification time of any JSON file
-            latest_file_time = datetime.min
-            for json_file in self.mitre_data_dir.glob("*.json"):
-                file_time = datetime.fromtimestamp(json_file.stat().st_mtime)
-                if file_time > latest_file_time:
-                    latest_file_time = file_time
+            logger.info(f"Refreshing {len(changed_paths)} changed and {len(removed_paths)} removed APT group files...")
+            parsed, sources = await self._load_group_files([Path(p) for p in changed_paths], file_stats)
+            
+            # Attack IDs touched by this refresh, and which file provides each of them
+            # now and did before; only those groups can change
+            changed = set(changed_paths)
+            provided = {path: state[0] for path, state in known_states.items()
+                        if (path in file_stats or path in held) and path not in changed}
+            provided.update((path, apt_group.attack_id) for path, apt_group in parsed.items())
+            affected_ids = {known_states[path][0] for path in removed_paths + changed_paths if path in known_states}
+            affected_ids.update(apt_group.attack_id for apt_group in parsed.values())
+            previous_winners = self._source_winners({path: state[0] for path, state in known_states.items()},
+                                                    affected_ids)
+            winners = self._source_winners(provided, affected_ids)
+            
+            # Unchanged files that take over a group from a removed, changed or
+            # lower-precedence file (e.g. a private override was deleted)
+            promoted = [path for attack_id, path in winners.items()
+                        if path not in parsed and previous_winners.get(attack_id) != path]
+            if promoted:
+                promoted_groups, promoted_sources = await self._load_group_files([Path(p) for p in promoted], file_stats)
+                parsed.update(promoted_groups)
+                sources.update(promoted_sources)
+            
+            updated_groups = {attack_id: parsed[path] for attack_id, path in winners.items() if path in parsed}
+            # Groups no current file provides, or whose new provider failed to parse
+            removed_ids = {attack_id for attack_id in affected_ids
+                           if attack_id not in updated_groups
+                           and (attack_id not in winners or winners[attack_id] in promoted)}
+            
+            sources.update(restat_states)
+            self._save_to_database(updated_groups, sources, removed_ids=removed_ids,
+                                   removed_paths=removed_paths, incremental=True)
+            
+            self._apply_group_updates(updated_groups, removed_ids)
+            
+            if update_search_index:
+                await self._update_search_index(updated_groups, removed_ids)
+            logger.info(f"Incremental refresh: {len(updated_groups)} upserted, {len(removed_ids)} removed")
+            return True
             
-            # Check database for latest cache timestamp
-            with sqlite3.connect(str(self.db_path)) as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    SELECT MAX(cache_timestamp) FROM apt_groups
-                """)
-                result = cursor.fetchone()
-                
-                if result[0]:
-                    latest_cache_time = datetime.fromisoformat(result[0])
-                    return latest_file_time > latest_cache_time
-                else:
-                    return True  # No cache exists
-                    
         except Exception as e:
-            logger.warning(f"Failed to check file modification times: {e}")
-            return True  # Default to updating
+            logger.warning(f"Failed to refresh changed files: {e}")
+            return False
+    
+    def _mark_revalidated(self):
+        """Stamp every cached group as freshly checked against its source file."""
+        now = datetime.now()
+        with sqlite3.connect(str(self.db_path)) as conn:
+            conn.execute("UPDATE apt_groups SET cache_timestamp = ?", (now.isoformat(),))
+            conn.commit()
+        self.validated_at = now
+    
+    async def _load_group_files(self, json_files: List[Path],
+                                file_stats: Dict[str, Tuple[int, int]]) -> Tuple[Dict[str, APTGroup], Dict[str, Tuple[str, int, int, str]]]:
+        """Parse group files into APTGroups plus the file state to record for them, both by path."""
+        apt_groups = {}
+        sources = {}
+        
+        for file_path, group_kwargs, content_hash, error in await self._parse_group_files(json_files):
+            if error:
+                logger.error(f"Failed to load APT group from {file_path}: {error}")
+                continue
+            apt_group = APTGroup(**group_kwargs)
+            apt_groups[file_path] = apt_group
+            mtime_ns, size = file_stats[file_path]
+            sources[file_path] = (apt_group.attack_id, mtime_ns, size, content_hash)
+        
+        return apt_groups, sources
     
-    async def _load_from_files(self) -> Dict[str, APTGroup]:
-        """Load APT data from JSON files."""
+    async def _load_from_files(self) -> Tuple[Dict[str, APTGroup], Dict[str, Tuple[str, int, int, str]]]:
+        """Load APT data from JSON files.
+        
+        Every source directory is read in one parallel batch and groups are merged by
+        attack ID, the highest-precedence source winning. Shadowed files are still
+        recorded so they can take over if the winning file goes away.
+        
+        Returns:
+            Tuple of (APT groups by attack ID, file state by path)
+        """
         try:
-            if not self.mitre_data_dir.exists():
-                logger.error(f"MITRE data directory not found: {self.mitre_data_dir}")
-                return {}
+            for directory in self.source_dirs:
+                if not directory.is_dir():
+                    logger.error(f"MITRE data directory not found: {directory}")
             
-            apt_groups = {}
-            json_files = list(self.mitre_data_dir.glob("*.json"))
+            file_stats = self._scan_source_files()
+            if not file_stats:
+                return {}, {}
             
-            logger.info(f"Loading {len(json_files)} APT group files...")
+            logger.info(f"Loading {len(file_stats)} APT group files from {len(self.source_dirs)} source(s)...")
             
-            for json_file in json_files:
-                apt_group = self._load_apt_group_from_file(json_file)
-                if apt_group:
-                    apt_groups[apt_group.attack_id] = apt_group
+            parsed, sources = await self._load_group_files([Path(p) for p in file_stats], file_stats)
+            winners = self._source_winners({path: apt_group.attack_id for path, apt_group in parsed.items()})
+            apt_groups = {attack_id: parsed[path] for attack_id, path in winners.items()}
             
             logger.info(f"Successfully loaded {len(apt_groups)} APT groups from files")
-            return apt_groups
+            return apt_groups, sources
             
         except Exception as e:
             logger.error(f"Failed to load APT data from files: {e}")
-            return {}
+            return {}, {}
+    
+    def _save_source_states(self, sources: Dict[str, Tuple[str, int, int, str]]):
+        """Record file state without touching group rows."""
+        with sqlite3.connect(str(self.db_path)) as conn:
+            conn.executemany("""
+                INSERT OR REPLACE INTO source_files (path, attack_id, mtime_ns, size, content_hash)
+                VALUES (?, ?, ?, ?, ?)
+            """, [(path, *state) for path, state in sources.items()])
+            conn.commit()
     
-    def _save_to_database(self, apt_groups: Dict[str, APTGroup]):
-        """Save APT data to database cache."""
+    @_timed("db.write")
+    def _save_to_database(self, apt_groups: Dict[str, APTGroup],
+                          sources: Optional[Dict[str, Tuple[str, int, int, str]]] = None,
+                          removed_ids: Set[str] = frozenset(), removed_paths: List[str] = (),
+                          incremental: bool = False):
+        """Save APT data to database cache.
+        
+        A full save replaces every row. An incremental save upserts only the given
+        groups, deletes `removed_ids`/`removed_paths` and then drops technique names
+        no remaining group references.
+        """
         try:
             current_time = datetime.now().isoformat()
-            
+            sources = sources or {}
+            # Content hash of the file each group is served from: highest precedence last
+            file_hashes = {}
+            for path, state in sorted(sources.items(), key=lambda item: self._source_rank(item[0]), reverse=True):
+                file_hashes[state[0]] = state[3]
+
             with sqlite3.connect(str(self.db_path)) as conn:
-                # Clear existing data
-                conn.execute("DELETE FROM apt_groups")
+                if not incremental:
+                    # Clear existing data
+                    conn.execute("DELETE FROM apt_groups")
+                    conn.execute("DELETE FROM group_summaries")
+                    conn.execute("DELETE FROM group_aliases")
+                    conn.execute("DELETE FROM techniques")
+                    conn.execute("DELETE FROM source_files")
+                
+                conn.executemany("DELETE FROM apt_groups WHERE attack_id = ?",
+                                 [(attack_id,) for attack_id in removed_ids])
+                conn.executemany("DELETE FROM group_summaries WHERE attack_id = ?",
+                                 [(attack_id,) for attack_id in removed_ids])
+                conn.executemany("DELETE FROM group_aliases WHERE attack_id = ?",
+                                 [(attack_id,) for attack_id in set(removed_ids) | set(apt_groups)])
+                conn.executemany("DELETE FROM source_files WHERE path = ?",
+                                 [(path,) for path in removed_paths])
                 
                 # Insert new data
                 for attack_id, apt_group in apt_groups.items():
                     data_json = json.dumps(apt_group.to_dict())
-                    content_hash = self._generate_content_hash(data_json)
+                    content_hash = file_hashes.get(attack_id) or self._generate_content_hash(data_json)
                     
                     conn.execute("""
-                        INSERT INTO apt_groups 
+                        INSERT OR REPLACE INTO apt_groups 
                         (attack_id, name, description, data_json, created_at, modified_at, cache_timestamp, content_hash)
                         VALUES (?, ?, ?, ?, ?, ?, ?, ?)
                     """, (
@@ -333,6 +2628,56 @@ class MITRECache:
                         current_time,
                         content_hash
                     ))
+                    
+                    summary = APTGroupSummary.from_group(apt_group)
+                    conn.execute("""
+                        INSERT OR REPLACE INTO group_summaries
+                        (attack_id, name, description_preview, aliases_json, techniques_count,
+                         software_count, campaign_count, used_technique_ids_json, software_json)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """, (
+                        attack_id,
+                        summary.name,
+                        summary.description_preview,
+                        json.dumps(summary.aliases_list),
+                        summary.techniques_count,
+                        summary.software_count,
+                        summary.campaign_count,
+                        json.dumps(summary.used_technique_ids),
+                        json.dumps(summary.software)
+                    ))
+                    
+                    aliases = {}
+                    for alias in (apt_group.attack_id, *apt_group.aliases_list, apt_group.name):
+                        aliases[normalize_alias(alias)] = (alias, alias == apt_group.name)
+                    conn.executemany("""
+                        INSERT OR REPLACE INTO group_aliases (alias_key, attack_id, alias, is_name)
+                        VALUES (?, ?, ?, ?)
+                    """, [(key, attack_id, alias, is_name) for key, (alias, is_name) in aliases.items() if key])
+                    
+                    technique_refs = [technique.ref for technique in apt_group.technique_table_data]
+                    technique_refs.extend(
+                        subtechnique.ref
+                        for technique in apt_group.technique_table_data
+                        for subtechnique in technique.subtechniques
+                    )
+                    conn.executemany("""
+                        INSERT OR REPLACE INTO techniques (technique_id, name, domain)
+                        VALUES (?, ?, ?)
+                    """, [(ref.attack_id, ref.name, ref.domain) for ref in technique_refs])
+                
+                conn.executemany("""
+                    INSERT OR REPLACE INTO source_files (path, attack_id, mtime_ns, size, content_hash)
+                    VALUES (?, ?, ?, ?, ?)
+                """, [(path, *state) for path, state in sources.items()])
+                
+                if incremental:
+                    # Removed or edited groups may have been the last to reference a technique
+                    referenced = self._referenced_technique_ids(conn)
+                    conn.executemany("DELETE FROM techniques WHERE technique_id = ?", [
+                        (technique_id,) for (technique_id,) in conn.execute("SELECT technique_id FROM techniques")
+                        if technique_id not in referenced
+                    ])
                 
                 conn.commit()
                 logger.info(f"Saved {len(apt_groups)} APT groups to database cache")
@@ -340,58 +2685,130 @@ class MITRECache:
         except Exception as e:
             logger.error(f"Failed to save to database cache: {e}")
     
-    async def _build_search_index(self):
-        """Build search index for efficient querying."""
+    @staticmethod
+    def _referenced_technique_ids(conn: sqlite3.Connection) -> Set[str]:
+        """Full IDs of every technique and subtechnique in a stored group's technique table."""
+        referenced = set()
+        for (data_json,) in conn.execute("SELECT data_json FROM apt_groups"):
+            for technique in json.loads(data_json).get('technique_table_data', []):
+                referenced.add(technique['id'])
+                referenced.update(f"{technique['id']}.{subtechnique['id']}"
+                                  for subtechnique in technique.get('subtechniques', []))
+        return referenced
+    
+    def _index_apt_group(self, conn: sqlite3.Connection, attack_id: str, apt_group: APTGroup):
+        """Insert search index terms for a single APT group."""
+        # Index name and aliases
+        alias_terms = {alias.lower() for alias in apt_group.aliases_list}
+        terms = [apt_group.name.lower()]
+        terms.extend(alias_terms)
+        
+        # Index technique names (only for used techniques)
+        for technique in apt_group.technique_table_data:
+            if technique.get('name'):
+                # Only index if the technique is actually used
+                if technique.get('technique_used', False):
+                    terms.append(technique['name'].lower())
+                # Also index used subtechniques
+                for subtechnique in technique.get('subtechniques', []):
+                    if subtechnique.get('technique_used', False) and subtechnique.get('name'):
+                        terms.append(subtechnique['name'].lower())
+        
+        # Index software names
+        for software in apt_group.software_data:
+            if software.get('name'):
+                terms.append(software['name'].lower())
+        
+        # Index description keywords
+        desc_words = apt_group.description.lower().split()
+        # Add significant words (longer than 3 characters)
+        terms.extend([word for word in desc_words if len(word) > 3])
+        
+        # Insert terms into search index
+        for term in set(terms):  # Remove duplicates
+            if term.strip():
+                relevance_score = self._calculate_relevance(term, apt_group, alias_terms)
+                conn.execute("""
+                    INSERT OR IGNORE INTO search_index 
+                    (term, attack_id, relevance_score, context)
+                    VALUES (?, ?, ?, ?)
+                """, (term.strip(), attack_id, relevance_score, apt_group.name))
+    
+    def _iter_cached_groups(self) -> Iterator[APTGroup]:
+        """Stream every cached APT group from the database without filling the LRU."""
+        with sqlite3.connect(str(self.db_path)) as conn:
+            for attack_id, data_json in conn.execute("SELECT attack_id, data_json FROM apt_groups"):
+                if attack_id in self._summaries:
+                    yield APTGroup(**_json_loads(data_json))
+    
+    @_timed("index.build")
+    async def _build_search_index(self, apt_groups: Optional[Dict[str, APTGroup]] = None):
+        """Build search index for efficient querying and stamp it with the dataset version.
+        
+        Args:
+            apt_groups: Groups already in hand (e.g. just parsed); streamed from the DB otherwise
+        """
         try:
+            stamp = self._search_index_stamp()
+            groups = apt_groups.values() if apt_groups is not None else self._iter_cached_groups()
             with sqlite3.connect(str(self.db_path)) as conn:
                 # Clear existing index
                 conn.execute("DELETE FROM search_index")
                 
                 # Build new index
-                for attack_id, apt_group in self._memory_cache.items():
-                    # Index name and aliases
-                    terms = [apt_group.name.lower()]
-                    terms.extend([alias.lower() for alias in apt_group.aliases_list])
-                    
-                    # Index technique names (only for used techniques)
-                    for technique in apt_group.technique_table_data:
-                        if technique.get('name'):
-                            # Only index if the technique is actually used
-                            if technique.get('technique_used', False):
-                                terms.append(technique['name'].lower())
-                            # Also index used subtechniques
-                            for subtechnique in technique.get('subtechniques', []):
-                                if subtechnique.get('technique_used', False) and subtechnique.get('name'):
-                                    terms.append(subtechnique['name'].lower())
-                    
-                    # Index software names
-                    for software in apt_group.software_data:
-                        if software.get('name'):
-                            terms.append(software['name'].lower())
-                    
-                    # Index description keywords
-                    desc_words = apt_group.description.lower().split()
-                    # Add significant words (longer than 3 characters)
-                    terms.extend([word for word in desc_words if len(word) > 3])
-                    
-                    # Insert terms into search index
-                    for term in set(terms):  # Remove duplicates
-                        if term.strip():
-                            relevance_score = self._calculate_relevance(term, apt_group)
-                            conn.execute("""
-                                INSERT OR IGNORE INTO search_index 
-                                (term, attack_id, relevance_score, context)
-                                VALUES (?, ?, ?, ?)
-                            """, (term.strip(), attack_id, relevance_score, apt_group.name))
+                for apt_group in groups:
+                    self._index_apt_group(conn, apt_group.attack_id, apt_group)
                 
+                self._set_cache_meta("search_index_version", stamp, conn)
                 conn.commit()
                 logger.info("Built search index for APT groups")
                 
         except Exception as e:
             logger.error(f"Failed to build search index: {e}")
     
-    def _calculate_relevance(self, term: str, apt_group: APTGroup) -> float:
-        """Calculate relevance score for a search term."""
+    async def rebuild_search_index(self, background: bool = False) -> Optional[threading.Thread]:
+        """Explicitly rebuild the search index for the loaded dataset.
+        
+        Args:
+            background: Rebuild in a daemon thread and return it instead of waiting.
+                Searches keep using the previous index until the rebuild commits.
+        """
+        if not self._cache_loaded:
+            await self.load_mitre_data()
+        
+        if not background:
+            await self._build_search_index()
+            return None
+        
+        thread = threading.Thread(target=lambda: asyncio.run(self._build_search_index()),
+                                  name="mitre-search-index", daemon=True)
+        thread.start()
+        return thread
+    
+    @_timed("index.update")
+    async def _update_search_index(self, updated_groups: Dict[str, APTGroup], removed_ids: Set[str] = frozenset()):
+        """Re-index only the given groups and drop entries for removed ones."""
+        try:
+            with sqlite3.connect(str(self.db_path)) as conn:
+                conn.executemany("DELETE FROM search_index WHERE attack_id = ?",
+                                 [(attack_id,) for attack_id in set(updated_groups) | set(removed_ids)])
+                
+                for attack_id, apt_group in updated_groups.items():
+                    self._index_apt_group(conn, attack_id, apt_group)
+                
+                conn.commit()
+                logger.info(f"Updated search index for {len(updated_groups)} APT groups")
+                
+        except Exception as e:
+            logger.error(f"Failed to update search index: {e}")
+    
+    def _calculate_relevance(self, term: str, apt_group: APTGroup,
+                             alias_terms: Optional[Set[str]] = None) -> float:
+        """Calculate relevance score for a search term.
+        
+        Args:
+            alias_terms: The group's lowercased aliases, when the caller already has them
+        """
         score = 0.0
         
         # Exact name match gets highest score
@@ -399,7 +2816,9 @@ class MITRECache:
             score += 10.0
         
         # Alias match
-        if term in [alias.lower() for alias in apt_group.aliases_list]:
+        if alias_terms is None:
+            alias_terms = {alias.lower() for alias in apt_group.aliases_list}
+        if term in alias_terms:
             score += 8.0
         
         # Technique name match (only for used techniques)
@@ -425,174 +2844,732 @@ class MITRECache:
         
         return score
     
+    def _search(self, state: _DatasetState, query_terms: List[str], max_results: int) -> Tuple[Dict[str, Any], ...]:
+        """Run a search against the search index, best matches first.
+        
+        When no term matches, falls back to fuzzy matches of the whole query against
+        group names and aliases, scored FUZZY_RELEVANCE scaled by similarity, so a
+        misspelling like "lazarus grp" still finds its group.
+        """
+        results = []
+        with sqlite3.connect(str(self.db_path)) as conn:
+            cursor = conn.cursor()
+            
+            # Search for each term
+            for term in query_terms:
+                cursor.execute("""
+                    SELECT attack_id, relevance_score, context
+                    FROM search_index
+                    WHERE term LIKE ?
+                    ORDER BY relevance_score DESC
+                    LIMIT ?
+                """, (f"%{term}%", max_results))
+                
+                for row in cursor.fetchall():
+                    attack_id, relevance_score, context = row
+                    
+                    if attack_id in state.summaries:
+                        summary = state.summaries[attack_id]
+                        results.append({
+                            "attack_id": attack_id,
+                            "name": summary.name,
+                            "description": summary.description_preview,
+                            "aliases": summary.aliases_list,
+                            "relevance_score": relevance_score,
+                            "context": context,
+                            "techniques_count": summary.techniques_count,
+                            "software_count": summary.software_count
+                        })
+        
+        if not results:
+            for match in self._get_fuzzy_index(state).search(" ".join(query_terms), max_results, kinds=("group",)):
+                summary = state.summaries[match["id"]]
+                results.append({
+                    "attack_id": summary.attack_id,
+                    "name": summary.name,
+                    "description": summary.description_preview,
+                    "aliases": summary.aliases_list,
+                    "relevance_score": round(FUZZY_RELEVANCE * match["score"], 2),
+                    "context": match["matched"],
+                    "techniques_count": summary.techniques_count,
+                    "software_count": summary.software_count
+                })
+        
+        # Sort by relevance and remove duplicates
+        seen = set()
+        unique_results = []
+        for result in sorted(results, key=lambda x: x['relevance_score'], reverse=True):
+            if result['attack_id'] not in seen:
+                seen.add(result['attack_id'])
+                unique_results.append(result)
+        
+        return tuple(unique_results[:max_results])
+    
+    @_timed("search")
     async def search_apt_groups(self, query: str, max_results: int = 10) -> List[Dict[str, Any]]:
         """Search APT groups based on query."""
         if not self._cache_loaded:
             await self.load_mitre_data()
         
+        # One state for both the key and the computation, so a concurrent swap cannot
+        # store one version's results under the other's key
+        state = self._state
         query_terms = query.lower().split()
-        results = []
+        key = ("search_apt_groups", " ".join(query_terms), max_results, state.dataset_version)
         
         try:
-            with sqlite3.connect(str(self.db_path)) as conn:
-                cursor = conn.cursor()
-                
-                # Search for each term
-                for term in query_terms:
-                    cursor.execute("""
-                        SELECT attack_id, relevance_score, context
-                        FROM search_index
-                        WHERE term LIKE ?
-                        ORDER BY relevance_score DESC
-                        LIMIT ?
-                    """, (f"%{term}%", max_results))
-                    
-                    for row in cursor.fetchall():
-                        attack_id, relevance_score, context = row
-                        
-                        if attack_id in self._memory_cache:
-                            apt_group = self._memory_cache[attack_id]
-                            results.append({
-                                "attack_id": attack_id,
-                                "name": apt_group.name,
-                                "description": apt_group.description[:200] + "..." if len(apt_group.description) > 200 else apt_group.description,
-                                "aliases": apt_group.aliases_list,
-                                "relevance_score": relevance_score,
-                                "context": context,
-                                "techniques_count": len(apt_group.technique_table_data),
-                                "software_count": len(apt_group.software_data)
-                            })
-            
-            # Sort by relevance and remove duplicates
-            seen = set()
-            unique_results = []
-            for result in sorted(results, key=lambda x: x['relevance_score'], reverse=True):
-                if result['attack_id'] not in seen:
-                    seen.add(result['attack_id'])
-                    unique_results.append(result)
-            
-            return unique_results[:max_results]
-            
+            results = self._query_cache.get_or_compute(key, lambda: self._search(state, query_terms, max_results))
         except Exception as e:
             logger.error(f"Failed to search APT groups: {e}")
             return []
+        
+        return [dict(result) for result in results]
     
+    @_timed("lookup.group")
     async def get_apt_group(self, attack_id: str) -> Optional[APTGroup]:
-        """Get specific APT group by attack ID."""
+        """Get specific APT group by attack ID, name or alias ("G0007", "APT 28", "fancy bear")."""
         if not self._cache_loaded:
             await self.load_mitre_data()
         
-        return self._memory_cache.get(attack_id)
+        return self._hydrate_group(self._resolve_group_id(attack_id))
+    
+    def alias_candidates(self, alias: str) -> List[str]:
+        """Attack IDs of every group with this ID, name or alias, best first.
+        
+        Matching ignores case, punctuation and spaces. A group whose own name matches
+        ranks ahead of groups merely listing it as an alias; ties go by attack ID.
+        """
+        key = normalize_alias(alias)
+        state = self._state
+        return sorted(state.groups_by_alias.get(key, ()),
+                      key=lambda attack_id: (normalize_alias(state.summaries[attack_id].name) != key, attack_id))
+    
+    def resolve_alias(self, alias: str) -> Optional[str]:
+        """Attack ID of the group best matching an ID, name or alias; None if unknown."""
+        candidates = self.alias_candidates(alias)
+        return candidates[0] if candidates else None
+    
+    def _resolve_group_id(self, identifier: str) -> str:
+        """Attack IDs pass through; names and aliases resolve via the alias table."""
+        if identifier in self._summaries:
+            return identifier
+        return self.resolve_alias(identifier) or identifier
+    
+    def _hydrate_groups(self, attack_ids: Set[str]) -> List[APTGroup]:
+        """Materialize groups for a result set, in attack ID order."""
+        groups = (self._hydrate_group(attack_id) for attack_id in sorted(attack_ids))
+        return [apt_group for apt_group in groups if apt_group is not None]
     
+    @_timed("lookup.technique")
     async def get_apt_groups_by_technique(self, technique_id: str) -> List[APTGroup]:
-        """Get APT groups that use a specific technique (only considers actually used techniques)."""
+        """Get APT groups that use a specific technique (only considers actually used techniques).
+        
+        Accepts a technique ID (T1566), a subtechnique full ID (T1566.001), or a
+        fragment of a technique name, which is matched against the technique catalog.
+        """
+        if not self._cache_loaded:
+            await self.load_mitre_data()
+        
+        state, technique_id = self._state, normalize_technique_query(technique_id)
+        key = ("get_apt_groups_by_technique", technique_id, state.dataset_version)
+        return self._hydrate_groups(self._query_cache.get_or_compute(
+            key, lambda: self._technique_group_ids(state, technique_id)))
+    
+    async def get_group_ids_by_technique(self, technique_id: str) -> List[str]:
+        """Attack IDs of groups using a technique, like get_apt_groups_by_technique without hydrating."""
         if not self._cache_loaded:
             await self.load_mitre_data()
         
-        matching_groups = []
+        state, technique_id = self._state, normalize_technique_query(technique_id)
+        key = ("get_apt_groups_by_technique", technique_id, state.dataset_version)
+        return sorted(self._query_cache.get_or_compute(key, lambda: self._technique_group_ids(state, technique_id)))
+    
+    @staticmethod
+    def _technique_group_ids(state: _DatasetState, technique_id: str) -> frozenset:
+        if TECHNIQUE_ID_PATTERN.match(technique_id):
+            return frozenset(state.groups_by_technique.get(technique_id, ()))
         
-        for apt_group in self._memory_cache.values():
-            for technique in apt_group.technique_table_data:
-                # Check main technique
-                if ((technique.get('id') == technique_id or technique_id in technique.get('name', '')) 
-                    and technique.get('technique_used', False)):
-                    matching_groups.append(apt_group)
-                    break
-                
-                # Check subtechniques
-                for subtechnique in technique.get('subtechniques', []):
-                    if ((subtechnique.get('id') == technique_id or technique_id in subtechnique.get('name', ''))
-                        and subtechnique.get('technique_used', False)):
-                        matching_groups.append(apt_group)
-                        break
-                else:
-                    continue
-                break
+        matching_ids = set()
+        for full_id, name in state.technique_names.items():
+            if technique_id in name:
+                matching_ids |= state.groups_by_technique.get(full_id, set())
         
-        return matching_groups
+        return frozenset(matching_ids)
     
+    @_timed("lookup.software")
     async def get_apt_groups_by_software(self, software_name: str) -> List[APTGroup]:
-        """Get APT groups that use specific software."""
+        """Get APT groups that use specific software.
+        
+        An exact software ID (S0002) or name resolves through the inverted index;
+        otherwise the query is matched as a substring of the distinct software names.
+        """
         if not self._cache_loaded:
             await self.load_mitre_data()
         
-        matching_groups = []
-        software_name_lower = software_name.lower()
+        state, normalized = self._state, normalize_name(software_name)
+        key = ("get_apt_groups_by_software", normalized, state.dataset_version)
+        return self._hydrate_groups(self._query_cache.get_or_compute(
+            key, lambda: self._software_group_ids(state, normalized)))
+    
+    async def get_group_ids_by_software(self, software_name: str) -> List[str]:
+        """Attack IDs of groups using software, like get_apt_groups_by_software without hydrating."""
+        if not self._cache_loaded:
+            await self.load_mitre_data()
         
-        for apt_group in self._memory_cache.values():
-            for software in apt_group.software_data:
-                if software_name_lower in software.get('name', '').lower():
-                    matching_groups.append(apt_group)
-                    break
+        state, normalized = self._state, normalize_name(software_name)
+        key = ("get_apt_groups_by_software", normalized, state.dataset_version)
+        return sorted(self._query_cache.get_or_compute(key, lambda: self._software_group_ids(state, normalized)))
+    
+    @staticmethod
+    def _software_group_ids(state: _DatasetState, normalized: str) -> frozenset:
+        exact_ids = state.groups_by_software.get(normalized.upper()) or state.groups_by_software.get(normalized)
+        if exact_ids:
+            return frozenset(exact_ids)
+        
+        matching_ids = set()
+        for name_key in state.software_names:
+            if normalized in name_key:
+                matching_ids |= state.groups_by_software[name_key]
         
-        return matching_groups
+        return frozenset(matching_ids)
     
+    @_timed("lookup.all_techniques")
     async def get_all_techniques(self) -> Dict[str, Set[str]]:
         """Get all techniques actually used by APT groups (only includes techniques with technique_used=True)."""
         if not self._cache_loaded:
             await self.load_mitre_data()
         
-        techniques = {}
+        state = self._state
+        key = ("get_all_techniques", state.dataset_version)
+        techniques = self._query_cache.get_or_compute(key, lambda: tuple(
+            (technique_id, frozenset(group_ids)) for technique_id, group_ids in state.groups_by_technique.items()))
+        return {technique_id: set(group_ids) for technique_id, group_ids in techniques}
+    
+    async def get_usage_matrix(self) -> UsageMatrix:
+        """Get the groups x techniques usage matrix shared by all consumers."""
+        if not self._cache_loaded:
+            await self.load_mitre_data()
         
-        for apt_group in self._memory_cache.values():
-            for technique in apt_group.technique_table_data:
-                technique_id = technique.get('id')
-                
-                # Only include if main technique is used
-                if technique_id and technique.get('technique_used', False):
-                    if technique_id not in techniques:
-                        techniques[technique_id] = set()
-                    techniques[technique_id].add(apt_group.attack_id)
-                
-                # Also include used subtechniques
-                for subtechnique in technique.get('subtechniques', []):
-                    subtechnique_id = subtechnique.get('id')
-                    if subtechnique_id and subtechnique.get('technique_used', False):
-                        # Format subtechnique ID as parent.subtechnique (e.g., T1583.002)
-                        full_id = f"{technique_id}.{subtechnique_id}"
-                        if full_id not in techniques:
-                            techniques[full_id] = set()
-                        techniques[full_id].add(apt_group.attack_id)
+        return self._usage_matrix
+    
+    def _get_fuzzy_index(self, state: _DatasetState) -> FuzzyIndex:
+        built = state.fuzzy
+        if built is not None and built[0] is state.usage_matrix:
+            return built[1]
+        
+        usage = state.usage_matrix
+        entries = []
+        software: Dict[Tuple[str, str], List[str]] = {}
+        for summary in state.summaries.values():
+            for text in (summary.attack_id, summary.name, *summary.aliases_list):
+                entries.append(("group", summary.attack_id, summary.name, text, (summary.attack_id,)))
+            for software_id, software_name in summary.software:
+                software.setdefault((software_id, software_name), []).append(summary.attack_id)
+        for (software_id, software_name), attack_ids in software.items():
+            attack_ids = tuple(sorted(attack_ids))
+            for text in (software_id, software_name):
+                if text:
+                    entries.append(("software", software_id or software_name, software_name, text, attack_ids))
+        for technique_id in usage.technique_ids:
+            attack_ids = tuple(sorted(state.groups_by_technique.get(technique_id, ())))
+            name = state.technique_names.get(technique_id, technique_id)
+            for text in {technique_id, name}:
+                entries.append(("technique", technique_id, name, text, attack_ids))
+        
+        index = FuzzyIndex(entries)
+        state.fuzzy = (usage, index)
+        return index
+    
+    @_timed("search.fuzzy")
+    async def fuzzy_search(self, query: str, max_results: int = 10,
+                           kinds: Optional[Tuple[str, ...]] = None) -> List[Dict[str, Any]]:
+        """Typo-tolerant search over group names/aliases, software and technique names and IDs.
+        
+        Args:
+            query: Free text such as "Fancy Bare", "APT 28" or "Lazarus Grp"
+            max_results: Maximum number of matches
+            kinds: Restrict to some of FUZZY_KINDS ("group", "software", "technique")
+        
+        Returns:
+            Matches best first, each with kind, id, name, the matched text, a 0-1 score
+            and the attack IDs of the groups involved
+        """
+        if not self._cache_loaded:
+            await self.load_mitre_data()
+        
+        return self._get_fuzzy_index(self._state).search(query, max_results, kinds)
+    
+    @_timed("search.autocomplete")
+    async def autocomplete(self, prefix: str, max_results: int = 10,
+                           kinds: Optional[Tuple[str, ...]] = None) -> List[Dict[str, Any]]:
+        """Names with a word starting with prefix, for completion as the user types."""
+        if not self._cache_loaded:
+            await self.load_mitre_data()
+        
+        return self._get_fuzzy_index(self._state).complete(prefix, max_results, kinds)
+    
+    @staticmethod
+    def _dataset_stats_stamp(dataset_version: str, catalog_version: str) -> str:
+        return f"{dataset_version}:{catalog_version}"
+    
+    def _load_dataset_stats(self, dataset_version: str, catalog_version: str) -> Optional[DatasetStats]:
+        """Read the stored aggregates if they were computed for these dataset and catalog versions."""
+        try:
+            with sqlite3.connect(str(self.db_path)) as conn:
+                row = conn.execute("SELECT value FROM cache_meta WHERE key = 'dataset_stats_version'").fetchone()
+                if row is None or row[0] != self._dataset_stats_stamp(dataset_version, catalog_version):
+                    return None
+                aggregates = {name: json.loads(value_json)
+                              for name, value_json in conn.execute("SELECT name, value_json FROM dataset_stats")}
+            return DatasetStats(dataset_version=dataset_version, catalog_version=catalog_version, **aggregates)
+        except Exception as e:
+            logger.warning(f"Failed to load dataset statistics: {e}")
+            return None
+    
+    def _save_dataset_stats(self, stats: DatasetStats):
+        """Replace the stored aggregates and stamp them with their dataset and catalog versions."""
+        try:
+            with sqlite3.connect(str(self.db_path)) as conn:
+                conn.execute("DELETE FROM dataset_stats")
+                conn.executemany("INSERT INTO dataset_stats (name, value_json) VALUES (?, ?)",
+                                 [(name, json.dumps(value)) for name, value in stats.aggregates().items()])
+                self._set_cache_meta("dataset_stats_version",
+                                     self._dataset_stats_stamp(stats.dataset_version, stats.catalog_version), conn)
+                conn.commit()
+        except Exception as e:
+            logger.warning(f"Failed to save dataset statistics: {e}")
+    
+    def _get_dataset_stats(self, state: _DatasetState) -> DatasetStats:
+        stats = state.stats
+        if (stats is not None and stats.dataset_version == state.dataset_version
+                and stats.catalog_version == state.catalog.version):
+            return stats
+        
+        # An attached shared dataset has no database; otherwise reuse what an earlier
+        # load stored for these versions
+        stats = (self._load_dataset_stats(state.dataset_version, state.catalog.version)
+                 if state.shared is None else None)
+        if stats is None:
+            with self.metrics.timer("stats.build"):
+                stats = DatasetStats.build(state.summaries, state.usage_matrix, state.dataset_version,
+                                           state.catalog.relations["tactics"], state.catalog.version)
+            if state.shared is None:
+                self._save_dataset_stats(stats)
+        state.stats = stats
+        return stats
+    
+    async def get_dataset_stats(self) -> DatasetStats:
+        """Aggregate counts for the loaded dataset: totals, per-technique group counts,
+        per-group used technique counts, software popularity and tactic coverage."""
+        if not self._cache_loaded:
+            await self.load_mitre_data()
+        
+        return self._get_dataset_stats(self._state)
+    
+    def _get_similarity(self, state: _DatasetState) -> GroupSimilarity:
+        similarity = state.similarity
+        if (similarity is None or similarity.usage is not state.usage_matrix
+                or similarity.dataset_version != state.dataset_version):
+            similarity = GroupSimilarity(state.usage_matrix, state.dataset_version, self.cache_dir)
+            state.similarity = similarity
+        return similarity
+    
+    def _similarity_results(self, neighbours: List[Tuple[str, float, int]],
+                            state: _DatasetState) -> List[Dict[str, Any]]:
+        results = []
+        for attack_id, similarity, shared in neighbours:
+            summary = state.summaries[attack_id]
+            results.append({
+                "attack_id": attack_id,
+                "name": summary.name,
+                "similarity": round(similarity, 4),
+                "shared_techniques": shared,
+                "techniques_used": len(summary.used_technique_ids)
+            })
+        return results
+    
+    @_timed("similarity.group")
+    async def get_similar_groups(self, attack_id: str, k: int = 10, metric: str = "jaccard") -> List[Dict[str, Any]]:
+        """Get the k groups whose used techniques are most similar to a group's.
+        
+        metric is "jaccard" or "cosine". The all-pairs matrix behind this is built on
+        first use and kept on disk until the dataset changes.
+        """
+        if not self._cache_loaded:
+            await self.load_mitre_data()
+        
+        state = self._state
+        return self._similarity_results(
+            self._get_similarity(state).similar_to_group(self._resolve_group_id(attack_id), k, metric), state)
+    
+    @_timed("similarity.techniques")
+    async def get_groups_similar_to_techniques(self, technique_ids: List[str], k: int = 10,
+                                               metric: str = "jaccard") -> List[Dict[str, Any]]:
+        """Get the k groups whose used techniques are most similar to a list of technique IDs."""
+        if not self._cache_loaded:
+            await self.load_mitre_data()
+        
+        technique_ids = [technique_id.strip().upper() for technique_id in technique_ids]
+        state = self._state
+        return self._similarity_results(
+            self._get_similarity(state).similar_to_techniques(technique_ids, k, metric), state)
+    
+    async def get_similarity_matrix(self, metric: str = "jaccard") -> Tuple[List[str], np.ndarray]:
+        """Get (group IDs, all-pairs similarity matrix) for the loaded dataset."""
+        if not self._cache_loaded:
+            await self.load_mitre_data()
+        
+        similarity = self._get_similarity(self._state)
+        return similarity.usage.group_ids, similarity.similarity_matrix(metric)
+    
+    @_timed("score")
+    async def score_groups(self, observed_ids: List[str], k: int = 10) -> List[Dict[str, Any]]:
+        """Rank groups as candidates for a set of observed technique IDs.
+        
+        Each technique is weighted by its IDF across groups, so rare techniques count
+        more than ones nearly every group uses. A group's score is the cosine between
+        the IDF-weighted observed and group technique vectors. Observed IDs no group
+        uses still lower every score, since they are part of the observation.
+        """
+        if not self._cache_loaded:
+            await self.load_mitre_data()
         
-        return techniques
+        state = self._state
+        usage = state.usage_matrix
+        observed = {technique_id.strip().upper() for technique_id in observed_ids if technique_id.strip()}
+        cols = np.array(sorted(usage.technique_index[technique_id] for technique_id in observed
+                               if technique_id in usage.technique_index), dtype=np.intp)
+        if not len(cols):
+            return []
+        
+        weights = usage.idf[cols] ** 2
+        # Unseen techniques get the highest possible IDF (document frequency 0)
+        unseen = len(observed) - len(cols)
+        max_idf = np.log(1 + usage.shape[0]) + 1
+        observed_norm = np.sqrt(weights.sum() + unseen * max_idf ** 2)
+        
+        # Candidates are the groups using at least one observed technique
+        hits = usage.columns[:, cols]
+        matched = hits @ weights
+        rows = np.flatnonzero(matched)
+        hits = hits[rows]
+        scores = matched[rows] / (usage.group_norms[rows] * observed_norm)
+        
+        k = min(k, len(rows))
+        if k <= 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.lexsort((rows[top], -scores[top]))]
+        
+        results = []
+        for i in top:
+            attack_id = usage.group_ids[rows[i]]
+            summary = state.summaries[attack_id]
+            results.append({
+                "attack_id": attack_id,
+                "name": summary.name,
+                "score": round(float(scores[i]), 4),
+                "matched_techniques": [usage.technique_ids[col] for col in cols[hits[i]]],
+                "techniques_used": len(summary.used_technique_ids)
+            })
+        return results
+    
+    def _coverage_gaps(self, state: _DatasetState, detected: frozenset) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Covered column mask, uncovered techniques per group and groups per uncovered technique.
+        
+        The groups x techniques uncovered matrix is only an intermediate, so cached
+        results stay the size of a row and a column.
+        """
+        usage = state.usage_matrix
+        covered = usage.detection_mask(sorted(detected))
+        uncovered = usage.uncovered(covered)
+        gaps = (covered, uncovered.sum(axis=1), uncovered.sum(axis=0))
+        for array in gaps:
+            array.setflags(write=False)
+        return gaps
+    
+    @_timed("analysis.coverage_gaps")
+    def coverage_gaps(self, detected_ids: Sequence[str], top_groups: Optional[int] = None,
+                      top_techniques: Optional[int] = None) -> Dict[str, Any]:
+        """Techniques each group uses that a detection inventory does not cover.
+        
+        detected_ids are the technique IDs the inventory detects; a main technique ID
+        also covers its subtechniques (see UsageMatrix.detection_mask). Every group is
+        compared in one pass over the usage matrix, and the per-group and per-technique
+        gap counts for an inventory are cached per dataset version, so switching back
+        to an earlier inventory does not recompute them.
+        
+        Returns:
+            Overall counts, the inventory IDs matching no used technique ("unmatched"),
+            groups most exposed first (most uncovered techniques, ties by attack ID) with
+            their uncovered technique IDs, and uncovered techniques with the most
+            leverage first (used by the most groups, ties by ID). top_groups and
+            top_techniques limit those two lists.
+        """
+        state = self._state
+        usage = state.usage_matrix
+        detected = frozenset(technique_id.strip().upper() for technique_id in detected_ids if technique_id.strip())
+        key = ("coverage_gaps", detected, state.dataset_version)
+        covered, gap_counts, group_gaps = self._query_cache.get_or_compute(
+            key, lambda: self._coverage_gaps(state, detected))
+        
+        used_counts = usage.group_coverage()
+        rows = np.flatnonzero(used_counts)
+        rows = rows[np.argsort(-gap_counts[rows], kind="stable")][:top_groups]
+        cols = np.flatnonzero(group_gaps)
+        cols = cols[np.argsort(-group_gaps[cols], kind="stable")][:top_techniques]
+        
+        parent_ids = {technique_id.split('.')[0] for technique_id in usage.technique_ids}
+        techniques_used = len(usage.technique_ids)
+        techniques_covered = int(covered.sum())
+        return {
+            "dataset_version": state.dataset_version,
+            "detected": len(detected),
+            "unmatched": sorted(technique_id for technique_id in detected
+                                if technique_id not in usage.technique_index and technique_id not in parent_ids),
+            "techniques_used": techniques_used,
+            "techniques_covered": techniques_covered,
+            "coverage": round(techniques_covered / techniques_used, 4) if techniques_used else 0.0,
+            "groups": [
+                {
+                    "attack_id": usage.group_ids[row],
+                    "name": state.summaries[usage.group_ids[row]].name,
+                    "techniques_used": int(used_counts[row]),
+                    "uncovered": int(gap_counts[row]),
+                    "coverage": round(1 - float(gap_counts[row]) / float(used_counts[row]), 4),
+                    "uncovered_techniques": [usage.technique_ids[col]
+                                             for col in np.flatnonzero(usage.matrix[row] & ~covered)],
+                }
+                for row in rows
+            ],
+            "techniques": [
+                {
+                    "technique_id": usage.technique_ids[col],
+                    "name": self.get_technique_name(usage.technique_ids[col]),
+                    "groups": int(group_gaps[col]),
+                }
+                for col in cols
+            ],
+        }
+    
+    async def get_coverage_gaps(self, detected_ids: Sequence[str], top_groups: Optional[int] = None,
+                                top_techniques: Optional[int] = None) -> Dict[str, Any]:
+        """coverage_gaps, loading the dataset first if needed."""
+        if not self._cache_loaded:
+            await self.load_mitre_data()
+        
+        return self.coverage_gaps(detected_ids, top_groups, top_techniques)
+    
+    def get_technique_name(self, technique_id: str) -> str:
+        """Display name for a technique full ID; subtechniques read "Parent: Sub"."""
+        name = self._technique_names.get(technique_id, technique_id)
+        if '.' in technique_id:
+            parent_id = technique_id.split('.')[0]
+            return f"{self._technique_names.get(parent_id, parent_id)}: {name}"
+        return name
+    
+    def get_tactics(self) -> Dict[str, str]:
+        """Tactic ID -> name for every tactic in the technique catalog, in kill chain order."""
+        return dict(self._catalog.names["tactics"])
+    
+    def get_tactic_name(self, tactic_id: str) -> str:
+        """Display name for a tactic ID."""
+        return self._catalog.names["tactics"].get(tactic_id) or ATTACK_TACTICS.get(tactic_id, tactic_id)
+    
+    def get_technique_tactics(self, technique_id: str) -> List[str]:
+        """Tactic IDs of a technique; subtechniques missing from the catalog take their parent's."""
+        return list(self._catalog.related("tactics", technique_id))
+    
+    def get_tactic_techniques(self, tactic_id: str) -> List[str]:
+        """Full IDs of every catalog technique and subtechnique under a tactic, sorted."""
+        return sorted(self._catalog.techniques_with["tactics"].get(tactic_id, ()))
+    
+    def get_technique_mitigations(self, technique_id: str) -> List[Dict[str, str]]:
+        """Mitigations of a technique as {id, name}; subtechniques missing from the catalog take their parent's."""
+        names = self._catalog.names["mitigations"]
+        return [{"id": mitigation_id, "name": names.get(mitigation_id, mitigation_id)}
+                for mitigation_id in self._catalog.related("mitigations", technique_id)]
+    
+    def get_technique_detections(self, technique_id: str) -> List[str]:
+        """"Data Source: Data Component" names detecting a technique."""
+        return list(self._catalog.related("detections", technique_id))
+    
+    def _rank_related(self, relation: str, technique_ids: Sequence[str],
+                      limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        state = self._state
+        techniques = frozenset(technique_ids)
+        key = ("rank_related", relation, techniques, state.catalog.version)
+        ranked = self._query_cache.get_or_compute(key, lambda: tuple(state.catalog.rank(relation, techniques)))
+        names = state.catalog.names[relation]
+        return [
+            {
+                "id": related_id,
+                "name": names.get(related_id, related_id),
+                "techniques": sorted(covered),
+                "covered": len(covered),
+                "coverage": round(len(covered) / len(techniques), 4),
+            }
+            for related_id, covered in ranked[:limit]
+        ]
+    
+    def rank_mitigations(self, technique_ids: Sequence[str], limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Mitigations of any of the techniques, ranked by how many of them each covers.
+        
+        Each result has the mitigation id and name, the covered technique IDs, their
+        count and the fraction of technique_ids covered. Coverage is an intersection
+        with the mitigation's technique set from the catalog index.
+        """
+        return self._rank_related("mitigations", technique_ids, limit)
+    
+    def rank_detections(self, technique_ids: Sequence[str], limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Data components detecting any of the techniques, ranked like rank_mitigations."""
+        return self._rank_related("detections", technique_ids, limit)
+    
+    async def get_group_mitigations(self, attack_id: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Mitigations covering a group's used techniques, most covering first (see rank_mitigations).
+        
+        attack_id may also be a group name or alias. Unknown groups give an empty list.
+        """
+        if not self._cache_loaded:
+            await self.load_mitre_data()
+        
+        summary = self._summaries.get(self._resolve_group_id(attack_id))
+        return self.rank_mitigations(summary.used_technique_ids, limit) if summary else []
+    
+    async def get_group_detections(self, attack_id: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Data components detecting a group's used techniques, most covering first (see rank_detections)."""
+        if not self._cache_loaded:
+            await self.load_mitre_data()
+        
+        summary = self._summaries.get(self._resolve_group_id(attack_id))
+        return self.rank_detections(summary.used_technique_ids, limit) if summary else []
+    
+    def _hit_ratios(self) -> Dict[str, float]:
+        counters = self.metrics.snapshot()["counters"]
+        hits, misses = counters.get("hydrate.hits", 0), counters.get("hydrate.misses", 0)
+        return {
+            "query_cache": self._query_cache.stats()["hit_ratio"],
+            "hydrated_groups": round(hits / (hits + misses), 4) if hits + misses else 0.0,
+        }
+    
+    def _memory_stats(self) -> Dict[str, int]:
+        """Approximate bytes held by the large in-memory structures, plus process peak RSS."""
+        state = self._state
+        usage = state.usage_matrix
+        memory = {
+            "usage_matrix_bytes": usage.matrix.nbytes + (usage._columns.nbytes if usage._columns is not None else 0),
+            "similarity_bytes": 0,
+            "shared_dataset_bytes": len(state.shared._mmap) if state.shared is not None else 0,
+        }
+        similarity = state.similarity
+        if similarity is not None and similarity._pair_counts is not None:
+            memory["similarity_bytes"] = similarity._pair_counts.nbytes
+        if resource is not None:
+            # ru_maxrss is kilobytes on Linux, bytes on macOS
+            max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            memory["max_rss_bytes"] = max_rss if sys.platform == "darwin" else max_rss * 1024
+        return memory
+    
+    def _metric_gauges(self) -> Dict[str, float]:
+        gauges = {
+            "apt_groups": len(self._summaries),
+            "hydrated_groups": len(self._hydrated),
+            "query_cache_entries": len(self._query_cache),
+            "needs_revalidation": int(self._needs_revalidation()),
+        }
+        gauges.update({f"{name}_hit_ratio": ratio for name, ratio in self._hit_ratios().items()})
+        gauges.update({f"memory_{name}": value for name, value in self._memory_stats().items()})
+        return gauges
+    
+    def export_metrics(self, format: str = "prometheus") -> str:
+        """Render metrics as Prometheus text exposition ("prometheus") or JSON ("json")."""
+        if format == "prometheus":
+            return self.metrics.to_prometheus(self._metric_gauges())
+        if format == "json":
+            return json.dumps({**self.metrics.snapshot(), "gauges": self._metric_gauges()}, indent=2)
+        raise ValueError(f"Unknown metrics format {format!r}, expected 'prometheus' or 'json'")
     
     async def get_cache_stats(self) -> Dict[str, Any]:
-        """Get cache statistics."""
+        """Get cache statistics, including operation timings, hit ratios and memory."""
         if not self._cache_loaded:
             await self.load_mitre_data()
         
         return {
-            "total_apt_groups": len(self._memory_cache),
+            "total_apt_groups": len(self._summaries),
+            "hydrated_apt_groups": len(self._hydrated),
+            "hydrated_cache_size": self.hydrated_cache_size,
+            "usage_matrix_shape": list(self._usage_matrix.shape),
+            "catalog_techniques": len(self._catalog),
+            "query_cache": self._query_cache.stats(),
             "cache_loaded": self._cache_loaded,
             "cache_dir": str(self.cache_dir),
             "db_path": str(self.db_path),
             "mitre_data_dir": str(self.mitre_data_dir),
+            "source_dirs": [str(directory) for directory in self.source_dirs],
+            "dataset_version": self.dataset_version,
+            "validated_at": self.validated_at.isoformat() if self.validated_at else None,
+            "needs_revalidation": self._needs_revalidation(),
+            "hit_ratios": self._hit_ratios(),
+            "memory": self._memory_stats(),
+            "metrics": self.metrics.snapshot(),
             "last_updated": datetime.now().isoformat()
         }
     
-    async def refresh_cache(self):
-        """Force refresh of cache from source files."""
+    async def refresh_cache(self, background: bool = False) -> Optional[threading.Thread]:
+        """Force refresh of cache from source files.
+        
+        The new dataset is built from scratch off to the side and swapped in when
+        complete; until then readers keep getting the current one. With `background`
+        the build runs in a daemon thread, which is returned.
+        """
         logger.info("Forcing cache refresh...")
-        self._cache_loaded = False
-        self._memory_cache = {}
+        if self.shared_dataset_path is not None:
+            # Workers never own the data; just follow whatever the publisher wrote last
+            self._attach_shared_dataset()
+            return None
         
-        # Clear database cache
-        with sqlite3.connect(str(self.db_path)) as conn:
-            conn.execute("DELETE FROM apt_groups")
-            conn.execute("DELETE FROM search_index")
-            conn.commit()
+        if background:
+            thread = threading.Thread(target=self._refresh_and_swap, kwargs={"full": True},
+                                      daemon=True, name="mitre-cache-refresh")
+            thread.start()
+            return thread
         
-        # Reload from files
-        await self.load_mitre_data()
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._refresh_and_swap, True)
+        return None
+
 
+# Process-wide cache instance, created on first use rather than at import time
+_shared_cache: Optional[MITRECache] = None
+_shared_cache_config: Dict[str, Any] = {}
+_shared_cache_lock = threading.Lock()
 
-# Global cache instance
-mitre_cache = MITRECache()
+
+def configure_mitre_cache(**config):
+    """Set the MITRECache arguments (cache_dir, mitre_data_dir, cache_duration, ...)
+    used for the shared instance. Must be called before get_mitre_cache() creates it.
+    """
+    with _shared_cache_lock:
+        if _shared_cache is not None:
+            raise RuntimeError("Shared MITRECache already created; configure it before first use")
+        _shared_cache_config.clear()
+        _shared_cache_config.update(config)
+
+
+def get_mitre_cache() -> MITRECache:
+    """Get the process-wide MITRECache, creating it on first call."""
+    global _shared_cache
+    
+    if _shared_cache is None:
+        with _shared_cache_lock:
+            if _shared_cache is None:
+                _shared_cache = MITRECache(**_shared_cache_config)
+    return _shared_cache
 
 
 async def main():
     """Test the MITRE cache service."""
-    cache = MITRECache()
+    cache = get_mitre_cache()
     
     # Load data
     apt_groups = await cache.load_mitre_data()
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+MITRE Dataset Export
+Streams a loaded MITRECache dataset as NDJSON or CSV straight from the cache database,
+one row at a time. Run it with
+`python mitre_export.py ndjson|csv [--kinds ...] [--output PATH]`.
+"""
+
+import argparse
+import asyncio
+import csv
+import io
+import itertools
+import json
+import sqlite3
+import sys
+from typing import Dict, Any, Iterator, Tuple
+
+import structlog
+
+from mitre_cache import APTGroupSummary, LazyGroupMapping, get_mitre_cache
+
+try:
+    import orjson  # Optional faster JSON backend
+except ImportError:
+    orjson = None
+
+# Dataset export: record kinds, output formats and the CSV columns of each kind
+EXPORT_KINDS = ("group", "technique", "usage", "software")
+EXPORT_FORMATS = ("ndjson", "csv")
+EXPORT_CSV_COLUMNS = {
+    "group": ("attack_id", "name", "aliases", "techniques_count", "software_count", "campaign_count",
+              "description_preview"),
+    "technique": ("technique_id", "name", "domain"),
+    "usage": ("attack_id", "technique_id"),
+    "software": ("attack_id", "software_id", "software_name"),
+}
+
+
+def _json_loads(raw: bytes) -> Any:
+    """Parse JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _export_rows(conn: sqlite3.Connection, summaries: Dict[str, APTGroupSummary], kind: str) -> Iterator[Tuple]:
+    """Stream one kind's rows as EXPORT_CSV_COLUMNS tuples, one database row at a time."""
+    if kind == "technique":
+        yield from conn.execute("SELECT technique_id, name, domain FROM techniques ORDER BY technique_id")
+        return
+    
+    cursor = conn.execute("""
+        SELECT attack_id, name, aliases_json, techniques_count, software_count, campaign_count,
+               description_preview, used_technique_ids_json, software_json
+        FROM group_summaries ORDER BY attack_id
+    """)
+    for row in cursor:
+        attack_id = row[0]
+        if attack_id not in summaries:
+            continue
+        if kind == "group":
+            yield (attack_id, row[1], "; ".join(json.loads(row[2])), *row[3:7])
+        elif kind == "usage":
+            for technique_id in json.loads(row[7]):
+                yield attack_id, technique_id
+        elif kind == "software":
+            for software_id, software_name in json.loads(row[8]):
+                yield attack_id, software_id, software_name
+
+
+def _export_group_payloads(conn: sqlite3.Connection, summaries: Dict[str, APTGroupSummary]) -> Iterator[str]:
+    """Stream the stored JSON payload of every served group, in attack ID order."""
+    for attack_id, data_json in conn.execute("SELECT attack_id, data_json FROM apt_groups ORDER BY attack_id"):
+        if attack_id in summaries:
+            yield data_json
+
+
+def _export_connection(groups: LazyGroupMapping,
+                       kinds: Tuple[str, ...]) -> Tuple[sqlite3.Connection, Dict[str, APTGroupSummary]]:
+    cache = groups.cache
+    if cache.shared_dataset_path is not None:
+        raise RuntimeError(f"Exports read the cache database, which a cache attached to the shared dataset "
+                           f"{cache.shared_dataset_path} does not have; export from the loader that published it")
+    unknown = [kind for kind in kinds if kind not in EXPORT_KINDS]
+    if unknown:
+        raise ValueError(f"Unknown export kinds: {', '.join(unknown)}")
+    # One connection and one set of served groups for the whole export: a refresh
+    # replaces the database file, and this connection keeps reading the version it opened
+    summaries, _ = cache.snapshot()
+    return sqlite3.connect(str(cache.db_path)), summaries
+
+
+def iter_export(groups: LazyGroupMapping, kinds: Tuple[str, ...] = EXPORT_KINDS) -> Iterator[Dict[str, Any]]:
+    """Stream the dataset behind `groups` (a load_mitre_data() result) as dicts, each
+    tagged with its "type" (one of EXPORT_KINDS).
+    
+    Groups are full group payloads; techniques, usage (group -> technique) and
+    software (group -> software) records carry their EXPORT_CSV_COLUMNS. Rows
+    are read from the cache database one at a time, so memory stays constant.
+    """
+    conn, summaries = _export_connection(groups, kinds)
+    try:
+        for kind in kinds:
+            if kind == "group":
+                for data_json in _export_group_payloads(conn, summaries):
+                    yield {"type": kind, **_json_loads(data_json)}
+                continue
+            columns = EXPORT_CSV_COLUMNS[kind]
+            for row in _export_rows(conn, summaries, kind):
+                yield {"type": kind, **dict(zip(columns, row))}
+    finally:
+        conn.close()
+
+
+def iter_export_lines(groups: LazyGroupMapping, fmt: str = "ndjson",
+                      kinds: Tuple[str, ...] = EXPORT_KINDS) -> Iterator[str]:
+    """Stream the dataset behind `groups` as newline-terminated NDJSON or CSV lines.
+    
+    NDJSON lines are the iter_export records. CSV takes a single kind and starts
+    with a header row of its EXPORT_CSV_COLUMNS; groups are exported as summaries.
+    """
+    if fmt == "ndjson":
+        conn, summaries = _export_connection(groups, kinds)
+        try:
+            for kind in kinds:
+                if kind == "group":
+                    # Splice the stored JSON object rather than parse and re-encode it
+                    for data_json in _export_group_payloads(conn, summaries):
+                        yield '{"type": "group", ' + data_json.strip()[1:] + "\n"
+                    continue
+                columns = EXPORT_CSV_COLUMNS[kind]
+                for row in _export_rows(conn, summaries, kind):
+                    yield json.dumps({"type": kind, **dict(zip(columns, row))}) + "\n"
+        finally:
+            conn.close()
+        return
+    
+    if fmt != "csv":
+        raise ValueError(f"Unknown export format {fmt!r}; expected one of {EXPORT_FORMATS}")
+    if len(kinds) != 1:
+        raise ValueError("CSV export takes exactly one kind")
+    
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    conn, summaries = _export_connection(groups, kinds)
+    try:
+        rows = _export_rows(conn, summaries, kinds[0])
+        for row in itertools.chain([EXPORT_CSV_COLUMNS[kinds[0]]], rows):
+            writer.writerow(row)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    finally:
+        conn.close()
+
+
+def export_dataset(groups: LazyGroupMapping, out, fmt: str = "ndjson",
+                   kinds: Tuple[str, ...] = EXPORT_KINDS) -> int:
+    """Write iter_export_lines to a text stream; returns the number of lines written."""
+    count = 0
+    for line in iter_export_lines(groups, fmt, kinds):
+        out.write(line)
+        count += 1
+    return count
+
+
+async def main():
+    """Export the shared cache's dataset: `python mitre_export.py ndjson|csv [--kinds ...] [--output PATH]`."""
+    parser = argparse.ArgumentParser(description="Stream the cached MITRE dataset as NDJSON or CSV")
+    parser.add_argument("format", choices=EXPORT_FORMATS)
+    parser.add_argument("--kinds", nargs="+", choices=EXPORT_KINDS, default=list(EXPORT_KINDS),
+                        help="Record kinds to export (CSV takes exactly one)")
+    parser.add_argument("--output", help="Output file (default: stdout)")
+    args = parser.parse_args()
+    
+    if args.format == "csv" and len(args.kinds) != 1:
+        parser.error("csv takes exactly one --kinds value")
+    
+    cache = get_mitre_cache()
+    if cache.shared_dataset_path is not None:
+        parser.error(f"cannot export from a cache attached to the shared dataset {cache.shared_dataset_path}; "
+                     f"run the export where the dataset is loaded from source files")
+    if not args.output:
+        # Keep stdout for records only
+        structlog.configure(logger_factory=structlog.PrintLoggerFactory(sys.stderr))
+    groups = await cache.load_mitre_data()
+    out = open(args.output, "w", newline="", encoding="utf-8") if args.output else sys.stdout
+    try:
+        count = export_dataset(groups, out, args.format, tuple(args.kinds))
+    finally:
+        if args.output:
+            out.close()
+    print(f"Exported {count} lines", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
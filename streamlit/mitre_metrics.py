@@ -0,0 +1,130 @@
+"""
+MITRE Cache Metrics
+Thread-safe event counters and per-operation latency histograms recorded by MITRECache,
+with JSON snapshots and Prometheus text exposition.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Dict, Any, Optional, Tuple
+
+
+# Latency histogram bucket upper bounds in seconds, and samples kept per operation for percentiles
+METRICS_LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+                           0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+METRICS_RECENT_SAMPLES = 1024
+
+
+class CacheMetrics:
+    """Thread-safe counters and per-operation latency histograms for a MITRECache.
+    
+    Each timed operation keeps a count, total, max, cumulative buckets (exported in
+    Prometheus histogram form) and the most recent samples for p50/p95/p99.
+    """
+    
+    def __init__(self, buckets: Tuple[float, ...] = METRICS_LATENCY_BUCKETS,
+                 recent_samples: int = METRICS_RECENT_SAMPLES):
+        self.buckets = buckets
+        self.recent_samples = recent_samples
+        self._lock = threading.Lock()
+        self._counters: Dict[str, int] = {}
+        self._timings: Dict[str, Dict[str, Any]] = {}
+    
+    def increment(self, name: str, amount: int = 1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+    
+    def observe(self, operation: str, seconds: float):
+        with self._lock:
+            timing = self._timings.get(operation)
+            if timing is None:
+                timing = self._timings[operation] = {
+                    "count": 0, "total": 0.0, "max": 0.0,
+                    "buckets": [0] * len(self.buckets),
+                    "recent": deque(maxlen=self.recent_samples),
+                }
+            timing["count"] += 1
+            timing["total"] += seconds
+            timing["max"] = max(timing["max"], seconds)
+            for i, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    timing["buckets"][i] += 1
+                    break
+            timing["recent"].append(seconds)
+    
+    def timer(self, operation: str) -> "_MetricsTimer":
+        """Context manager recording the elapsed time of its block under `operation`."""
+        return _MetricsTimer(self, operation)
+    
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._timings.clear()
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Counters and per-operation timing summaries (milliseconds)."""
+        with self._lock:
+            counters = dict(self._counters)
+            timings = {operation: (timing["count"], timing["total"], timing["max"], sorted(timing["recent"]))
+                       for operation, timing in self._timings.items()}
+        
+        operations = {}
+        for operation, (count, total, maximum, recent) in sorted(timings.items()):
+            def _percentile(q: float) -> float:
+                return round(1000 * recent[min(len(recent) - 1, int(q * len(recent)))], 4) if recent else 0.0
+            operations[operation] = {
+                "count": count,
+                "total_ms": round(1000 * total, 3),
+                "mean_ms": round(1000 * total / count, 4) if count else 0.0,
+                "p50_ms": _percentile(0.50),
+                "p95_ms": _percentile(0.95),
+                "p99_ms": _percentile(0.99),
+                "max_ms": round(1000 * maximum, 4),
+            }
+        return {"counters": counters, "operations": operations}
+    
+    def to_prometheus(self, gauges: Optional[Dict[str, float]] = None, prefix: str = "mitre_cache") -> str:
+        """Render counters, latency histograms and `gauges` in Prometheus text format."""
+        with self._lock:
+            counters = dict(self._counters)
+            timings = {operation: (timing["count"], timing["total"], list(timing["buckets"]))
+                       for operation, timing in self._timings.items()}
+        
+        lines = [f"# HELP {prefix}_events_total Cache events by name",
+                 f"# TYPE {prefix}_events_total counter"]
+        for name, value in sorted(counters.items()):
+            lines.append(f'{prefix}_events_total{{event="{name}"}} {value}')
+        
+        lines += [f"# HELP {prefix}_operation_seconds Latency of cache operations",
+                  f"# TYPE {prefix}_operation_seconds histogram"]
+        for operation, (count, total, buckets) in sorted(timings.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, buckets):
+                cumulative += bucket_count
+                lines.append(f'{prefix}_operation_seconds_bucket{{operation="{operation}",le="{bound}"}} {cumulative}')
+            lines.append(f'{prefix}_operation_seconds_bucket{{operation="{operation}",le="+Inf"}} {count}')
+            lines.append(f'{prefix}_operation_seconds_sum{{operation="{operation}"}} {total:.6f}')
+            lines.append(f'{prefix}_operation_seconds_count{{operation="{operation}"}} {count}')
+        
+        for name, value in sorted((gauges or {}).items()):
+            lines.append(f"# TYPE {prefix}_{name} gauge")
+            lines.append(f"{prefix}_{name} {value}")
+        return "\n".join(lines) + "\n"
+
+
+class _MetricsTimer:
+    __slots__ = ("metrics", "operation", "start")
+    
+    def __init__(self, metrics: CacheMetrics, operation: str):
+        self.metrics = metrics
+        self.operation = operation
+    
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.metrics.observe(self.operation, time.perf_counter() - self.start)
+        if exc_type is not None:
+            self.metrics.increment(f"{self.operation}.errors")
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+MITRE Shared Dataset
+Read-only, memory-mapped snapshot of a loaded MITRECache dataset for multi-worker
+deployments. One loader publishes it with `python mitre_shared.py [--output PATH]`;
+workers attach with MITRECache(shared_dataset=path).
+"""
+
+import argparse
+import asyncio
+import json
+import mmap
+import os
+import struct
+import threading
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
+
+import numpy as np
+
+from mitre_cache import APTGroupSummary, CatalogIndex, UsageMatrix, get_mitre_cache
+
+try:
+    import orjson  # Optional faster JSON backend
+except ImportError:
+    orjson = None
+
+
+# Shared dataset file: magic, then a little-endian u64 header length and a JSON header
+SHARED_DATASET_MAGIC = b"MITRESH1"
+SHARED_DATASET_FILENAME = "shared_dataset.bin"
+SHARED_DATASET_ALIGNMENT = 64
+
+
+def _json_loads(raw: bytes) -> Any:
+    """Parse JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _pack_strings(values: List[str]) -> Tuple[bytes, np.ndarray]:
+    """Encode strings as one UTF-8 blob plus an int64 offsets array (len(values) + 1)."""
+    encoded = [value.encode('utf-8') for value in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(value) for value in encoded], out=offsets[1:])
+    return b"".join(encoded), offsets
+
+
+class SharedDataset:
+    """Read-only, memory-mapped snapshot of a loaded dataset shared by worker processes.
+    
+    One loader publishes the file with write(); workers attach with near-zero
+    startup cost. The usage matrix and string tables are NumPy views straight onto
+    the mapping and group payloads are sliced out on demand, so the pages are shared
+    through the OS page cache instead of being copied into every process.
+    
+    Layout: magic, u64 header length, JSON header listing each section's offset,
+    length, dtype and shape, then the sections aligned to SHARED_DATASET_ALIGNMENT.
+    """
+    
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        with open(self.path, 'rb') as f:
+            stat = os.fstat(f.fileno())
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.file_id = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        
+        magic_size = len(SHARED_DATASET_MAGIC)
+        if self._mmap[:magic_size] != SHARED_DATASET_MAGIC:
+            raise ValueError(f"{self.path} is not a shared MITRE dataset")
+        header_size, = struct.unpack_from("<Q", self._mmap, magic_size)
+        header_start = magic_size + 8
+        header = json.loads(self._mmap[header_start:header_start + header_size])
+        
+        self.dataset_version: str = header["dataset_version"]
+        self._sections: Dict[str, Dict[str, Any]] = header["sections"]
+        self.group_ids = self._strings("group_ids")
+        self.technique_ids = self._strings("technique_ids")
+        self.group_index = {attack_id: row for row, attack_id in enumerate(self.group_ids)}
+        self._group_offsets = self._array("group_offsets")
+    
+    def _array(self, name: str) -> np.ndarray:
+        section = self._sections[name]
+        array = np.frombuffer(self._mmap, dtype=section["dtype"], offset=section["offset"],
+                              count=int(np.prod(section["shape"])))
+        return array.reshape(section["shape"])
+    
+    def _bytes(self, name: str) -> bytes:
+        section = self._sections[name]
+        return self._mmap[section["offset"]:section["offset"] + section["length"]]
+    
+    def _strings(self, name: str) -> List[str]:
+        blob = self._bytes(name)
+        offsets = self._array(f"{name}_offsets").tolist()
+        return [blob[start:end].decode('utf-8') for start, end in zip(offsets, offsets[1:])]
+    
+    @property
+    def usage_matrix(self) -> UsageMatrix:
+        """Usage matrix whose array is a view onto the shared mapping."""
+        return UsageMatrix(self.group_ids, self.technique_ids, self._array("usage_matrix"))
+    
+    def summaries(self) -> Dict[str, APTGroupSummary]:
+        rows = _json_loads(self._bytes("summaries"))
+        return {row[0]: APTGroupSummary(*row[:8], software=[tuple(software) for software in row[8]])
+                for row in rows}
+    
+    def technique_names(self) -> Dict[str, str]:
+        return _json_loads(self._bytes("technique_names"))
+    
+    def catalog(self) -> CatalogIndex:
+        """The technique catalog; empty for files written without one."""
+        if "catalog" not in self._sections:
+            return CatalogIndex()
+        return CatalogIndex(**_json_loads(self._bytes("catalog")))
+    
+    def group_payload(self, attack_id: str) -> Optional[bytes]:
+        """Serialized group JSON (the apt_groups.data_json shape)."""
+        row = self.group_index.get(attack_id)
+        if row is None:
+            return None
+        base = self._sections["groups"]["offset"]
+        return self._mmap[base + int(self._group_offsets[row]):base + int(self._group_offsets[row + 1])]
+    
+    def is_current(self) -> bool:
+        """Whether the file at path is still the one attached (publishers replace it atomically)."""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return True
+        return (stat.st_ino, stat.st_mtime_ns, stat.st_size) == self.file_id
+    
+    @staticmethod
+    def write(path: Path, dataset_version: str, summaries: Dict[str, APTGroupSummary],
+              technique_names: Dict[str, str], usage: UsageMatrix, payloads: Dict[str, bytes],
+              catalog: Optional[CatalogIndex] = None) -> Path:
+        """Write a snapshot to path atomically (temporary file, then rename)."""
+        path = Path(path)
+        group_ids = usage.group_ids
+        group_blob, group_id_offsets = _pack_strings(group_ids)
+        technique_blob, technique_id_offsets = _pack_strings(usage.technique_ids)
+        group_payloads = [payloads[attack_id] for attack_id in group_ids]
+        payload_offsets = np.zeros(len(group_payloads) + 1, dtype=np.int64)
+        np.cumsum([len(payload) for payload in group_payloads], out=payload_offsets[1:])
+        summary_rows = [[summary.attack_id, summary.name, summary.description_preview, summary.aliases_list,
+                         summary.techniques_count, summary.software_count, summary.campaign_count,
+                         summary.used_technique_ids, summary.software]
+                        for summary in (summaries[attack_id] for attack_id in group_ids)]
+        
+        sections = [
+            ("group_ids", group_blob),
+            ("group_ids_offsets", group_id_offsets),
+            ("technique_ids", technique_blob),
+            ("technique_ids_offsets", technique_id_offsets),
+            ("usage_matrix", np.ascontiguousarray(usage.matrix)),
+            ("group_offsets", payload_offsets),
+            ("summaries", json.dumps(summary_rows).encode('utf-8')),
+            ("technique_names", json.dumps(technique_names).encode('utf-8')),
+            ("catalog", json.dumps((catalog or CatalogIndex()).to_json()).encode('utf-8')),
+            ("groups", b"".join(group_payloads)),
+        ]
+        
+        # Header size depends on the offsets it records, so lay out with a fixed reserve
+        def _layout(start: int) -> Dict[str, Dict[str, Any]]:
+            layout, offset = {}, start
+            for name, data in sections:
+                offset = -(-offset // SHARED_DATASET_ALIGNMENT) * SHARED_DATASET_ALIGNMENT
+                entry = {"offset": offset, "length": len(data) if isinstance(data, bytes) else data.nbytes}
+                if isinstance(data, np.ndarray):
+                    entry["dtype"], entry["shape"] = data.dtype.str, list(data.shape)
+                layout[name] = entry
+                offset += entry["length"]
+            return layout
+        
+        prefix_size = len(SHARED_DATASET_MAGIC) + 8
+        reserve = len(json.dumps({"dataset_version": dataset_version, "sections": _layout(0)})) + 1024
+        layout = _layout(prefix_size + reserve)
+        header = json.dumps({"dataset_version": dataset_version, "sections": layout}).encode('utf-8')
+        
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp_path, 'wb') as f:
+            f.write(SHARED_DATASET_MAGIC)
+            f.write(struct.pack("<Q", len(header)))
+            f.write(header)
+            for name, data in sections:
+                f.seek(layout[name]["offset"])
+                f.write(data if isinstance(data, bytes) else data.tobytes())
+        os.replace(tmp_path, path)
+        return path
+
+
+async def main():
+    """Publish the shared cache's dataset: `python mitre_shared.py [--output PATH]`."""
+    parser = argparse.ArgumentParser(description="Write the MITRE dataset as a memory-mapped file for worker processes")
+    parser.add_argument("--output", help=f"Output file (default: {SHARED_DATASET_FILENAME} in the cache directory)")
+    args = parser.parse_args()
+    
+    path = await get_mitre_cache().publish_shared_dataset(args.output)
+    print(f"Published shared dataset to {path}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -9,13 +9,11 @@ import asyncio
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-import sys
-from pathlib import Path
-from collections import Counter, defaultdict
-import json
+import os
+from collections import Counter
+import itertools
 
-from streamlit.mitre_cache import MITRECache
+from streamlit.mitre_cache import ATTACK_TACTICS, LazyGroupMapping, configure_mitre_cache, get_mitre_cache
 
 # Page configuration
 st.set_page_config(
@@ -213,11 +211,33 @@ def get_light_theme():
 
 
 
-@st.cache_data(ttl=300)  # Cache for 5 minutes
+# Shown instead of empty tactic, mitigation and detection views when the source data
+# has no technique catalog (catalog/techniques.json, written by the ETL)
+CATALOG_MISSING_MESSAGE = ("Technique catalog not generated: run `python echo-attack-dashboard/get_mitre_data/main.py` "
+                           "to write `data/catalog/techniques.json`, then reload the dashboard.")
+
+# Lazily hydrated group views hash by dataset version instead of by content
+GROUP_HASH_FUNCS = {LazyGroupMapping: lambda groups: (groups.dataset_version, groups.catalog_version)}
+
+
+@st.cache_resource
+def get_cache():
+    """Process-wide MITRE cache shared by every session.
+    
+    Set MITRE_SHARED_DATASET to a file written by `python mitre_shared.py`
+    to attach every worker process to one published dataset instead of loading it.
+    """
+    shared_dataset = os.environ.get("MITRE_SHARED_DATASET")
+    if shared_dataset:
+        configure_mitre_cache(shared_dataset=shared_dataset)
+    return get_mitre_cache()
+
+@st.cache_resource(ttl=300)  # Re-check source files every 5 minutes; shared live view, not a pickled copy
 def load_cache_data():
     """Load MITRE cache data with caching."""
     async def _load():
-        cache = MITRECache()
+        cache = get_cache()
+        await cache.refresh_changed_files()
         return await cache.load_mitre_data()
     
     # Run async function
@@ -228,161 +248,50 @@ def load_cache_data():
     finally:
         loop.close()
 
-@st.cache_data
+@st.cache_data(hash_funcs=GROUP_HASH_FUNCS)
 def calculate_overview_metrics(apt_groups):
-    """Calculate comprehensive overview metrics."""
-    total_groups = len(apt_groups)
-    total_techniques = 0
-    total_software = 0
-    used_main_techniques = 0
-    used_subtechniques = 0
-    total_campaigns = 0
-    
-    # MITRE ATT&CK Tactics
-    tactics_used = set()
-    all_techniques = set()
-    
-    for group in apt_groups.values():
-        total_techniques += len(group.technique_table_data)
-        total_software += len(group.software_data)
-        total_campaigns += len(getattr(group, 'campaign_data', []))
-        
-        for technique in group.technique_table_data:
-            tech_id = technique.get('id')
-            if tech_id:
-                all_techniques.add(tech_id)
-            
-            if technique.get('technique_used', False):
-                used_main_techniques += 1
-                # Extract tactic from technique (first part of technique ID)
-                if tech_id and '.' not in tech_id:  # Main technique
-                    tactic = tech_id.split('.')[0] if '.' in tech_id else tech_id[:2]
-                    tactics_used.add(tactic)
-                    
-            for subtechnique in technique.get('subtechniques', []):
-                if subtechnique.get('technique_used', False):
-                    used_subtechniques += 1
-    
-    return {
-        'total_groups': total_groups,
-        'total_techniques': total_techniques,
-        'total_software': total_software,
-        'used_main_techniques': used_main_techniques,
-        'used_subtechniques': used_subtechniques,
-        'total_campaigns': total_campaigns,
-        'unique_techniques': len(all_techniques),
-        'tactics_covered': len(tactics_used)
-    }
+    """Calculate comprehensive overview metrics (precomputed when the cache loads)."""
+    return dict(apt_groups.stats.totals)
 
-@st.cache_data
+@st.cache_data(hash_funcs=GROUP_HASH_FUNCS)
 def create_ttp_matrix(apt_groups):
     """Create TTP (Tactics, Techniques, Procedures) matrix for APT groups."""
-    # Get all unique techniques
-    all_techniques = {}
-    apt_usage = {}
+    usage = apt_groups.usage_matrix
+    cache = apt_groups.cache
     
-    # First pass: collect all techniques and their names
-    for group_id, group in apt_groups.items():
-        apt_usage[group.name] = {}
-        for technique in group.technique_table_data:
-            tech_id = technique.get('id')
-            tech_name = technique.get('name', 'Unknown')
-            
-            if tech_id:
-                all_techniques[tech_id] = tech_name
-                apt_usage[group.name][tech_id] = technique.get('technique_used', False)
-                
-                # Add subtechniques
-                for subtechnique in technique.get('subtechniques', []):
-                    sub_id = subtechnique.get('id')
-                    sub_name = subtechnique.get('name', 'Unknown')
-                    
-                    if sub_id:
-                        full_sub_id = f"{tech_id}.{sub_id}"
-                        all_techniques[full_sub_id] = f"{tech_name}: {sub_name}"
-                        apt_usage[group.name][full_sub_id] = subtechnique.get('technique_used', False)
+    # Columns are used techniques; parents of used subtechniques are listed too
+    technique_ids = set(usage.technique_ids)
+    technique_ids.update(tech_id.split('.')[0] for tech_id in usage.technique_ids)
+    all_techniques = {tech_id: cache.get_technique_name(tech_id) for tech_id in sorted(technique_ids)}
+    
+    # Only used techniques are recorded; consumers default missing entries to False
+    apt_usage = {}
+    for row, group_id in enumerate(usage.group_ids):
+        apt_usage[apt_groups.summaries[group_id].name] = {
+            usage.technique_ids[col]: True for col in usage.matrix[row].nonzero()[0]
+        }
     
     return all_techniques, apt_usage
 
-@st.cache_data
+@st.cache_data(hash_funcs=GROUP_HASH_FUNCS)
 def create_technique_coverage_stats(apt_groups):
-    """Create detailed technique coverage statistics."""
-    technique_stats = {}
+    """Create technique coverage statistics per tactic (used main techniques, from the technique catalog)."""
+    cache = apt_groups.cache
     tactic_coverage = {}
-    
-    # MITRE ATT&CK Tactics mapping
-    tactics_map = {
-        'TA0001': 'Initial Access',
-        'TA0002': 'Execution', 
-        'TA0003': 'Persistence',
-        'TA0004': 'Privilege Escalation',
-        'TA0005': 'Defense Evasion',
-        'TA0006': 'Credential Access',
-        'TA0007': 'Discovery',
-        'TA0008': 'Lateral Movement',
-        'TA0009': 'Collection',
-        'TA0010': 'Exfiltration',
-        'TA0011': 'Command and Control',
-        'TA0040': 'Impact'
-    }
-    
-    for group_id, group in apt_groups.items():
-        for technique in group.technique_table_data:
-            tech_id = technique.get('id', '')
-            tech_name = technique.get('name', 'Unknown')
-            
-            if tech_id and technique.get('technique_used', False):
-                if tech_id not in technique_stats:
-                    technique_stats[tech_id] = {
-                        'name': tech_name,
-                        'used_by': [],
-                        'count': 0
-                    }
-                
-                technique_stats[tech_id]['used_by'].append(group.name)
-                technique_stats[tech_id]['count'] += 1
-                
-                # Map to tactic (simplified mapping based on technique ID)
-                tactic_id = f"TA{tech_id[1:5]}" if tech_id.startswith('T') else None
-                if tactic_id in tactics_map:
-                    tactic_name = tactics_map[tactic_id]
-                    if tactic_name not in tactic_coverage:
-                        tactic_coverage[tactic_name] = set()
-                    tactic_coverage[tactic_name].add(tech_id)
-    
-    return technique_stats, tactic_coverage, tactics_map
+    for tactic_id, technique_ids in apt_groups.stats.tactic_coverage.items():
+        main_techniques = {tech_id for tech_id in technique_ids if '.' not in tech_id}
+        if main_techniques:
+            # Tactics of different domains can share a name (e.g. Initial Access)
+            tactic_coverage.setdefault(cache.get_tactic_name(tactic_id), set()).update(main_techniques)
+    return tactic_coverage, cache.get_tactics() or dict(ATTACK_TACTICS)
 
-@st.cache_data
+@st.cache_data(hash_funcs=GROUP_HASH_FUNCS)
 def get_technique_stats(apt_groups):
-    """Calculate technique usage statistics efficiently."""
-    technique_counts = Counter()
-    technique_names = {}
-    apt_technique_map = defaultdict(set)
-    
-    for group_id, group in apt_groups.items():
-        for technique in group.technique_table_data:
-            tech_id = technique.get('id')
-            tech_name = technique.get('name', 'Unknown')
-            
-            if tech_id:
-                technique_names[tech_id] = tech_name
-                
-                if technique.get('technique_used', False):
-                    technique_counts[tech_id] += 1
-                    apt_technique_map[tech_id].add(group.name)
-                
-                # Count subtechniques
-                for subtechnique in technique.get('subtechniques', []):
-                    sub_id = subtechnique.get('id')
-                    sub_name = subtechnique.get('name', 'Unknown')
-                    
-                    if sub_id and subtechnique.get('technique_used', False):
-                        full_sub_id = f"{tech_id}.{sub_id}"
-                        technique_names[full_sub_id] = f"{tech_name}: {sub_name}"
-                        technique_counts[full_sub_id] += 1
-                        apt_technique_map[full_sub_id].add(group.name)
-    
-    return technique_counts, technique_names, apt_technique_map
+    """Technique usage counts (precomputed when the cache loads) and technique names."""
+    cache = apt_groups.cache
+    technique_counts = Counter(apt_groups.stats.technique_group_counts)
+    technique_names = {tech_id: cache.get_technique_name(tech_id) for tech_id in technique_counts}
+    return technique_counts, technique_names
 
 def create_top_techniques_chart(technique_counts, technique_names, plotly_template):
     """Create the top techniques bar chart."""
@@ -479,7 +388,7 @@ def show_overview(apt_groups, plotly_template):
     st.markdown("---")
     st.subheader("🎯 Top Techniques Analysis")
     
-    technique_counts, technique_names, apt_technique_map = get_technique_stats(apt_groups)
+    technique_counts, technique_names = get_technique_stats(apt_groups)
     
     # Top techniques chart
     fig_top = create_top_techniques_chart(technique_counts, technique_names, plotly_template)
@@ -490,7 +399,11 @@ def show_overview(apt_groups, plotly_template):
     st.markdown("---")
     st.subheader("🏹 MITRE ATT&CK Tactics Coverage")
     
-    technique_stats, tactic_coverage, tactics_map = create_technique_coverage_stats(apt_groups)
+    if not apt_groups.catalog_version:
+        st.info(CATALOG_MISSING_MESSAGE)
+        return
+    
+    tactic_coverage, tactics_map = create_technique_coverage_stats(apt_groups)
     
     # Display tactic coverage
     tactic_cols = st.columns(3)
@@ -508,8 +421,8 @@ def show_apt_analysis(apt_groups, plotly_template):
     """Display APT group analysis page."""
     st.header("🏛️ APT Group Analysis")
     
-    # Group selection
-    group_names = sorted([f"{group.name} ({group_id})" for group_id, group in apt_groups.items()])
+    # Group selection (names come from summaries; only the selected group is materialized)
+    group_names = sorted([f"{summary.name} ({group_id})" for group_id, summary in apt_groups.summaries.items()])
     selected_group = st.selectbox("🎯 Select APT Group for Analysis", group_names)
     
     if selected_group:
@@ -596,6 +509,25 @@ def show_apt_analysis(apt_groups, plotly_template):
             
             df_software = pd.DataFrame(software_data)
             st.dataframe(df_software, use_container_width=True, hide_index=True)
+        
+        # Mitigations ranked by how many of the group's techniques they cover
+        mitigations = apt_groups.cache.rank_mitigations(apt_groups.summaries[group_id].used_technique_ids)
+        if not apt_groups.catalog_version:
+            st.markdown("---")
+            st.subheader("🛡️ Mitigations")
+            st.info(CATALOG_MISSING_MESSAGE)
+        elif mitigations:
+            st.markdown("---")
+            st.subheader("🛡️ Mitigations")
+            
+            df_mitigations = pd.DataFrame([{
+                'ID': mitigation['id'],
+                'Name': mitigation['name'],
+                'Techniques Covered': mitigation['covered'],
+                'Coverage': f"{mitigation['coverage']:.0%}",
+                'Techniques': ', '.join(mitigation['techniques'])
+            } for mitigation in mitigations])
+            st.dataframe(df_mitigations, use_container_width=True, hide_index=True)
 
 def show_ttp_matrix(apt_groups):
     """Display TTP (Tactics, Techniques, Procedures) matrix."""
@@ -623,6 +555,16 @@ def show_ttp_matrix(apt_groups):
             ["All Techniques", "Used Only", "Main Techniques Only", "Sub-techniques Only"]
         )
         
+        tactics = apt_groups.cache.get_tactics()
+        tactic_filter = st.selectbox(
+            "🏹 Tactic",
+            ["All Tactics"] + list(tactics),
+            format_func=lambda tactic_id: f"{tactics[tactic_id]} ({tactic_id})" if tactic_id in tactics else tactic_id,
+            disabled=not tactics
+        )
+        if not tactics:
+            st.caption(CATALOG_MISSING_MESSAGE)
+        
         display_format = st.radio(
             "📊 Display Format",
             ["Heatmap", "Detailed Table", "Summary Table"]
@@ -634,18 +576,22 @@ def show_ttp_matrix(apt_groups):
             return
         
         # Filter techniques based on selection
+        tactic_techniques = None
+        if tactic_filter != "All Tactics":
+            tactic_techniques = set(apt_groups.cache.get_tactic_techniques(tactic_filter))
+        
         filtered_techniques = {}
         for tech_id, tech_name in all_techniques.items():
-            include = True
+            include = tactic_techniques is None or tech_id in tactic_techniques
             
             if technique_filter == "Used Only":
                 # Check if any selected group uses this technique
                 used = any(apt_usage.get(group, {}).get(tech_id, False) for group in selected_groups)
-                include = used
+                include = include and used
             elif technique_filter == "Main Techniques Only":
-                include = '.' not in tech_id
+                include = include and '.' not in tech_id
             elif technique_filter == "Sub-techniques Only":
-                include = '.' in tech_id
+                include = include and '.' in tech_id
             
             if include:
                 filtered_techniques[tech_id] = tech_name
@@ -959,7 +905,7 @@ def show_technique_trends(apt_groups, plotly_template):
     """Show technique usage trends and patterns."""
     st.subheader("📈 Technique Usage Trends")
     
-    technique_counts, technique_names, apt_technique_map = get_technique_stats(apt_groups)
+    technique_counts, technique_names = get_technique_stats(apt_groups)
     
     if technique_counts:
         # Create trend analysis
@@ -1014,6 +960,72 @@ def show_search(apt_groups):
         else:
             st.info(f"❌ No results found for '{search_term}'")
 
+def show_coverage_gaps(apt_groups, plotly_template):
+    """Display detection coverage gaps per APT group."""
+    st.header("🛡️ Coverage Gaps")
+    
+    inventory = st.text_area(
+        "📋 Detected technique IDs (comma or whitespace separated; a technique ID also covers its subtechniques)",
+        placeholder="T1059, T1566.001, T1078"
+    )
+    detected_ids = inventory.replace(',', ' ').split()
+    gaps = apt_groups.cache.coverage_gaps(detected_ids, top_techniques=20)
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("📋 Detected", gaps['detected'])
+    with col2:
+        st.metric("🎯 Used Techniques Covered", f"{gaps['techniques_covered']} / {gaps['techniques_used']}")
+    with col3:
+        st.metric("📊 Coverage", f"{gaps['coverage']:.0%}")
+    
+    if gaps['unmatched']:
+        st.warning(f"⚠️ Not used by any APT group: {', '.join(gaps['unmatched'])}")
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        st.subheader("🏛️ Most Exposed APT Groups")
+        df_groups = pd.DataFrame([{
+            'ID': group['attack_id'],
+            'Name': group['name'],
+            'Uncovered': group['uncovered'],
+            'Used': group['techniques_used'],
+            'Coverage': f"{group['coverage']:.0%}"
+        } for group in gaps['groups']])
+        st.dataframe(df_groups, use_container_width=True, hide_index=True)
+    
+    with col2:
+        st.subheader("🎯 Highest-Leverage Missing Techniques")
+        if gaps['techniques']:
+            df_techniques = pd.DataFrame([{
+                'Technique': f"{technique['technique_id']}: {technique['name']}",
+                'Groups': technique['groups']
+            } for technique in gaps['techniques']])
+            fig = px.bar(
+                df_techniques,
+                x='Groups',
+                y='Technique',
+                orientation='h',
+                title="Groups using each uncovered technique",
+                template=plotly_template
+            )
+            fig.update_layout(yaxis={'categoryorder': 'total ascending'}, height=600)
+            st.plotly_chart(fig, use_container_width=True)
+        else:
+            st.success("✅ Every technique used by an APT group is covered")
+    
+    # Uncovered techniques of one group
+    group_options = [f"{group['name']} ({group['attack_id']})" for group in gaps['groups'] if group['uncovered']]
+    if group_options:
+        selected_group = st.selectbox("🔎 Uncovered techniques of", group_options)
+        group_id = selected_group.split('(')[-1].strip(')')
+        group = next(group for group in gaps['groups'] if group['attack_id'] == group_id)
+        df_uncovered = pd.DataFrame([{
+            'ID': technique_id,
+            'Name': apt_groups.cache.get_technique_name(technique_id)
+        } for technique_id in group['uncovered_techniques']])
+        st.dataframe(df_uncovered, use_container_width=True, hide_index=True)
+
 def perform_search(apt_groups, search_term):
     """Perform search across APT groups, techniques, and software."""
     search_results = []
@@ -1071,20 +1083,33 @@ def perform_search(apt_groups, search_term):
                     'Details': f"Associated with {len(software.get('techniques', []))} techniques"
                 })
     
+    if not search_results:
+        # No substring hits: fall back to typo-tolerant matches ("Fancy Bare", "APT 28")
+        result_types = {'group': 'APT Group', 'software': 'Software', 'technique': 'Technique'}
+        for match in apt_groups.fuzzy_index.search(search_term, limit=20):
+            search_results.append({
+                'Type': result_types[match['kind']],
+                'Name': match['name'],
+                'ID': match['id'],
+                'Match': f"Close match: {match['matched']} ({match['score']:.0%})",
+                'Details': f"Used by {len(match['attack_ids'])} APT groups"
+            })
+    
     return search_results
 
-@st.cache_data
+@st.cache_data(hash_funcs=GROUP_HASH_FUNCS)
 def create_analytics_charts(apt_groups, plotly_template):
     """Create analytics charts for APT groups and software."""
-    # APT groups by technique count
+    stats = apt_groups.stats
+    
+    # APT groups by technique count; the precomputed counts are ordered most used first
     group_technique_counts = [
-        (group.name, len([t for t in group.technique_table_data if t.get('technique_used', False)]))
-        for group in apt_groups.values()
+        (apt_groups.summaries[group_id].name, count)
+        for group_id, count in itertools.islice(stats.group_used_counts.items(), 15)
     ]
-    group_technique_counts.sort(key=lambda x: x[1], reverse=True)
     
     df_group_tech = pd.DataFrame(
-        group_technique_counts[:15], 
+        group_technique_counts, 
         columns=['APT Group', 'Used Techniques Count']
     )
     
@@ -1099,14 +1124,9 @@ def create_analytics_charts(apt_groups, plotly_template):
     fig_group.update_layout(height=500, yaxis={'categoryorder': 'total ascending'})
     
     # Software distribution
-    software_counts = Counter()
-    for group in apt_groups.values():
-        for software in group.software_data:
-            software_counts[software.get('name', 'Unknown')] += 1
-    
     fig_software = None
-    if software_counts:
-        top_software = software_counts.most_common(10)
+    if stats.software_popularity:
+        top_software = list(itertools.islice(stats.software_popularity.items(), 10))
         df_software = pd.DataFrame(top_software, columns=['Software', 'APT Groups Count'])
         
         fig_software = px.pie(
@@ -1179,7 +1199,7 @@ def main():
     st.sidebar.markdown("---")
     page = st.sidebar.selectbox(
         "📑 Navigate to",
-        ["📈 Overview", "🏛️ APT Analysis", "🎯 TTP Matrix", "📊 Advanced Analytics", "🔍 Search"]
+        ["📈 Overview", "🏛️ APT Analysis", "🎯 TTP Matrix", "📊 Advanced Analytics", "🛡️ Coverage Gaps", "🔍 Search"]
     )
     
     if page == "📈 Overview":
@@ -1190,6 +1210,8 @@ def main():
         show_ttp_matrix(apt_groups)
     elif page == "📊 Advanced Analytics":
         show_advanced_analytics(apt_groups, plotly_template)
+    elif page == "🛡️ Coverage Gaps":
+        show_coverage_gaps(apt_groups, plotly_template)
     elif page == "🔍 Search":
         show_search(apt_groups)
     
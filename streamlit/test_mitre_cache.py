@@ -0,0 +1,48 @@
+"""Regression tests for MITRECache searches over the checked-in group data."""
+
+import asyncio
+
+import pytest
+
+from mitre_cache import DEFAULT_MITRE_DATA_DIR, FuzzyIndex, MITRECache
+
+
+@pytest.fixture(scope="module")
+def cache(tmp_path_factory):
+    cache = MITRECache(cache_dir=str(tmp_path_factory.mktemp("mitre_cache")), mitre_data_dir=DEFAULT_MITRE_DATA_DIR)
+    asyncio.run(cache.load_mitre_data())
+    return cache
+
+
+def test_trigrams_are_padded_and_full_length():
+    assert FuzzyIndex._trigrams("apt28") == {"  a", " ap", "apt", "pt2", "t28", "28 "}
+    assert FuzzyIndex._trigrams("a") == {"  a", " a "}
+    assert FuzzyIndex._trigrams("") == set()
+
+
+@pytest.mark.parametrize("query, attack_id, unrelated", [
+    ("Fancy Bare", "G0007", {"PcShare", "Malware"}),
+    ("Lazarus Grp", "G0032", {"Arp", "FRP"}),
+])
+def test_fuzzy_search_misspelled_group(cache, query, attack_id, unrelated):
+    matches = asyncio.run(cache.fuzzy_search(query))
+    assert matches[0]["kind"] == "group" and matches[0]["id"] == attack_id
+    assert not unrelated & {match["name"] for match in matches}
+
+
+@pytest.mark.parametrize("query, expected, unrelated", [
+    ("lazarus", {"Lazarus Group", "Andariel", "APT37", "APT38"}, {"FIN7", "Magic Hound", "DarkHydrus", "LAPSUS$"}),
+    ("china", set(), {"Turla", "Akira"}),
+    ("ransomware", set(), {"Transparent Tribe"}),
+    ("energy", set(), {"Play"}),
+    ("APT28", {"APT28"}, {"Putter Panda"}),
+])
+def test_search_ranks_substring_matches_without_fuzzy_noise(cache, query, expected, unrelated):
+    names = [result["name"] for result in asyncio.run(cache.search_apt_groups(query, max_results=20))]
+    assert expected <= set(names)
+    assert not unrelated & set(names)
+
+
+def test_search_falls_back_to_fuzzy_matches(cache):
+    results = asyncio.run(cache.search_apt_groups("kimsky"))
+    assert results[0]["name"] == "Kimsuky"